@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Local read API for city data
+----------------------------
+Loads cities_full.json, city_news_fixed.json and city_images.json once
+(through models.py), builds in-memory indexes and serves JSON over HTTP:
+
+  GET /api/cities/<slug>                         one city + news + image
+  GET /api/compare?slugs=minneapolis,red-wing    several cities side by side
+  GET /api/filter?metric=median_income&min=60000&max=90000[&sort=desc&limit=50]
+  GET /api/bbox?south=44&west=-94&north=45.5&east=-92[&limit=200]
+  GET /api/trends/<source>[?metric=employers_500&city=rochester]
+                                                 per-snapshot history (snapshots.py)
+  GET /api/changes/<source>[?city=rochester&since=2026-07-01 | &from=3&to=7]
+                                                 adds / drops / metric changes between snapshots
+  GET /api/metrics                               filterable metric names
+  GET /api/health
+
+Responses are gzip'd when the client accepts it, carry a strong ETag
+(If-None-Match → 304) and are kept in an LRU cache keyed by the
+normalized request, so repeat queries are a dict lookup. Trend and change
+queries also key on the snapshot manifest's mtime, so a newly recorded
+snapshot shows up on the next request.
+
+    python scripts/api_server.py [--port 8765]
+    python scripts/api_server.py bench [--requests 20000 --concurrency 16]
+"""
+import argparse, bisect, gzip, hashlib, http.client, json, math, pathlib, re
+import statistics, threading, time, traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from models import City, business_to_dict, city_to_dict, load_cities, load_news, story_to_dict
+from paths import PUBLIC_DIR
+
+CACHE_SIZE  = 2048
+GRID_DEG    = 0.25        # bbox grid cell, ~28 km north-south
+MAX_LIMIT   = 1000
+GZIP_MIN    = 512         # don't bother compressing tiny bodies
+HISTORY_ROUTES = ("/api/trends/", "/api/changes/")
+
+METRICS = {
+    "population_2020":   lambda c: c.population_2020,
+    "density_sq_mi":     lambda c: c.density_sq_mi,
+    "median_income":     lambda c: c.median_income,
+    "median_age":        lambda c: c.median_age,
+    "incorporated_year": lambda c: c.incorporated_year,
+    "businesses_500":    lambda c: sum(b.employee_category == "500+" for b in c.businesses or []),
+    "businesses_100":    lambda c: sum(b.employee_category == "100-499" for b in c.businesses or []),
+    "universities":      lambda c: len(c.universities or []),
+}
+
+
+def slugify(name: str) -> str:
+    """Same slug the React router uses (CityPage.jsx)."""
+    return re.sub(r"(^-|-$)", "", re.sub(r"[^a-z0-9]+", "-", name.lower()))
+
+def normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ───────────────────────── data + indexes ─────────────────────
+class CityIndex:
+    def __init__(self, cities: List[City], news: Dict[str, list], images: List[dict]):
+        self.cities  = cities
+        self.by_slug = {slugify(c.city): i for i, c in enumerate(cities)}
+        self.slugs   = [slugify(c.city) for c in cities]
+
+        news_by_norm  = {normalize(k): v for k, v in news.items()}
+        image_by_norm = {normalize(r["city"]): r for r in images if r.get("image_url")}
+        self.news   = [news_by_norm.get(normalize(c.city), []) for c in cities]
+        self.images = [image_by_norm.get(normalize(c.city)) for c in cities]
+
+        # metric → (sorted values, matching city indexes) for bisect range scans
+        self.metrics = {}
+        for name, get in METRICS.items():
+            pairs = sorted((v, i) for i, c in enumerate(cities) if (v := get(c)) is not None)
+            self.metrics[name] = ([v for v, _ in pairs], [i for _, i in pairs])
+
+        self.history = None    # SnapshotStore, opened on the first trend query
+        self.history_mtime = None
+        self.history_lock = threading.Lock()   # handler threads check-and-swap the store
+
+        # coarse lat/lon grid for bounding-box lookups
+        self.grid = {}
+        for i, c in enumerate(cities):
+            if c.lat is not None and c.lon is not None:
+                self.grid.setdefault(self._cell(c.lat, c.lon), []).append(i)
+
+    @staticmethod
+    def _cell(lat: float, lon: float):
+        return math.floor(lat / GRID_DEG), math.floor(lon / GRID_DEG)
+
+    @classmethod
+    def from_public(cls, public_dir=PUBLIC_DIR):
+        public_dir = pathlib.Path(public_dir)
+        images_file = public_dir / "city_images.json"
+        images = json.loads(images_file.read_text(encoding="utf-8")) if images_file.exists() else []
+        return cls(load_cities(public_dir / "cities_full.json"),
+                   load_news(public_dir / "city_news_fixed.json"), images)
+
+    # ---------- views ----------
+    def summary(self, i: int) -> dict:
+        c = self.cities[i]
+        return {
+            "slug": self.slugs[i], "city": c.city, "county": c.county,
+            "lat": c.lat, "lon": c.lon, "population_2020": c.population_2020,
+            "median_income": c.median_income,
+            "businesses_500": self.metric_value("businesses_500", i),
+            "businesses_100": self.metric_value("businesses_100", i),
+        }
+
+    def metric_value(self, metric: str, i: int):
+        return METRICS[metric](self.cities[i])
+
+    def detail(self, i: int) -> dict:
+        out = city_to_dict(self.cities[i])
+        out["slug"]  = self.slugs[i]
+        out["news"]  = [story_to_dict(s) for s in self.news[i]]
+        img = self.images[i]
+        out["image"] = {k: v for k, v in img.items() if k != "city"} if img else None
+        return out
+
+    # ---------- queries ----------
+    def city(self, slug: str) -> dict:
+        i = self.by_slug.get(slug)
+        if i is None:
+            raise ApiError(404, f"unknown city {slug!r}")
+        return self.detail(i)
+
+    def compare(self, slugs: List[str]) -> dict:
+        if not slugs or len(slugs) > 10:
+            raise ApiError(400, "compare takes 1–10 comma-separated slugs")
+        missing = [s for s in slugs if s not in self.by_slug]
+        if missing:
+            raise ApiError(404, f"unknown cities: {', '.join(missing)}")
+        rows = []
+        for s in slugs:
+            i = self.by_slug[s]
+            row = self.summary(i)
+            row.update({m: self.metric_value(m, i) for m in METRICS})
+            row["top_employers"] = [business_to_dict(b) for b in (self.cities[i].businesses or [])[:10]]
+            rows.append(row)
+        return {"cities": rows}
+
+    def filter(self, metric: str, lo: Optional[float], hi: Optional[float], desc: bool, limit: int) -> dict:
+        if metric not in self.metrics:
+            raise ApiError(400, f"unknown metric {metric!r}; see /api/metrics")
+        values, idxs = self.metrics[metric]
+        start = bisect.bisect_left(values, lo) if lo is not None else 0
+        stop  = bisect.bisect_right(values, hi) if hi is not None else len(values)
+        span  = range(stop - 1, start - 1, -1) if desc else range(start, stop)
+        rows  = []
+        for k in span:
+            if len(rows) == limit:
+                break
+            row = self.summary(idxs[k])
+            row[metric] = values[k]
+            rows.append(row)
+        return {"metric": metric, "total": max(0, stop - start), "cities": rows}
+
+    def bbox(self, south: float, west: float, north: float, east: float, limit: int) -> dict:
+        if south > north or west > east:
+            raise ApiError(400, "bbox needs south ≤ north and west ≤ east")
+        (r0, c0), (r1, c1) = self._cell(south, west), self._cell(north, east)
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > 40_000:
+            hits = [i for cell in self.grid.values() for i in cell]
+        else:
+            hits = [i for r in range(r0, r1 + 1) for c in range(c0, c1 + 1) for i in self.grid.get((r, c), ())]
+        inside = [i for i in hits
+                  if south <= self.cities[i].lat <= north and west <= self.cities[i].lon <= east]
+        inside.sort(key=lambda i: -(self.cities[i].population_2020 or 0))
+        return {"total": len(inside), "cities": [self.summary(i) for i in inside[:limit]]}
+
+    # ---------- history (snapshots.py) ----------
+    def history_stamp(self) -> int:
+        """Manifest mtime; drops the open store once snapshots were recorded after it was loaded."""
+        from snapshots import SNAP_DIR
+        manifest = SNAP_DIR / "manifest.json"
+        stamp = manifest.stat().st_mtime_ns if manifest.exists() else 0
+        with self.history_lock:
+            if stamp != self.history_mtime:
+                self.history, self.history_mtime = None, stamp
+        return stamp
+
+    def _snapshots(self, source: str):
+        from snapshots import SOURCES, SnapshotStore
+        if source not in SOURCES:
+            raise ApiError(404, f"unknown snapshot source {source!r}; choose from {', '.join(SOURCES)}")
+        with self.history_lock:
+            if self.history is None:
+                self.history = SnapshotStore()
+            store = self.history
+        return store, SOURCES[source][1]
+
+    def _city_name(self, slug: str) -> str:
+        i = self.by_slug.get(slug)
+        if i is None:
+            raise ApiError(404, f"unknown city {slug!r}")
+        return self.cities[i].city
+
+    def trends(self, source: str, metric: Optional[str], slug: Optional[str]) -> dict:
+        store, scales = self._snapshots(source)
+        if metric is not None and metric not in scales:
+            raise ApiError(400, f"{source} metrics: {', '.join(scales)}")
+        try:
+            if slug is None:
+                return {"source": source, "snapshots": store.statewide_trend(source, metric)}
+            city = self._city_name(slug)
+            return {"source": source, "city": city,
+                    "series": {m: store.city_trend(source, city, m) for m in ([metric] if metric else scales)}}
+        except KeyError as e:
+            raise ApiError(404, e.args[0]) from None
+
+    def changes(self, source: str, slug: Optional[str], since: Optional[str],
+                a: Optional[int], b: Optional[int]) -> dict:
+        store, _ = self._snapshots(source)
+        city = self._city_name(slug) if slug is not None else None
+        try:
+            if b is None:
+                b = store.resolve(source, None)
+            if a is None:
+                a = store.resolve(source, since) if since else b - 1
+                if a < 1:
+                    raise ApiError(404, f"{source} has no snapshot before #{b}")
+            return store.diff(source, a, b, city)
+        except KeyError as e:
+            raise ApiError(404, e.args[0]) from None
+
+
+# ───────────────────────── response cache ─────────────────────
+class Response:
+    __slots__ = ("status", "body", "gz", "etag")
+
+    def __init__(self, status: int, payload):
+        self.status = status
+        self.body   = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gz     = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN else None
+        self.etag   = '"' + hashlib.blake2b(self.body, digest_size=12).hexdigest() + '"'
+
+
+class LRU:
+    def __init__(self, size: int):
+        self.size, self.data, self.lock = size, OrderedDict(), threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            val = self.data.get(key)
+            if val is None:
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return val
+
+    def put(self, key, val):
+        with self.lock:
+            self.data[key] = val
+            self.data.move_to_end(key)
+            if len(self.data) > self.size:
+                self.data.popitem(last=False)
+
+
+# ───────────────────────── routing ────────────────────────────
+def _float(q: dict, key: str, required=False) -> Optional[float]:
+    if key not in q:
+        if required:
+            raise ApiError(400, f"missing parameter {key!r}")
+        return None
+    try:
+        v = float(q[key])
+    except ValueError:
+        raise ApiError(400, f"{key!r} must be a number") from None
+    if not math.isfinite(v):
+        raise ApiError(400, f"{key!r} must be finite")
+    return v
+
+def _limit(q: dict, default: int) -> int:
+    try:
+        return max(1, min(MAX_LIMIT, int(q.get("limit", default))))
+    except ValueError:
+        raise ApiError(400, "'limit' must be an integer") from None
+
+def _int(q: dict, key: str) -> Optional[int]:
+    if key not in q:
+        return None
+    try:
+        return int(q[key])
+    except ValueError:
+        raise ApiError(400, f"{key!r} must be an integer") from None
+
+def route(index: CityIndex, path: str, q: dict):
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] != ["api"]:
+        raise ApiError(404, "not found")
+    parts = parts[1:]
+    if parts == ["health"]:
+        return {"ok": True, "cities": len(index.cities)}
+    if parts == ["metrics"]:
+        return {"metrics": sorted(METRICS)}
+    if len(parts) == 2 and parts[0] == "cities":
+        return index.city(parts[1])
+    if parts == ["compare"]:
+        return index.compare([s for s in q.get("slugs", "").split(",") if s])
+    if parts == ["filter"]:
+        return index.filter(q.get("metric", ""), _float(q, "min"), _float(q, "max"),
+                            q.get("sort", "asc") == "desc", _limit(q, 50))
+    if parts == ["bbox"]:
+        return index.bbox(_float(q, "south", True), _float(q, "west", True),
+                          _float(q, "north", True), _float(q, "east", True), _limit(q, 200))
+    if len(parts) == 2 and parts[0] == "trends":
+        return index.trends(parts[1], q.get("metric"), q.get("city"))
+    if len(parts) == 2 and parts[0] == "changes":
+        return index.changes(parts[1], q.get("city"), q.get("since"), _int(q, "from"), _int(q, "to"))
+    raise ApiError(404, "not found")
+
+
+def make_handler(index: CityIndex, cache: LRU):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"     # keep-alive for concurrent clients
+        disable_nagle_algorithm = True    # headers + body go out as separate writes
+        server_version   = "mnoi-api/1.0"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            q   = dict(parse_qsl(url.query))
+            key = (url.path.rstrip("/"), tuple(sorted(q.items())))
+            if key[0].startswith(HISTORY_ROUTES):
+                key += (index.history_stamp(),)
+
+            resp = cache.get(key)
+            if resp is None:
+                try:
+                    resp = Response(200, route(index, key[0], q))
+                except ApiError as e:
+                    resp = Response(e.status, {"error": str(e)})
+                except Exception:                 # a bug must not drop the connection
+                    traceback.print_exc()
+                    resp = Response(500, {"error": "internal error"})
+                if resp.status != 500:
+                    cache.put(key, resp)
+
+            if resp.status == 200 and self.headers.get("If-None-Match") == resp.etag:
+                self.send_response(304)
+                self.send_header("ETag", resp.etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            use_gz = resp.gz is not None and "gzip" in (self.headers.get("Accept-Encoding") or "")
+            body = resp.gz if use_gz else resp.body
+            self.send_response(resp.status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if resp.status == 200:
+                self.send_header("ETag", resp.etag)
+                self.send_header("Cache-Control", "public, max-age=300")
+            if resp.gz is not None:
+                self.send_header("Vary", "Accept-Encoding")
+            if use_gz:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):   # keep the console quiet under load
+            pass
+
+    return Handler
+
+
+def make_server(host="127.0.0.1", port=8765, public_dir=PUBLIC_DIR):
+    t0 = time.perf_counter()
+    index = CityIndex.from_public(public_dir)
+    print(f"📚  Indexed {len(index.cities)} cities in {(time.perf_counter() - t0)*1000:.0f} ms")
+    server = ThreadingHTTPServer((host, port), make_handler(index, LRU(CACHE_SIZE)))
+    server.daemon_threads = True
+    return server, index
+
+# ───────────────────────── load test ──────────────────────────
+def bench(n_requests: int, concurrency: int):
+    server, index = make_server(port=0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    slugs = index.slugs
+    paths = []
+    for k in range(256):
+        s = slugs[(k * 37) % len(slugs)]
+        paths += [f"/api/cities/{s}",
+                  f"/api/compare?slugs={s},{slugs[(k * 11) % len(slugs)]}",
+                  f"/api/filter?metric=median_income&min={40000 + 500 * k}&sort=desc&limit=25",
+                  f"/api/bbox?south={43.5 + k % 40 * 0.1}&west=-97&north={44.5 + k % 40 * 0.1}&east=-92"]
+
+    per_worker = n_requests // concurrency
+    latencies, errors, lock = [], [0], threading.Lock()
+
+    def worker(wid: int):
+        conn, local, errs = http.client.HTTPConnection("127.0.0.1", port), [], 0
+        for k in range(per_worker):
+            p = paths[(wid * per_worker + k) % len(paths)]
+            t0 = time.perf_counter()
+            conn.request("GET", p, headers={"Accept-Encoding": "gzip"})
+            r = conn.getresponse()
+            r.read()
+            local.append(time.perf_counter() - t0)
+            errs += r.status != 200
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += errs
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    server.shutdown()
+
+    ms = sorted(x * 1000 for x in latencies)
+    q  = statistics.quantiles(ms, n=100)
+    print(f"🏁  {len(ms)} requests, {concurrency} clients, {len(ms)/wall:.0f} req/s, {errors[0]} non-200")
+    print(f"   p50 {q[49]:.2f} ms   p95 {q[94]:.2f} ms   p99 {q[98]:.2f} ms   max {ms[-1]:.2f} ms")
+
+def main():
+    ap = argparse.ArgumentParser(description="Local read API for city data")
+    ap.add_argument("mode", nargs="?", choices=("serve", "bench"), default="serve")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--public", type=pathlib.Path, default=PUBLIC_DIR)
+    ap.add_argument("--requests", type=int, default=20000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+
+    if args.mode == "bench":
+        bench(args.requests, args.concurrency)
+        return
+    server, _ = make_server(args.host, args.port, args.public)
+    print(f"🚀  Serving on http://{args.host}:{server.server_address[1]}/api/health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
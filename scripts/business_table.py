@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded global business table
+----------------------------------------
+INPUT : public/cities_full.json
+OUTPUT: public/business_table.json     every employer once, columnar, strings → codes
+        public/cities_compact.json     cities_full.json with "businesses" replaced by
+                                       "business_rows": [start, stop]  (row range in the table)
+
+business_table.json:
+  {
+    "version": 1, "rows": 2956,
+    "categories":   ["500+", "100-499"],
+    "industries":   ["General Merchandise Stores", …],
+    "descriptions": ["Corporate Headquarters", …],
+    "city":         [0, 0, 0, …],          # index into cities_compact.json
+    "category":     [0, 0, 1, …],          # → categories
+    "industry":     [0, 14, 3, …],         # → industries
+    "description":  [0, 7, 7, …],          # → descriptions
+    "name":         ["Target Corp HQ", …],
+    "website":      ["https://…", null, …]
+  }
+
+Rows are grouped by city, so a city's employers are one contiguous slice.
+Industry and description strings, which repeat across hundreds of cities,
+are stored once. Roll-ups such as business_report's industry_counts count
+small ints instead of hashing strings.
+
+    python scripts/business_table.py
+"""
+import json, time
+from typing import Dict, Iterable, List, Tuple
+
+from paths import PUBLIC_DIR
+
+CITIES_FILE  = PUBLIC_DIR / "cities_full.json"
+TABLE_FILE   = PUBLIC_DIR / "business_table.json"
+COMPACT_FILE = PUBLIC_DIR / "cities_compact.json"
+
+VERSION = 1
+CATEGORIES = ("500+", "100-499", "10-99")
+
+class Dictionary:
+    """String → code in first-seen order."""
+    def __init__(self, seed: Iterable[str] = ()):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+        for s in seed:
+            self.code(s)
+
+    def code(self, s: str) -> int:
+        c = self.codes.get(s)
+        if c is None:
+            c = self.codes[s] = len(self.values)
+            self.values.append(s)
+        return c
+
+# ───────────────────────── encode ─────────────────────────────
+def encode_table(rows: Iterable[Tuple[int, str, dict]]) -> dict:
+    """rows: (city_idx, category, {"name", "industry", "description", "website"})."""
+    cats, inds, descs = Dictionary(CATEGORIES), Dictionary(), Dictionary()
+    cols = {"city": [], "category": [], "industry": [], "description": [], "name": [], "website": []}
+    for ci, cat, b in rows:
+        cols["city"].append(ci)
+        cols["category"].append(cats.code(cat))
+        cols["industry"].append(inds.code(b.get("industry") or ""))
+        cols["description"].append(descs.code(b.get("description") or ""))
+        cols["name"].append(b["name"])
+        cols["website"].append(b.get("website"))
+    used = max(cols["category"], default=-1) + 1
+    return {
+        "version": VERSION, "rows": len(cols["name"]),
+        "categories": cats.values[:used],
+        "industries": inds.values, "descriptions": descs.values,
+        **cols,
+    }
+
+def build(raw_cities: List[dict]) -> Tuple[dict, List[dict]]:
+    """(table, compact city records) from cities_full.json-style records."""
+    rows, compact = [], []
+    for ci, rec in enumerate(raw_cities):
+        start = len(rows)
+        for b in rec.get("businesses") or []:
+            rows.append((ci, b["employee_category"], b))
+        out = {k: v for k, v in rec.items() if k != "businesses"}
+        out["business_rows"] = [start, len(rows)]
+        compact.append(out)
+    return encode_table(rows), compact
+
+def from_city_businesses(data: Dict[str, Dict[str, List[dict]]]) -> Tuple[dict, List[str]]:
+    """Table from the scraper's {city: {band: [rows]}} layout (city_businesses*.json)."""
+    names = list(data)
+    rows = ((ci, band, b) for ci, city in enumerate(names)
+            for band in CATEGORIES for b in data[city].get(band, []))
+    return encode_table(rows), names
+
+# ───────────────────────── read ───────────────────────────────
+def decode_row(table: dict, i: int) -> dict:
+    return {
+        "name": table["name"][i],
+        "employee_category": table["categories"][table["category"][i]],
+        "industry": table["industries"][table["industry"][i]],
+        "description": table["descriptions"][table["description"][i]],
+        "website": table["website"][i],
+    }
+
+def rows_of(table: dict, rec: dict) -> List[dict]:
+    start, stop = rec["business_rows"]
+    return [decode_row(table, i) for i in range(start, stop)]
+
+def code_counts(codes: List[int], n: int) -> List[int]:
+    counts = [0] * n
+    for c in codes:
+        counts[c] += 1
+    return counts
+
+def industry_counts(table: dict) -> List[dict]:
+    """[{"industry", "count"}] most common first; ties keep first-seen order."""
+    counts = code_counts(table["industry"], len(table["industries"]))
+    order = sorted(range(len(counts)), key=lambda c: -counts[c])
+    return [{"industry": table["industries"][c], "count": counts[c]} for c in order if counts[c]]
+
+# ───────────────────────── main ───────────────────────────────
+def _dump(obj, path):
+    path.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+def main():
+    t0 = time.perf_counter()
+    raw = json.loads(CITIES_FILE.read_text(encoding="utf-8"))
+    table, compact = build(raw["cities"])
+    _dump(table, TABLE_FILE)
+    _dump({"cities": compact}, COMPACT_FILE)
+
+    before = len(json.dumps(raw, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    after  = TABLE_FILE.stat().st_size + COMPACT_FILE.stat().st_size
+    print(f"🏢  {table['rows']} employers → {len(table['industries'])} industries, "
+          f"{len(table['descriptions'])} descriptions, {len(table['categories'])} categories")
+    print(f"   payload {before/1e6:.2f} MB → {after/1e6:.2f} MB (both minified) "
+          f"in {(time.perf_counter() - t0)*1000:.0f} ms")
+    print(f"✅  Wrote {TABLE_FILE} and {COMPACT_FILE}")
+
+if __name__ == "__main__":
+    main()
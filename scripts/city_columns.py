@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Columnar binary file of numeric city attributes
+-----------------------------------------------
+INPUT : public/cities_full.json
+OUTPUT: public/city_columns.bin
+
+One flat array per attribute, so numeric work (and the map) never has to
+walk nested JSON or re-parse "44°58′55″N":
+
+  bytes 0-3    b"MNOC"
+  bytes 4-7    header length H, uint32 little-endian
+  bytes 8-8+H  UTF-8 JSON header, space-padded to a multiple of 8
+  …            column data, little-endian, each column 8-byte aligned
+
+Header:
+  {"version": 1, "rows": N, "cities": ["Minneapolis", …],
+   "columns": [{"name": "lat", "dtype": "<f8", "offset": 1234, "null": "nan"}, …]}
+
+`offset` is absolute. Missing floats are NaN; missing ints use the
+column's `null` sentinel (-1). Row i of every column is cities[i], in
+cities_full.json order.
+
+    python scripts/city_columns.py build
+    python scripts/city_columns.py show [city]
+
+From Python:   cols = open_columns()      # {name: np.memmap}, no JSON parsed per city
+From the app:  src/cityColumns.js → loadCityColumns()
+"""
+import argparse, json, math, struct, sys, time
+from array import array
+from typing import Dict, List
+
+from models import City, load_cities
+from paths import PUBLIC_DIR
+
+OUT_FILE   = PUBLIC_DIR / "city_columns.bin"
+
+MAGIC   = b"MNOC"
+VERSION = 1
+ALIGN   = 8
+INT_NULL = -1
+
+# name → (array typecode, numpy dtype, extractor)
+COLUMNS = {
+    "population":        ("i", "<i4", lambda c: c.population_2020),
+    "density_sq_mi":     ("d", "<f8", lambda c: c.density_sq_mi),
+    "lat":               ("d", "<f8", lambda c: c.lat),
+    "lon":               ("d", "<f8", lambda c: c.lon),
+    "median_income":     ("i", "<i4", lambda c: c.median_income),
+    "median_age":        ("d", "<f8", lambda c: c.median_age),
+    "incorporated_year": ("i", "<i4", lambda c: c.incorporated_year),
+    "business_count":    ("i", "<i4", lambda c: len(c.businesses or [])),
+    "university_count":  ("i", "<i4", lambda c: len(c.universities or [])),
+}
+
+# ───────────────────────── build ──────────────────────────────
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+def _column(typecode: str, values) -> array:
+    if typecode == "d":
+        col = array("d", (math.nan if v is None else float(v) for v in values))
+    else:
+        col = array("i", (INT_NULL if v is None else int(v) for v in values))
+    if col.itemsize != (8 if typecode == "d" else 4):
+        raise RuntimeError(f"unexpected C type size for {typecode!r}: {col.itemsize}")
+    if sys.byteorder == "big":
+        col.byteswap()
+    return col
+
+def encode(cities: List[City]) -> bytes:
+    cols = {name: _column(tc, [get(c) for c in cities]) for name, (tc, _, get) in COLUMNS.items()}
+
+    # header size depends on the offsets it contains → lay out twice
+    header_len = 0
+    while True:
+        offset = 8 + header_len
+        specs = []
+        for name, (tc, dtype, _) in COLUMNS.items():
+            offset += _pad(offset)
+            specs.append({"name": name, "dtype": dtype, "offset": offset,
+                          "null": "nan" if tc == "d" else INT_NULL})
+            offset += len(cols[name]) * cols[name].itemsize
+        header = json.dumps({"version": VERSION, "rows": len(cities),
+                             "cities": [c.city for c in cities], "columns": specs},
+                            ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        header += b" " * _pad(8 + len(header))
+        if len(header) == header_len:
+            break
+        header_len = len(header)
+
+    out = bytearray(MAGIC + struct.pack("<I", len(header)) + header)
+    for name in COLUMNS:
+        out += b"\0" * _pad(len(out))
+        out += cols[name].tobytes()
+    return bytes(out)
+
+# ───────────────────────── read ───────────────────────────────
+def read_header(path=OUT_FILE) -> dict:
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path}: not a city columns file")
+        (n,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(n))
+    if header["version"] != VERSION:
+        raise ValueError(f"{path}: unsupported version {header['version']}")
+    return header
+
+def open_columns(path=OUT_FILE) -> Dict[str, "numpy.memmap"]:
+    """Read-only memory maps of every column; pages are only touched when read."""
+    import numpy as np
+    header = read_header(path)
+    return {c["name"]: np.memmap(path, dtype=np.dtype(c["dtype"]), mode="r",
+                                 offset=c["offset"], shape=(header["rows"],))
+            for c in header["columns"]}
+
+# ───────────────────────── CLI ────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Build or inspect public/city_columns.bin")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build")
+    s = sub.add_parser("show")
+    s.add_argument("city", nargs="?")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        t0 = time.perf_counter()
+        cities = load_cities(PUBLIC_DIR / "cities_full.json")
+        OUT_FILE.write_bytes(encode(cities))
+        print(f"✅  {len(cities)} cities × {len(COLUMNS)} columns → {OUT_FILE} "
+              f"({OUT_FILE.stat().st_size/1e3:.1f} kB, {(time.perf_counter() - t0)*1000:.0f} ms)")
+        return
+
+    t0 = time.perf_counter()
+    header = read_header()
+    cols = open_columns()
+    t1 = time.perf_counter()
+    if args.city:
+        i = header["cities"].index(args.city)
+        for name, col in cols.items():
+            print(f"  {name:<18} {col[i]}")
+    else:
+        for name, col in cols.items():
+            print(f"  {name:<18} {col.dtype}  first={col[0]}")
+    print(f"\n⏱️  opened {header['rows']} rows in {(t1 - t0)*1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,32 @@
-import json, pathlib, requests
+import json, requests
 from bs4 import BeautifulSoup
 
-INFILE  = pathlib.Path("public/basic_cities.json")
-OUTFILE = pathlib.Path("public/city_images.json")
+from page_archive import archive_page
+from paths import PUBLIC_DIR
+
+INFILE  = PUBLIC_DIR / "basic_cities.json"
+OUTFILE = PUBLIC_DIR / "city_images.json"
+
+def parse_infobox_image(html):
+    soup = BeautifulSoup(html, "html.parser")
+    infobox = soup.find("table", class_="infobox")
+    if not infobox:
+        return None
+    img = infobox.find("img")
+    if not img:
+        return None
+    src = img.get("src")
+    if src.startswith("//"):
+        src = "https:" + src
+    elif src.startswith("/"):
+        src = "https://en.wikipedia.org" + src
+    return src
 
 def get_infobox_image(wiki_url):
     try:
         resp = requests.get(wiki_url, timeout=12, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(resp.text, "html.parser")
-        infobox = soup.find("table", class_="infobox")
-        if not infobox:
-            return None
-        img = infobox.find("img")
-        if not img:
-            return None
-        src = img.get("src")
-        if src.startswith("//"):
-            src = "https:" + src
-        elif src.startswith("/"):
-            src = "https://en.wikipedia.org" + src
-        return src
+        archive_page(wiki_url, resp.text, resp.status_code)
+        return parse_infobox_image(resp.text)
     except Exception as e:
         print(f"Error fetching {wiki_url}: {e}")
         return None
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Zoom-level city clusters for the map
+------------------------------------
+INPUT : public/mn_cities_dec.json     (convert_coors.py: n / lat / lon / pop)
+        public/cities_full.json       (employer counts per city)
+OUTPUT: public/city_clusters.json
+
+    {
+      "version": 1, "minZoom": 4, "maxZoom": 11, "radius": 40, "extent": 256,
+      "fields": ["lat", "lon", "count", "population", "employers_500", "employers_100_499", "ref"],
+      "cities": ["Minneapolis", …],                     # same order as mn_cities_dec.json
+      "tiles": {"6/15/22": [[44.98, -93.27, 37, 1234567, 41, 190, 8], …], …}
+    }
+
+Supercluster-style: the points at maxZoom + 1 are the cities themselves.
+Each zoom below that greedily merges the previous zoom's features that lie
+within `radius` pixels of each other. Larger populations anchor first, and
+a merged feature sits at the count-weighted centroid with summed
+population and employer counts. Features are keyed by the z/x/y tile they
+fall in at their own zoom, so the map only reads the tiles on screen.
+
+ref is the city index (into "cities") when count == 1, otherwise the zoom
+at which the cluster splits. The map zooms there on click.
+
+    python scripts/cluster_map.py
+    python scripts/cluster_map.py --radius 60 --max-zoom 10
+"""
+import argparse, json, math, time
+from collections import defaultdict
+from typing import Dict, List
+
+from paths import PUBLIC_DIR, PREFIX
+
+DEC_FILE    = PUBLIC_DIR / f"{PREFIX}_cities_dec.json"
+CITIES_FILE = PUBLIC_DIR / "cities_full.json"
+OUT_FILE    = PUBLIC_DIR / "city_clusters.json"
+
+VERSION  = 1
+MIN_ZOOM = 4
+MAX_ZOOM = 11
+RADIUS   = 40            # px
+EXTENT   = 256           # px per tile
+FIELDS   = ("lat", "lon", "count", "population", "employers_500", "employers_100_499", "ref")
+MAX_LAT  = 85.0511       # Web Mercator's square-world limit
+
+# ───────────────────────── projection ─────────────────────────
+def project(lat: float, lon: float):
+    """Web Mercator, normalised to [0, 1] on both axes."""
+    s = math.sin(math.radians(min(max(lat, -MAX_LAT), MAX_LAT)))
+    return (lon + 180) / 360, 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+
+def unproject(x: float, y: float):
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y)))), x * 360 - 180
+
+# ───────────────────────── clustering ─────────────────────────
+class Feature:
+    __slots__ = ("x", "y", "count", "pop", "e500", "e100", "ref")
+
+    def __init__(self, x, y, count, pop, e500, e100, ref):
+        self.x, self.y, self.count = x, y, count
+        self.pop, self.e500, self.e100, self.ref = pop, e500, e100, ref
+
+def cluster_level(items: List[Feature], zoom: int, radius: float = RADIUS,
+                  extent: int = EXTENT) -> List[Feature]:
+    """Merge `items` (the features at zoom + 1) into the features shown at `zoom`."""
+    r = radius / (extent * 2 ** zoom)
+    grid: Dict[tuple, List[int]] = defaultdict(list)
+    for i, f in enumerate(items):
+        grid[int(f.x / r), int(f.y / r)].append(i)
+
+    used, out = [False] * len(items), []
+    for i in sorted(range(len(items)), key=lambda i: (-items[i].pop, i)):
+        if used[i]:
+            continue
+        used[i] = True
+        a = items[i]
+        gx, gy = int(a.x / r), int(a.y / r)
+        group = [a]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in grid.get((gx + dx, gy + dy), ()):
+                    b = items[j]
+                    if not used[j] and (b.x - a.x) ** 2 + (b.y - a.y) ** 2 <= r * r:
+                        used[j] = True
+                        group.append(b)
+        if len(group) == 1:
+            out.append(a)                       # carried up unchanged (keeps its ref)
+            continue
+        n = sum(f.count for f in group)
+        out.append(Feature(
+            sum(f.x * f.count for f in group) / n, sum(f.y * f.count for f in group) / n, n,
+            sum(f.pop for f in group), sum(f.e500 for f in group), sum(f.e100 for f in group),
+            zoom + 1,                           # where it splits again
+        ))
+    return out
+
+def build_levels(points: List[Feature], min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM,
+                 radius=RADIUS, extent=EXTENT) -> Dict[int, List[Feature]]:
+    levels = {max_zoom + 1: points}
+    for z in range(max_zoom, min_zoom - 1, -1):
+        levels[z] = cluster_level(levels[z + 1], z, radius, extent)
+    return levels
+
+def tile_index(levels: Dict[int, List[Feature]]) -> Dict[str, List[list]]:
+    tiles: Dict[str, List[list]] = {}
+    for z in sorted(levels):
+        n = 2 ** z
+        for f in levels[z]:
+            key = f"{z}/{min(max(int(f.x * n), 0), n - 1)}/{min(max(int(f.y * n), 0), n - 1)}"
+            lat, lon = unproject(f.x, f.y)
+            tiles.setdefault(key, []).append(
+                [round(lat, 5), round(lon, 5), f.count, f.pop, f.e500, f.e100, f.ref])
+    return tiles
+
+# ───────────────────────── cities ─────────────────────────────
+def city_key(name: str) -> str:
+    """'Saint Paul ††' / 'Saint Paul†' / 'Saint Paul' → 'saint paul' (seat/capital daggers dropped)."""
+    return name.rstrip("† ").lower()
+
+def employer_counts() -> Dict[str, tuple]:
+    """city_key → (500+, 100-499) employer counts."""
+    if not CITIES_FILE.exists():
+        return {}
+    out = {}
+    for c in json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]:
+        cats = [b.get("employee_category") for b in c.get("businesses") or []]
+        out[city_key(c["city"])] = (cats.count("500+"), cats.count("100-499"))
+    return out
+
+def city_points(dec: List[dict]) -> List[Feature]:
+    emp = employer_counts()
+    pts = []
+    for i, c in enumerate(dec):
+        x, y = project(c["lat"], c["lon"])
+        e500, e100 = emp.get(city_key(c["n"]), (0, 0))
+        pts.append(Feature(x, y, 1, c.get("pop") or 0, e500, e100, i))
+    return pts
+
+# ───────────────────────── main ───────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Precompute zoom-level city clusters")
+    ap.add_argument("--radius", type=float, default=RADIUS, help="cluster radius in px")
+    ap.add_argument("--min-zoom", type=int, default=MIN_ZOOM)
+    ap.add_argument("--max-zoom", type=int, default=MAX_ZOOM,
+                    help="last zoom with clusters; every city is its own feature above it")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    dec = json.loads(DEC_FILE.read_text(encoding="utf-8"))
+    levels = build_levels(city_points(dec), args.min_zoom, args.max_zoom, args.radius)
+    out = {
+        "version": VERSION, "minZoom": args.min_zoom, "maxZoom": args.max_zoom,
+        "radius": args.radius, "extent": EXTENT, "fields": list(FIELDS),
+        "cities": [c["n"] for c in dec],
+        "tiles": tile_index(levels),
+    }
+    OUT_FILE.write_text(json.dumps(out, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    print(f"🔵  {len(dec)} cities → features per zoom: "
+          + ", ".join(f"z{z} {len(levels[z])}" for z in sorted(levels)))
+    print(f"   {len(out['tiles'])} tiles, {OUT_FILE.stat().st_size/1e3:.0f} kB "
+          f"in {(time.perf_counter() - t0)*1000:.0f} ms")
+    print(f"✅  Wrote {OUT_FILE}")
+
+if __name__ == "__main__":
+    main()
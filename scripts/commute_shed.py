@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Commute-shed accessibility per city
+-----------------------------------
+INPUT : public/cities_full.json   (lat/lon parsed from the DMS strings by convert_coors.dms_to_decimal)
+OUTPUT: public/cities_full.json   each city gains
+          "access": {
+            "10": {"employers_500": 3, "employers_100_499": 21, "university_enrollment": 4120},
+            "25": {…}, "50": {…}
+          }
+
+Businesses and universities are only attached to the city they sit in, so
+a town 15 miles from Rochester looks empty even though Mayo is a commute
+away. This counts what is reachable within each radius (great-circle miles,
+the city's own listings included).
+
+Cities become unit vectors, so "within r miles" is a dot-product threshold.
+Each block of BLOCK cities is one (block × N) matrix product plus one
+(block × N) @ (N × 3) product per radius. Memory stays at BLOCK × N floats
+however many places there are.
+
+    python scripts/commute_shed.py                     # radii 10 / 25 / 50 mi
+    python scripts/commute_shed.py --radii 15 30
+    python scripts/commute_shed.py bench [n]           # synthetic n places
+"""
+import argparse, json, time
+from typing import List, Sequence
+
+import numpy as np
+
+from models import City, load_cities
+from paths import PUBLIC_DIR
+
+CITIES_FILE = PUBLIC_DIR / "cities_full.json"
+
+RADII_MI   = (10, 25, 50)
+EARTH_MI   = 3958.8
+BLOCK      = 1024
+METRICS    = ("employers_500", "employers_100_499", "university_enrollment")
+MN_BBOX    = (43.5, 49.4, -97.2, -89.5)           # lat_min, lat_max, lon_min, lon_max
+
+# ───────────────────────── core ───────────────────────────────
+def unit_vectors(lat, lon) -> np.ndarray:
+    """(N, 3) points on the unit sphere; degrees in."""
+    phi, lam = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)], axis=1)
+
+def reachable_sums(lat, lon, weights, radii: Sequence[float], block: int = BLOCK):
+    """(N, len(radii), W) sums of `weights` over every point within each radius.
+
+    Great-circle distance ≤ r  ⇔  u·v ≥ cos(r / R), so one (block × 3) @ (3 × N)
+    product replaces the per-pair trig. Rows without coordinates come back as
+    NaN and contribute nothing to others.
+    """
+    lat, lon = np.asarray(lat, float), np.asarray(lon, float)
+    weights  = np.asarray(weights, float)
+    ok       = ~(np.isnan(lat) | np.isnan(lon))
+    u        = unit_vectors(lat[ok], lon[ok])
+    w_ok     = weights[ok]
+    cos_r    = np.cos(np.asarray(radii, float) / EARTH_MI)
+
+    out  = np.full((len(lat), len(radii), weights.shape[1]), np.nan)
+    idx  = np.flatnonzero(ok)
+    for s in range(0, len(idx), block):
+        dots = u[s:s + block] @ u.T
+        for ri, c in enumerate(cos_r):
+            out[idx[s:s + block], ri] = (dots >= c).astype(np.float64) @ w_ok
+    return out
+
+# ───────────────────────── cities ─────────────────────────────
+def city_weights(cities: List[City]) -> np.ndarray:
+    w = np.zeros((len(cities), len(METRICS)))
+    for i, c in enumerate(cities):
+        for b in c.businesses or []:
+            if b.employee_category == "500+":
+                w[i, 0] += 1
+            elif b.employee_category == "100-499":
+                w[i, 1] += 1
+        w[i, 2] = sum(u.enrollment for u in c.universities or []
+                      if u.enrollment is not None and np.isfinite(u.enrollment))
+    return w
+
+def access_by_city(cities: List[City], radii: Sequence[float] = RADII_MI) -> List[dict]:
+    lat = [np.nan if c.lat is None else c.lat for c in cities]
+    lon = [np.nan if c.lon is None else c.lon for c in cities]
+    sums = reachable_sums(lat, lon, city_weights(cities), radii)
+    out = []
+    for row in sums:
+        if np.isnan(row).any():
+            out.append(None)
+            continue
+        out.append({f"{r:g}": {m: int(round(v)) for m, v in zip(METRICS, vals)}
+                    for r, vals in zip(radii, row)})
+    return out
+
+def bench(n: int, radii=RADII_MI):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(MN_BBOX[0], MN_BBOX[1], n)
+    lon = rng.uniform(MN_BBOX[2], MN_BBOX[3], n)
+    w   = rng.integers(0, 5, (n, len(METRICS)))
+    t0 = time.perf_counter()
+    reachable_sums(lat, lon, w, radii)
+    dt = time.perf_counter() - t0
+    print(f"⏱️  {n} places × {len(radii)} radii: {dt*1000:.0f} ms "
+          f"({n * n / dt / 1e6:.0f} M pairs/s)")
+
+# ───────────────────────── main ───────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Employers / enrollment reachable from each city")
+    ap.add_argument("--radii", type=float, nargs="+", default=list(RADII_MI), metavar="MI")
+    sub = ap.add_subparsers(dest="cmd")
+    b = sub.add_parser("bench")
+    b.add_argument("n", type=int, nargs="?", default=5000)
+    args = ap.parse_args()
+    radii = sorted(set(args.radii))
+
+    if args.cmd == "bench":
+        bench(args.n, radii)
+        return
+
+    t0 = time.perf_counter()
+    cities = load_cities(CITIES_FILE)
+    access = access_by_city(cities, radii)
+    t1 = time.perf_counter()
+
+    # write into the raw records so every other field stays byte-for-byte as it was
+    raw = json.loads(CITIES_FILE.read_text(encoding="utf-8"))
+    for rec, acc in zip(raw["cities"], access):
+        rec["access"] = acc
+    CITIES_FILE.write_text(json.dumps(raw, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"🚗  {len(cities)} cities × radii {', '.join(f'{r:g}' for r in radii)} mi "
+          f"in {(t1 - t0)*1000:.0f} ms ({sum(a is None for a in access)} without coordinates)")
+    top = max(radii)
+    best = sorted((a[f"{top:g}"]["employers_500"], c.city)
+                  for c, a in zip(cities, access) if a)[-5:][::-1]
+    print(f"   most 500+ employers within {top:g} mi: " + ", ".join(f"{n} {c}" for n, c in best))
+    print(f"✅  Wrote {CITIES_FILE}")
+
+if __name__ == "__main__":
+    main()
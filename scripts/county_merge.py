@@ -1,38 +1,53 @@
 import json
 
-with open("public/cities_with_businesses_merged.json", encoding="utf-8") as f:
-    data = json.load(f)
+from paths import PUBLIC_DIR, REPO_DIR, work_file
 
-with open("counties.json", encoding="utf-8") as f:
-    county_websites = json.load(f)
+CITIES_FILE   = PUBLIC_DIR / "cities_with_businesses_merged.json"
+COUNTIES_FILE = work_file("counties.json", REPO_DIR)                # county_scraper.py output
+OUT_FILE      = work_file("cities_with_businesses_countyweb.json", REPO_DIR)
 
-missing_cities = []
-
-# Access the cities array
-cities = data.get("cities", [])
-print(f"Processing {len(cities)} cities")
-
-# Update each city with county website
-for city in cities:
+def add_county_website(city: dict, county_websites: dict):
+    """Set city["county_website"]; returns a label for the missing-list, or None if found."""
     county_name = city.get("county")
     if county_name:
         county_name = county_name.strip()
         county_site = county_websites.get(county_name, "")
         if county_site:
             city["county_website"] = county_site
-        else:
-            city["county_website"] = ""
-            missing_cities.append(f"{city.get('city')} (county: {county_name})")
-    else:
+            return None
         city["county_website"] = ""
-        missing_cities.append(f"{city.get('city')} (no county field)")
+        return f"{city.get('city')} (county: {county_name})"
+    city["county_website"] = ""
+    return f"{city.get('city')} (no county field)"
+
+def main():
+    with open(CITIES_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+
+    with open(COUNTIES_FILE, encoding="utf-8") as f:
+        county_websites = json.load(f)
+
+    missing_cities = []
+
+    # Access the cities array
+    cities = data.get("cities", [])
+    print(f"Processing {len(cities)} cities")
+
+    # Update each city with county website
+    for city in cities:
+        missing = add_county_website(city, county_websites)
+        if missing:
+            missing_cities.append(missing)
+
+    # Write updated data back
+    with open(OUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
-# Write updated data back
-with open("cities_with_businesses_countyweb.json", "w", encoding="utf-8") as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+    print("Cities missing county website:")
+    for c in missing_cities:
+        print("  -", c)
+    print(f"\nTotal missing: {len(missing_cities)} out of {len(cities)}")
+    print(f"Successfully processed and saved {len(cities)} cities")
 
-print("Cities missing county website:")
-for c in missing_cities:
-    print("  -", c)
-print(f"\nTotal missing: {len(missing_cities)} out of {len(cities)}")
-print(f"Successfully processed and saved {len(cities)} cities")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,43 @@ from bs4 import BeautifulSoup
 import json
 import time
 
+from page_archive import archive_page
+from paths import REPO_DIR, work_file
+from states import current
+
 BASE_URL = "https://en.wikipedia.org"
+OUT_FILE = work_file("counties.json", REPO_DIR)
+
+def county_list_url():
+    return f"{BASE_URL}/wiki/List_of_counties_in_{current().wiki}"
 
 def get_county_rows():
-    url = "https://en.wikipedia.org/wiki/List_of_counties_in_Minnesota"
+    url = county_list_url()
     resp = requests.get(url)
-    soup = BeautifulSoup(resp.text, "html.parser")
+    archive_page(url, resp.text, resp.status_code)
+    yield from parse_county_rows(resp.text)
+
+def parse_county_rows(html):
+    """[(county_name, wiki_url)] from the "List of counties in …" table."""
+    soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", class_="wikitable")
     tbody = table.find("tbody")
+    rows = []
     for tr in tbody.find_all("tr")[1:]:  # Skip header row
         th = tr.find("th")
         if th and th.a:
             county_name = th.a.text.replace(" County", "").strip()
             link = BASE_URL + th.a["href"]
-            yield county_name, link
+            rows.append((county_name, link))
+    return rows
 
 def extract_county_website(county_url):
     resp = requests.get(county_url)
-    soup = BeautifulSoup(resp.text, "html.parser")
+    archive_page(county_url, resp.text, resp.status_code)
+    return parse_county_website(resp.text)
+
+def parse_county_website(html):
+    soup = BeautifulSoup(html, "html.parser")
     infobox = soup.find("table", class_="infobox")
     if not infobox:
         return None
@@ -40,6 +59,23 @@ def extract_county_website(county_url):
             return None
     return None
 
+def rebuild(index_pages, county_pages):
+    """page_archive entry point: counties.json from the archived list + county pages.
+
+    Counties whose page wasn't archived keep their previous website.
+    """
+    rows = index_pages.get(county_list_url())
+    if rows is None:
+        print(f"⚠️  county list page not archived – {OUT_FILE.name} left as is")
+        return
+    prev = json.loads(OUT_FILE.read_text(encoding="utf-8")) if OUT_FILE.exists() else {}
+    results = {name: county_pages[link] or "" if link in county_pages else prev.get(name, "")
+               for name, link in rows}
+    with open(OUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"✅  Rebuilt {sum(link in county_pages for _, link in rows)}/{len(rows)} counties "
+          f"from the archive → {OUT_FILE}")
+
 def main():
     results = {}
     for county_name, wiki_url in get_county_rows():
@@ -52,9 +88,9 @@ def main():
             print(f"ERROR: {e}")
             results[county_name] = ""
         time.sleep(0.5)  # Polite scraping
-    with open("counties.json", "w", encoding="utf-8") as f:
+    with open(OUT_FILE, "w", encoding="utf-8") as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
-    print("All done! Output: counties.json")
+    print(f"All done! Output: {OUT_FILE}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+SQLite store for the opportunity index
+--------------------------------------
+Loads the scraper / merge outputs into one indexed database and rebuilds
+the frontend JSON from SQL views, so questions like "every 500+ employer in
+Olmsted county" are an indexed query instead of a scan over megabytes of JSON.
+
+    python scripts/db.py ingest            # upsert every source that changed
+    python scripts/db.py ingest --force    # re-read sources even if unchanged
+    python scripts/db.py export [--out data/export]
+
+DB file : data/mnoi.sqlite
+Sources : cities_full.json      → cities, demographics, universities, businesses (source 'full')
+          city_businesses.json  → businesses (source 'scrape': all three bands, raw_city)
+          mn_demo_full.json     → demographics
+          city_news_fixed.json  → news
+          city_images.json      → cities.image_url
+Exports : cities_full.json, city_news_fixed.json, city_businesses.json
+
+Ingestion is incremental: every row is an upsert on its natural key and a
+source file is skipped when its size + mtime match the previous ingest.
+Businesses are keyed on (city, source, size band, name, description), so
+exact repeats within a band collapse into one row. The merged employer
+lists from cities_full.json and the raw scrape are kept apart by `source`.
+cities_full.json is rebuilt from the first, city_businesses.json from the
+second. Exports go to data/export/ unless --out says otherwise, so an
+export never overwrites the files it was ingested from.
+
+A database built with an older SCHEMA_VERSION is dropped and rebuilt on
+connect. It only holds derived data, so the next ingest refills it.
+"""
+import argparse, json, pathlib, re, sqlite3, time
+
+from models import load_cities
+from paths import PUBLIC_DIR, DATA_DIR, PREFIX
+
+DB_FILE    = DATA_DIR / "mnoi.sqlite"
+EXPORT_DIR = DATA_DIR / "export"
+
+SCHEMA_VERSION = 3
+
+SIZE_BANDS = ("500+", "100-499", "10-99")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    name        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime       REAL    NOT NULL,
+    ingested_at REAL    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cities (
+    id                  INTEGER PRIMARY KEY,
+    name                TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    slug                TEXT NOT NULL UNIQUE,
+    county              TEXT COLLATE NOCASE,
+    population_2020     INTEGER,
+    latitude            TEXT,
+    longitude           TEXT,
+    lat                 REAL,
+    lon                 REAL,
+    incorporated_year   INTEGER,
+    website             TEXT,
+    fips_code           TEXT,
+    gnis_id             TEXT,
+    density_sq_mi       REAL,
+    wikipedia_url       TEXT,
+    overview            TEXT,
+    overview_characters INTEGER,
+    is_county_seat      INTEGER NOT NULL DEFAULT 0,
+    is_state_capital    INTEGER NOT NULL DEFAULT 0,
+    county_website      TEXT,
+    image_url           TEXT,
+    access              TEXT,                   -- JSON {radius: counts} from commute_shed.py
+    updated_at          REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cities_county     ON cities(county);
+CREATE INDEX IF NOT EXISTS ix_cities_population ON cities(population_2020);
+CREATE INDEX IF NOT EXISTS ix_cities_latlon     ON cities(lat, lon);
+
+CREATE TABLE IF NOT EXISTS demographics (
+    city_id        INTEGER PRIMARY KEY REFERENCES cities(id) ON DELETE CASCADE,
+    median_age     REAL,
+    median_income  INTEGER,
+    race_breakdown TEXT,                    -- JSON object {group: pct}
+    updated_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_demo_income ON demographics(median_income);
+
+CREATE TABLE IF NOT EXISTS universities (
+    id         INTEGER PRIMARY KEY,
+    city_id    INTEGER NOT NULL REFERENCES cities(id) ON DELETE CASCADE,
+    name       TEXT NOT NULL,
+    enrollment REAL,
+    website    TEXT,
+    tuition    INTEGER,
+    position   INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    UNIQUE (city_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS businesses (
+    id          INTEGER PRIMARY KEY,
+    city_id     INTEGER NOT NULL REFERENCES cities(id) ON DELETE CASCADE,
+    source      TEXT NOT NULL,              -- 'full' (cities_full.json) / 'scrape' (city_businesses.json)
+    size_band   TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    industry    TEXT NOT NULL DEFAULT '',
+    website     TEXT,
+    raw_city    TEXT,
+    position    INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL,
+    UNIQUE (city_id, source, size_band, name, description)
+);
+CREATE INDEX IF NOT EXISTS ix_biz_city_band ON businesses(city_id, source, size_band, position);
+CREATE INDEX IF NOT EXISTS ix_biz_industry  ON businesses(industry, size_band);
+CREATE INDEX IF NOT EXISTS ix_biz_band      ON businesses(size_band);
+
+CREATE TABLE IF NOT EXISTS news (
+    id          INTEGER PRIMARY KEY,
+    city_id     INTEGER NOT NULL REFERENCES cities(id) ON DELETE CASCADE,
+    link        TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    position    INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL,
+    UNIQUE (city_id, link)
+);
+CREATE INDEX IF NOT EXISTS ix_news_city ON news(city_id, position);
+
+-- ── export views ────────────────────────────────────────────────────────
+DROP VIEW IF EXISTS v_city_full;
+CREATE VIEW v_city_full AS
+SELECT c.id, c.population_2020, json_patch(
+    json_object(
+        'city', c.name,
+        'population_2020', c.population_2020,
+        'county', c.county,
+        'latitude', c.latitude,
+        'longitude', c.longitude,
+        'lat', c.lat,
+        'lon', c.lon,
+        'incorporated_year', c.incorporated_year,
+        'website', c.website,
+        'fips_code', c.fips_code,
+        'gnis_id', c.gnis_id,
+        'density_sq_mi', c.density_sq_mi,
+        'wikipedia_url', c.wikipedia_url,
+        'overview', c.overview,
+        'overview_characters', c.overview_characters,
+        'is_county_seat', json(CASE WHEN c.is_county_seat THEN 'true' ELSE 'false' END),
+        'is_state_capital', json(CASE WHEN c.is_state_capital THEN 'true' ELSE 'false' END),
+        'median_age', d.median_age,
+        'median_income', d.median_income,
+        'race_breakdown', json(d.race_breakdown),
+        'county_website', c.county_website,
+        'access', json(c.access)
+    ),
+    json_object(
+        'universities', (
+            SELECT json_group_array(json_object(
+                       'name', u.name, 'enrollment', u.enrollment,
+                       'website', u.website, 'tuition', u.tuition))
+            FROM (SELECT * FROM universities WHERE city_id = c.id ORDER BY position) u
+            HAVING count(*) > 0),
+        'businesses', (
+            SELECT json_group_array(json_patch(     -- json_patch drops a NULL website
+                       json_object('name', b.name, 'employee_category', b.size_band,
+                                   'industry', b.industry, 'description', b.description),
+                       json_object('website', b.website)))
+            FROM (SELECT * FROM businesses
+                  WHERE city_id = c.id AND source = 'full'
+                  ORDER BY position) b
+            HAVING count(*) > 0)
+    )
+) AS doc
+FROM cities c LEFT JOIN demographics d ON d.city_id = c.id;
+
+DROP VIEW IF EXISTS v_city_news;
+CREATE VIEW v_city_news AS
+SELECT c.id, c.name, (
+    SELECT json_group_array(json_object('title', n.title, 'link', n.link, 'description', n.description))
+    FROM (SELECT * FROM news WHERE city_id = c.id ORDER BY position) n
+) AS doc
+FROM cities c;
+
+DROP VIEW IF EXISTS v_city_businesses;
+CREATE VIEW v_city_businesses AS
+SELECT b.city_id, c.name AS city, b.size_band, json_group_array(json_object(
+           'name', b.name, 'description', b.description, 'industry', b.industry,
+           'raw_city', b.raw_city, 'website', b.website)) AS doc
+FROM (SELECT * FROM businesses WHERE source = 'scrape' ORDER BY city_id, size_band, position) b
+JOIN cities c ON c.id = b.city_id
+GROUP BY b.city_id, b.size_band;
+"""
+
+def slugify(name: str) -> str:
+    """Same slug the React router uses (CityPage.jsx)."""
+    return re.sub(r"(^-|-$)", "", re.sub(r"[^a-z0-9]+", "-", name.lower()))
+
+def connect(path=DB_FILE) -> sqlite3.Connection:
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode = WAL")
+    con.execute("PRAGMA synchronous = NORMAL")
+    con.execute("PRAGMA foreign_keys = ON")
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        tables = [t for (t,) in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        if tables:
+            print(f"   ↺ {path.name}: schema v{version} → v{SCHEMA_VERSION}, rebuilding (re-ingest to refill)")
+        con.execute("PRAGMA foreign_keys = OFF")
+        for t in tables:
+            con.execute(f"DROP TABLE IF EXISTS {t}")
+        con.execute("PRAGMA foreign_keys = ON")
+        con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    con.executescript(SCHEMA)
+    return con
+
+def city_ids(con) -> dict:
+    return {name.lower(): cid for cid, name in con.execute("SELECT id, name FROM cities")}
+
+# ───────────────────────── ingest steps ───────────────────────
+def ingest_cities(con, path: pathlib.Path, now: float) -> int:
+    cities = load_cities(path)
+    for c in cities:
+        row = dict(
+            name=c.city, slug=slugify(c.city), county=c.county, population_2020=c.population_2020,
+            latitude=c.latitude, longitude=c.longitude, lat=c.lat, lon=c.lon,
+            incorporated_year=c.incorporated_year, website=c.website, fips_code=c.fips_code,
+            gnis_id=c.gnis_id, density_sq_mi=c.density_sq_mi, wikipedia_url=c.wikipedia_url,
+            overview=c.overview, overview_characters=c.overview_characters,
+            is_county_seat=int(c.is_county_seat), is_state_capital=int(c.is_state_capital),
+            county_website=c.county_website or None,
+            access=json.dumps(c.access) if c.access is not None else None, updated_at=now,
+        )
+        cols = ", ".join(row)
+        sets = ", ".join(f"{k} = excluded.{k}" for k in row if k != "name")
+        cid = con.execute(
+            f"INSERT INTO cities ({cols}) VALUES ({', '.join(':' + k for k in row)}) "
+            f"ON CONFLICT(name) DO UPDATE SET {sets} RETURNING id", row,
+        ).fetchone()[0]
+
+        if c.median_age is not None or c.median_income is not None or c.race_breakdown:
+            upsert_demographics(con, cid, c.median_age, c.median_income, c.race_breakdown, now)
+
+        for pos, u in enumerate(c.universities or []):
+            con.execute(
+                "INSERT INTO universities (city_id, name, enrollment, website, tuition, position, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(city_id, name) DO UPDATE SET "
+                "enrollment = excluded.enrollment, website = COALESCE(excluded.website, universities.website), "
+                "tuition = COALESCE(excluded.tuition, universities.tuition), position = excluded.position, "
+                "updated_at = excluded.updated_at",
+                (cid, u.name, u.enrollment, u.website, u.tuition, pos, now),
+            )
+
+        # one list in file order; position keeps the merged order across bands
+        upsert_businesses(con, cid, "full", None, [
+            {"band": b.employee_category, "name": b.name, "description": b.description,
+             "industry": b.industry, "website": b.website} for b in c.businesses or []], now)
+    return len(cities)
+
+def upsert_demographics(con, cid, median_age, median_income, race, now):
+    con.execute(
+        "INSERT INTO demographics (city_id, median_age, median_income, race_breakdown, updated_at) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(city_id) DO UPDATE SET "
+        "median_age = excluded.median_age, median_income = excluded.median_income, "
+        "race_breakdown = COALESCE(excluded.race_breakdown, demographics.race_breakdown), "
+        "updated_at = excluded.updated_at",
+        (cid, median_age, median_income, json.dumps(race) if race else None, now),
+    )
+
+def upsert_businesses(con, cid, source, band, rows, now):
+    """Upsert one city's rows from `source` (one size band, or every band when `band` is None).
+
+    Rows the source no longer lists are dropped, so an empty `rows` clears the band.
+    """
+    con.executemany(
+        "INSERT INTO businesses (city_id, source, size_band, name, description, industry, website, raw_city, position, updated_at) "
+        "VALUES (:cid, :source, :band, :name, :description, :industry, :website, :raw_city, :position, :now) "
+        "ON CONFLICT(city_id, source, size_band, name, description) DO UPDATE SET "
+        "industry = excluded.industry, website = COALESCE(excluded.website, businesses.website), "
+        "raw_city = COALESCE(excluded.raw_city, businesses.raw_city), position = excluded.position, "
+        "updated_at = excluded.updated_at",
+        [{"cid": cid, "source": source, "band": band or r["band"], "name": r["name"], "description": r.get("description") or "",
+          "industry": r.get("industry") or "", "website": r.get("website"), "raw_city": r.get("raw_city"),
+          "position": pos, "now": now} for pos, r in enumerate(rows)],
+    )
+    if band is None:
+        con.execute("DELETE FROM businesses WHERE city_id = ? AND source = ? AND updated_at < ?",
+                    (cid, source, now))
+    else:
+        con.execute("DELETE FROM businesses WHERE city_id = ? AND source = ? AND size_band = ? AND updated_at < ?",
+                    (cid, source, band, now))
+
+def ingest_city_businesses(con, path: pathlib.Path, now: float) -> int:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    data = raw.get("cities", {})
+    ids, missing = city_ids(con), []
+    for name in raw.get("no_results", []):
+        if name.lower() in ids:
+            upsert_businesses(con, ids[name.lower()], "scrape", None, [], now)
+    for name, buckets in data.items():
+        cid = ids.get(name.lower())
+        if cid is None:
+            missing.append(name)
+            continue
+        for band in SIZE_BANDS:
+            upsert_businesses(con, cid, "scrape", band, buckets.get(band) or [], now)
+    if missing:
+        print(f"   ⚠️  {len(missing)} business cities not in cities table (e.g. {missing[0]})")
+    return len(data) - len(missing)
+
+def ingest_demographics(con, path: pathlib.Path, now: float) -> int:
+    from merge_demo import clean_demo_city, parse_race_block
+    ids, n = city_ids(con), 0
+    for d in json.loads(path.read_text(encoding="utf-8")):
+        cid = ids.get(clean_demo_city(d["city"]))
+        if cid is None:
+            continue
+        upsert_demographics(con, cid, d.get("median_age"), d.get("median_income"),
+                            parse_race_block(d.get("race_ethnicity")) or None, now)
+        n += 1
+    return n
+
+def ingest_news(con, path: pathlib.Path, now: float) -> int:
+    ids, n = city_ids(con), 0
+    for name, stories in json.loads(path.read_text(encoding="utf-8")).items():
+        cid = ids.get(name.lower())
+        if cid is None:
+            continue
+        con.executemany(
+            "INSERT INTO news (city_id, link, title, description, position, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(city_id, link) DO UPDATE SET "
+            "title = excluded.title, description = excluded.description, "
+            "position = excluded.position, updated_at = excluded.updated_at",
+            [(cid, s["link"], s["title"], s.get("description") or "", pos, now)
+             for pos, s in enumerate(stories)],
+        )
+        con.execute("DELETE FROM news WHERE city_id = ? AND updated_at < ?", (cid, now))
+        n += 1
+    return n
+
+def ingest_images(con, path: pathlib.Path, now: float) -> int:
+    rows = [(r.get("image_url"), now, r["city"]) for r in json.loads(path.read_text(encoding="utf-8"))]
+    con.executemany("UPDATE cities SET image_url = ?, updated_at = ? WHERE name = ?", rows)
+    return len(rows)
+
+# order matters: cities first so the other sources can resolve city ids
+SOURCES = [
+    ("cities_full.json",     ingest_cities),
+    ("city_businesses.json", ingest_city_businesses),
+    (f"{PREFIX}_demo_full.json", ingest_demographics),
+    ("city_news_fixed.json", ingest_news),
+    ("city_images.json",     ingest_images),
+]
+
+def ingest(con, src_dir=PUBLIC_DIR, force=False):
+    for name, step in SOURCES:
+        path = pathlib.Path(src_dir) / name
+        if not path.exists():
+            print(f"— {name}: missing, skipped")
+            continue
+        st = path.stat()
+        prev = con.execute("SELECT size, mtime FROM sources WHERE name = ?", (name,)).fetchone()
+        if not force and prev == (st.st_size, st.st_mtime):
+            print(f"— {name}: unchanged since last ingest")
+            continue
+
+        t0, now = time.perf_counter(), time.time()
+        with con:
+            n = step(con, path, now)
+            con.execute(
+                "INSERT INTO sources (name, size, mtime, ingested_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET size = excluded.size, mtime = excluded.mtime, "
+                "ingested_at = excluded.ingested_at",
+                (name, st.st_size, st.st_mtime, now),
+            )
+        print(f"✓ {name}: {n} records upserted in {(time.perf_counter() - t0)*1000:.0f} ms")
+    con.execute("PRAGMA optimize")
+
+# ───────────────────────── export ─────────────────────────────
+def export(con, out_dir=EXPORT_DIR):
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    docs = [doc for (doc,) in con.execute(
+        "SELECT doc FROM v_city_full ORDER BY population_2020 DESC, id")]
+    (out_dir / "cities_full.json").write_text('{"cities":[' + ",".join(docs) + "]}", encoding="utf-8")
+
+    news = [f"{json.dumps(name, ensure_ascii=False)}:{doc}"
+            for name, doc in con.execute("SELECT name, doc FROM v_city_news ORDER BY id")]
+    (out_dir / "city_news_fixed.json").write_text("{" + ",".join(news) + "}", encoding="utf-8")
+
+    by_city = {}
+    for city, band, doc in con.execute("SELECT city, size_band, doc FROM v_city_businesses ORDER BY city_id"):
+        by_city.setdefault(city, {})[band] = json.loads(doc)
+    no_results = [n for (n,) in con.execute(
+        "SELECT name FROM cities c WHERE NOT EXISTS "
+        "(SELECT 1 FROM businesses b WHERE b.city_id = c.id AND b.source = 'scrape') ORDER BY id")]
+    (out_dir / "city_businesses.json").write_text(
+        json.dumps({"cities": by_city, "no_results": no_results}, ensure_ascii=False), encoding="utf-8")
+
+    print(f"✅  Exported {len(docs)} cities → {out_dir} in {(time.perf_counter() - t0)*1000:.0f} ms")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--db", default=DB_FILE, type=pathlib.Path)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_in = sub.add_parser("ingest", help="upsert scraper outputs into the database")
+    p_in.add_argument("--src", default=PUBLIC_DIR, type=pathlib.Path)
+    p_in.add_argument("--force", action="store_true", help="ignore the unchanged-source check")
+    p_out = sub.add_parser("export", help="rebuild the frontend JSON from SQL views")
+    p_out.add_argument("--out", default=EXPORT_DIR, type=pathlib.Path,
+                       help="output directory (default: data/export; pass public/ to publish)")
+    args = ap.parse_args()
+
+    con = connect(args.db)
+    if args.cmd == "ingest":
+        ingest(con, args.src, force=args.force)
+    else:
+        export(con, args.out)
+    con.close()
+
+if __name__ == "__main__":
+    main()
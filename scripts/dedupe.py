@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for businesses and cities
+--------------------------------------------------
+INPUT : public/city_businesses.json            (all three size bands)
+        public/cities_with_businesses.json     (city names)
+OUTPUT: public/business_dupes.json
+
+duplicate.py only catches exact repeated city names. This finds
+  * within-city duplicates  – "Target Corp HQ" vs "Target Corp", or the
+    same firm listed in two size bands of one city
+  * cross-city duplicates   – the same establishment filed under two city
+    keys (CareerOneStop's location match lets "Mendota" pick up
+    MENDOTA HEIGHTS firms), detected via the scraped raw_city
+  * near-duplicate city names
+
+Candidates come from MinHash/LSH over character trigrams of a normalised
+name (corporate suffixes and abbreviations folded), so work grows with the
+number of records, not their square. Inside an LSH bucket pairs are only
+formed between records that share a city key or a raw_city, which keeps
+national chains (one "Subway" per town) from blowing up the buckets.
+Candidates are verified with exact trigram Jaccard plus an industry check;
+pairs whose names differ by a directional or department word ("… West" /
+"… East", "Brown County" / "Brown County Jail") are separate employers and
+never match. Verified pairs are grouped with complete linkage – two groups
+only merge when every cross pair verifies – so one loose pair can't chain
+distinct employers into a cluster.
+
+"exact" and "same_name" clusters get a merge suggestion: which row to
+keep, which to drop, and how many rows the drop removes from each size
+band's totals. "near" clusters are only flagged for review.
+"""
+import json, pathlib, re, time, zlib
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from paths import PUBLIC_DIR
+
+BIZ_FILE   = PUBLIC_DIR / "city_businesses.json"
+CITY_FILE  = PUBLIC_DIR / "cities_with_businesses.json"
+OUT_FILE   = PUBLIC_DIR / "business_dupes.json"
+
+SIZE_BANDS = ("500+", "100-499", "10-99")
+
+NUM_PERM   = 32
+BANDS      = 16            # 16 bands × 2 rows → ~50% hit rate at Jaccard 0.25
+ROWS       = NUM_PERM // BANDS
+MATCH_SIM  = 0.7           # trigram Jaccard needed when industries agree
+STRONG_SIM = 0.9           # …and when they don't
+CITY_SIM   = 0.8
+
+_PRIME = (1 << 61) - 1
+_PERMS = [((i * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) % _PRIME | 1,
+           (i * 0xC2B2AE3D27D4EB4F + 0x165667B19E3779F9) % _PRIME) for i in range(1, NUM_PERM + 1)]
+
+NOISE = frozenset("""
+    inc incorporated llc llp lllp ltd co company corp corporation pa pc plc pllc
+    the hq headquarters corporate office offices
+""".split())
+ABBREV = {
+    "ctr": "center", "cntr": "center", "hosp": "hospital", "hsp": "hospital", "svc": "service",
+    "svcs": "services", "dept": "department", "dpt": "department", "intl": "international",
+    "natl": "national", "mfg": "manufacturing", "assn": "association", "univ": "university",
+    "sch": "school", "schl": "school", "med": "medical", "mn": "minnesota", "st": "saint",
+    "mt": "mount", "&": "and",
+}
+# names differing by one of these are different sites/departments, not typos
+DISTINCT = frozenset("""
+    north south east west northeast northwest southeast southwest n s e w ne nw se sw
+    upper lower elementary middle junior senior high
+    jail court courts sheriff sheriffs attorney administrator admin auditor assessor
+    recorder treasurer highway library police fire park parks rec recreation finance
+    wic probation corrections va veterans women womens men mens
+""".split())
+
+# ───────────────────────── normalisation ──────────────────────
+def norm_name(name: str) -> str:
+    toks = re.findall(r"[a-z0-9&]+", name.lower().replace("'", ""))
+    toks = [ABBREV.get(t, t) for t in toks]
+    kept = [t for t in toks if t not in NOISE]
+    return " ".join(kept or toks)
+
+def canon_place(text: str) -> str:
+    """'ST PAUL, MN' / 'Saint Paul' / 'St. Paul' → 'saint paul'."""
+    text = text.split(",")[0].lower().replace(".", " ")
+    return " ".join(ABBREV.get(t, t) for t in text.split())
+
+def trigrams(s: str) -> frozenset:
+    s = f"  {s} "
+    return frozenset(s[i:i + 3] for i in range(len(s) - 2))
+
+def numbers(s: str) -> frozenset:
+    """Station 2 vs Station 3, ISD 833 vs ISD 834 – differing numbers veto a match."""
+    return frozenset(re.findall(r"\d+", s))
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def distinct_tokens(a: str, b: str) -> bool:
+    """'chaska middle school west' vs '… east' – a directional/department word tells them apart."""
+    return not DISTINCT.isdisjoint(set(a.split()) ^ set(b.split()))
+
+_SHINGLE_HASHES: Dict[str, tuple] = {}
+
+def shingle_hashes(s: str) -> tuple:
+    """All NUM_PERM permuted hashes of one trigram; the trigram vocabulary is small, so memoise."""
+    hv = _SHINGLE_HASHES.get(s)
+    if hv is None:
+        h = zlib.crc32(s.encode())
+        hv = _SHINGLE_HASHES[s] = tuple((a * h + b) % _PRIME for a, b in _PERMS)
+    return hv
+
+def minhash(shingles: frozenset) -> tuple:
+    return tuple(map(min, zip(*map(shingle_hashes, shingles))))
+
+def lsh_buckets(sigs: List[tuple]) -> Dict[tuple, List[int]]:
+    buckets = defaultdict(list)
+    for i, sig in enumerate(sigs):
+        for band in range(BANDS):
+            buckets[band, sig[band * ROWS:(band + 1) * ROWS]].append(i)
+    return buckets
+
+def complete_linkage(n: int, edges: Dict[tuple, float], verify) -> List[List[int]]:
+    """Merge along `edges` (strongest first) only when every cross pair passes `verify`."""
+    group = list(range(n))
+    members = {i: [i] for i in range(n)}
+    for (i, j), _ in sorted(edges.items(), key=lambda e: (-e[1], e[0])):
+        gi, gj = group[i], group[j]
+        if gi == gj:
+            continue
+        if all(verify(x, y) is not None for x in members[gi] for y in members[gj]):
+            keep, gone = min(gi, gj), max(gi, gj)
+            for x in members[gone]:
+                group[x] = keep
+            members[keep] += members.pop(gone)
+    return [m for m in members.values() if len(m) > 1]
+
+# ───────────────────────── businesses ─────────────────────────
+def load_rows(path=BIZ_FILE) -> List[dict]:
+    data = json.loads(pathlib.Path(path).read_text(encoding="utf-8")).get("cities", {})
+    rows = []
+    for city, buckets in data.items():
+        for band in SIZE_BANDS:
+            for pos, b in enumerate(buckets.get(band, [])):
+                rows.append({
+                    "city": city, "band": band, "pos": pos, "name": b["name"],
+                    "industry": b.get("industry", ""), "description": b.get("description", ""),
+                    "raw_city": b.get("raw_city", ""), "website": b.get("website"),
+                })
+    return rows
+
+def candidate_pairs(rows, sigs):
+    """LSH candidates restricted to records sharing a city key or a raw_city."""
+    city_key = [canon_place(r["city"]) for r in rows]
+    raw_key  = [canon_place(r["raw_city"]) if r["raw_city"] else city_key[i] for i, r in enumerate(rows)]
+    pairs = set()
+    for members in lsh_buckets(sigs).values():
+        if len(members) < 2:
+            continue
+        groups = defaultdict(list)
+        for i in members:
+            groups["city", city_key[i]].append(i)
+            groups["raw", raw_key[i]].append(i)
+        for g in groups.values():
+            for x in range(len(g)):
+                for y in range(x + 1, len(g)):
+                    pairs.add((g[x], g[y]) if g[x] < g[y] else (g[y], g[x]))
+    return pairs, raw_key
+
+def band_rank(band: str) -> int:
+    return SIZE_BANDS.index(band)
+
+def suggest(rows, members, raw_key, confidence: str) -> dict:
+    """Keep the row filed under its own town, in the largest band, with the most detail.
+
+    `members` is the cluster's row ids in output order; keep/drop are positions in it.
+    "near" clusters only get the would-be canonical row and a review flag, no drops.
+    """
+    def score(k):
+        i = members[k]
+        r = rows[i]
+        home = canon_place(r["city"]) == raw_key[i]
+        return (home, -band_rank(r["band"]), bool(r["website"]), len(r["name"]))
+    keep = max(range(len(members)), key=score)
+    if confidence == "near":
+        return {"review": True, "keep": keep, "drop": [],
+                "canonical_name": rows[members[keep]]["name"], "removes_from_totals": {}}
+    drop = [k for k in range(len(members)) if k != keep]
+    return {
+        "review": False,
+        "keep": keep,
+        "drop": drop,
+        "canonical_name": rows[members[keep]]["name"],
+        "removes_from_totals": dict(Counter(rows[members[k]]["band"] for k in drop)),
+    }
+
+def find_business_dupes(rows):
+    norms   = [norm_name(r["name"]) for r in rows]
+    grams   = [trigrams(n) for n in norms]
+    memo    = {}                      # chains repeat names → hash each distinct name once
+    sigs    = [memo[n] if n in memo else memo.setdefault(n, minhash(g)) for n, g in zip(norms, grams)]
+    pairs, raw_key = candidate_pairs(rows, sigs)
+
+    verified = {}
+    def verify(i, j):
+        """Similarity if i and j are the same establishment, else None."""
+        key = (i, j) if i < j else (j, i)
+        if key not in verified:
+            sim = None
+            if norms[i] == norms[j]:
+                sim = 1.0
+            elif numbers(norms[i]) == numbers(norms[j]) and not distinct_tokens(norms[i], norms[j]):
+                sim = jaccard(grams[i], grams[j])
+                same_ind = rows[i]["industry"] == rows[j]["industry"]
+                if not (sim >= STRONG_SIM or (sim >= MATCH_SIM and same_ind)):
+                    sim = None
+            verified[key] = sim
+        return verified[key]
+
+    edges = {p: sim for p in pairs if (sim := verify(*p)) is not None}
+
+    out = []
+    for members in complete_linkage(len(rows), edges, verify):
+        min_sim = min(verify(x, y) for k, x in enumerate(members) for y in members[k + 1:])
+        members.sort(key=lambda i: (rows[i]["city"], band_rank(rows[i]["band"]), rows[i]["pos"]))
+        cities = {rows[i]["city"] for i in members}
+        if len({(norms[i], rows[i]["description"], rows[i]["industry"]) for i in members}) == 1:
+            confidence = "exact"          # same firm, same listing
+        elif len({norms[i] for i in members}) == 1:
+            confidence = "same_name"      # could still be separate sites of one employer
+        else:
+            confidence = "near"
+        out.append({
+            "kind": "cross_city" if len(cities) > 1 else "within_city",
+            "confidence": confidence,
+            "min_similarity": round(min_sim, 3),
+            "members": [{k: rows[i][k] for k in ("city", "band", "pos", "name", "industry", "description", "raw_city")}
+                        for i in members],
+            "suggestion": suggest(rows, members, raw_key, confidence),
+        })
+    out.sort(key=lambda c: (c["kind"] != "cross_city", -len(c["members"]), c["members"][0]["name"]))
+    return out, len(pairs)
+
+# ───────────────────────── cities ─────────────────────────────
+def find_city_dupes(names: List[str]):
+    norms = [canon_place(n) for n in names]
+    grams = [trigrams(n) for n in norms]
+    sigs  = [minhash(g) for g in grams]
+    seen, out = set(), []
+    for members in lsh_buckets(sigs).values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = sorted((members[x], members[y]))
+                if (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                sim = 1.0 if norms[i] == norms[j] else jaccard(grams[i], grams[j])
+                if sim >= CITY_SIM:
+                    out.append({"cities": [names[i], names[j]], "similarity": round(sim, 3)})
+    return sorted(out, key=lambda c: -c["similarity"])
+
+# ───────────────────────── main ───────────────────────────────
+def main():
+    t0 = time.perf_counter()
+    rows = load_rows()
+    clusters, n_pairs = find_business_dupes(rows)
+    t1 = time.perf_counter()
+
+    names = [c["city"] for c in json.loads(CITY_FILE.read_text(encoding="utf-8"))["cities"]]
+    city_dupes = find_city_dupes(names)
+
+    inflation = Counter()
+    for c in clusters:
+        inflation.update(c["suggestion"]["removes_from_totals"])
+
+    summary = {
+        "records": len(rows),
+        "candidate_pairs": n_pairs,
+        "clusters": len(clusters),
+        "within_city": sum(c["kind"] == "within_city" for c in clusters),
+        "cross_city": sum(c["kind"] == "cross_city" for c in clusters),
+        "needs_review": sum(c["suggestion"]["review"] for c in clusters),
+        "duplicate_rows_by_band": {b: inflation.get(b, 0) for b in SIZE_BANDS},
+        "near_duplicate_city_names": len(city_dupes),
+    }
+    OUT_FILE.write_text(json.dumps(
+        {"summary": summary, "business_clusters": clusters, "city_clusters": city_dupes},
+        indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"🔍  {len(rows)} businesses → {n_pairs} candidate pairs → {len(clusters)} clusters "
+          f"in {t1 - t0:.2f}s")
+    print(f"   within-city {summary['within_city']}, cross-city {summary['cross_city']}, "
+          f"{summary['needs_review']} near clusters flagged for review")
+    print(f"   rows inflating business_report totals: {summary['duplicate_rows_by_band']}")
+    print(f"   near-duplicate city names: {len(city_dupes)}")
+    print(f"✅  Wrote {OUT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Fake origin + offline scraper load test
+---------------------------------------
+INPUT : data/pages/                      recorded pages (page_archive.py)
+OUTPUT: data/loadtest/<scraper>.log      each scraper's stdout / stderr
+        data/loadtest/report.json        per-scraper throughput, faults, peak memory
+
+A local HTTP server replays archived pages for every site the scrapers hit,
+so throughput can be measured and tuned without touching CareerOneStop,
+Wikipedia, Fox9 or the demographics sites:
+
+    python scripts/fake_origin.py bench                          # every scraper, 20 s each
+    python scripts/fake_origin.py bench businesses news --seconds 60 \\
+        --latency 120 --p429 0.05 --ptimeout 0.02 --pmalformed 0.05
+    python scripts/fake_origin.py serve --port 8765              # just the server
+
+Each scraper runs in its own process with requests routed to the server
+(https://host/path?q → http://127.0.0.1:port/host/path?q). Nothing else is
+reachable. Polite sleeps are skipped unless --keep-sleeps, client timeouts
+are capped at --client-timeout, archiving is off, and outputs go to a scratch
+directory.
+
+A URL that was recorded is replayed as-is. Otherwise the server serves
+another recorded page of the same route (ROUTES). For paginated routes that
+page comes from a different `vary` value, so e.g. CareerOneStop pagination
+ends the way it does live. A route with no recordings is a 404.
+
+Faults are drawn per request from a seeded RNG:
+    429        Retry-After: 1
+    timeout    the server holds the connection for --hang s, then drops it
+    malformed  the page is cut short and its closing table tags removed
+"""
+import argparse, http.server, json, os, pathlib, random, re, shutil, subprocess, sys, tempfile
+import threading, time, zlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from page_archive import ARCHIVE_DIR, PageArchive
+from paths import DATA_DIR, PUBLIC_DIR
+
+OUT_DIR = DATA_DIR / "loadtest"
+
+# route → (url pattern, query parameter that distinguishes pages); first match wins
+ROUTES = {
+    "businesses":         (r"careeronestop\.org/Toolkit/Jobs/find-businesses-results\.aspx", "location"),
+    "business_profiles":  (r"careeronestop\.org/", None),
+    "demographics_index": (r"-demographics\.com/counties-cities-that-begin-with-", None),
+    "demographics":       (r"-demographics\.com/", None),
+    "news":               (r"fox9\.com/search\?", "q"),
+    "wikipedia_lists":    (r"en\.wikipedia\.org/wiki/List_of", None),
+    "wikipedia":          (r"en\.wikipedia\.org/wiki/", None),
+}
+
+# mnoi scrape target → public/ files it reads
+INPUTS = {
+    "universities": (),
+    "demographics": (),
+    "businesses":   ("basic_cities_with_uni.json",),
+    "counties":     (),
+    "news":         ("cities_with_businesses_merged.json",),
+    "images":       ("basic_cities.json",),
+}
+
+def route_of(url: str) -> Optional[str]:
+    return next((name for name, (rx, _) in ROUTES.items() if re.search(rx, url)), None)
+
+def _vary(url: str, param: Optional[str]) -> Optional[str]:
+    return parse_qs(urlsplit(url).query).get(param, [None])[0] if param else None
+
+# ───────────────────────── server ─────────────────────────────
+class FakeOrigin:
+    def __init__(self, archive_root=ARCHIVE_DIR, latency_ms=0.0, p429=0.0, ptimeout=0.0,
+                 pmalformed=0.0, hang=3.0, seed=0):
+        self.archive = PageArchive(archive_root)
+        self.by_url: Dict[str, dict] = {}
+        self.by_route: Dict[str, List[dict]] = defaultdict(list)
+        for e in self.archive.entries():
+            route = route_of(e["url"])
+            if e["status"] == 200 and route:
+                self.by_url[e["url"]] = e
+                self.by_route[route].append(e)
+        self.latency_ms, self.hang = latency_ms, hang
+        self.faults = (("429", p429), ("timeout", ptimeout), ("malformed", pmalformed))
+        self.rng  = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = Counter()
+            self.routes = Counter()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"outcomes": dict(self.stats), "routes": dict(self.routes)}
+
+    def _draw(self):
+        with self.lock:
+            r, jitter = self.rng.random(), self.rng.random()
+        for name, p in self.faults:
+            if r < p:
+                return name, jitter
+            r -= p
+        return None, jitter
+
+    def lookup(self, url: str, route: str) -> Optional[dict]:
+        e = self.by_url.get(url)
+        if e:
+            return e
+        param = ROUTES[route][1]
+        own = _vary(url, param)
+        pool = [c for c in self.by_route.get(route, ()) if param is None or _vary(c["url"], param) != own]
+        return pool[zlib.crc32(url.encode()) % len(pool)] if pool else None
+
+    def mangle(self, body: str, seed: int) -> str:
+        rng = random.Random(seed)
+        cut = body[: int(len(body) * rng.uniform(0.3, 0.9))]
+        return re.sub(r"</(tbody|table|tr|ul)>", "", cut)
+
+    def respond(self, h: http.server.BaseHTTPRequestHandler):
+        url = "https://" + h.path.lstrip("/")
+        route = route_of(url)
+        fault, jitter = self._draw()
+        if self.latency_ms:
+            time.sleep(self.latency_ms * (0.5 + jitter) / 1000)
+
+        def count(outcome, nbytes=0):
+            with self.lock:
+                self.stats[outcome] += 1
+                self.stats["bytes"] += nbytes
+                self.routes[route or "unrouted"] += 1
+
+        if fault == "timeout":
+            time.sleep(self.hang)
+            h.close_connection = True
+            count("timeout")
+            return
+        if fault == "429":
+            self._send(h, 429, b"Too Many Requests", {"Retry-After": "1"})
+            count("429")
+            return
+        entry = self.lookup(url, route) if route else None
+        if entry is None:
+            self._send(h, 404, b"not recorded")
+            count("unrouted" if route is None else "miss")
+            return
+        body = self.archive.read(entry)
+        if fault == "malformed":
+            body = self.mangle(body, zlib.crc32(url.encode()))
+        raw = body.encode("utf-8")
+        self._send(h, 200, raw, {"Content-Type": "text/html; charset=utf-8"})
+        count(fault or ("replayed" if entry["url"] == url else "substituted"), len(raw))
+
+    @staticmethod
+    def _send(h, status, raw: bytes, headers=None):
+        h.send_response(status)
+        for k, v in (headers or {}).items():
+            h.send_header(k, v)
+        h.send_header("Content-Length", str(len(raw)))
+        h.end_headers()
+        h.wfile.write(raw)
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        try:
+            self.server.origin.respond(self)
+        except (BrokenPipeError, ConnectionResetError):
+            pass                              # client gave up (its timeout) first
+
+    def log_message(self, *args):
+        pass
+
+def start(origin: FakeOrigin, port: int = 0) -> http.server.ThreadingHTTPServer:
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    srv.daemon_threads = True
+    srv.origin = origin
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+# ───────────────────────── client side ────────────────────────
+def _cap(timeout, cap: float):
+    if timeout is None:
+        return cap
+    if isinstance(timeout, tuple):
+        return tuple(cap if t is None else min(t, cap) for t in timeout)
+    return min(timeout, cap)
+
+def run_client(target: str, origin: str, cap: float, keep_sleeps: bool, scratch: pathlib.Path):
+    """In the scraper's process: route every request to `origin`, then run the scraper."""
+    import importlib
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class OriginAdapter(HTTPAdapter):
+        def send(self, request, timeout=None, **kw):
+            u = urlsplit(request.url)
+            request.url = f"{origin}/{u.netloc}{u.path}" + (f"?{u.query}" if u.query else "")
+            return super().send(request, timeout=_cap(timeout, cap), **kw)
+
+    adapter = OriginAdapter()
+    requests.Session.get_adapter = lambda self, url: adapter
+    if not keep_sleeps:
+        time.sleep = lambda s: None
+
+    scratch = scratch.resolve()
+    mod_name, _, fn = target.partition(":")
+    mod = importlib.import_module(mod_name)
+    for attr in ("OUT", "OUT_FILE", "OUTFILE"):   # outputs outside the scratch dir (REPO_DIR/…) move in
+        p = getattr(mod, attr, None)
+        if isinstance(p, pathlib.Path) and scratch not in p.parents:
+            setattr(mod, attr, scratch / "public" / p.name)
+    sys.argv = [mod_name]                           # scrapers with argparse run with their defaults
+    getattr(mod, fn or "main")()
+
+# ───────────────────────── harness ────────────────────────────
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    try:
+        for line in open(f"/proc/{pid}/status"):
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+def bench_one(name: str, target: str, srv, args, scratch: pathlib.Path) -> dict:
+    pub = scratch / "public"
+    pub.mkdir(parents=True, exist_ok=True)
+    for f in INPUTS.get(name, ()):
+        if (PUBLIC_DIR / f).exists():
+            shutil.copy(PUBLIC_DIR / f, pub / f)
+    env = {**os.environ, "MNOI_PUBLIC_DIR": str(pub), "MNOI_DATA_DIR": str(scratch / "data"),
+           "MNOI_ARCHIVE": "0", "MNOI_SNAPSHOTS": "0", "PYTHONUNBUFFERED": "1"}
+    cmd = [sys.executable, __file__, "client", target,
+           "--origin", f"http://127.0.0.1:{srv.server_address[1]}",
+           "--client-timeout", str(args.client_timeout), "--scratch", str(scratch)]
+    if args.keep_sleeps:
+        cmd.append("--keep-sleeps")
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    log = OUT_DIR / f"{name}.log"
+    srv.origin.reset()
+    t0, peak, status = time.perf_counter(), None, None
+    with open(log, "w", encoding="utf-8") as fh:
+        proc = subprocess.Popen(cmd, stdout=fh, stderr=subprocess.STDOUT, env=env,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        while proc.poll() is None:
+            peak = _peak_rss_mb(proc.pid) or peak
+            if time.perf_counter() - t0 > args.seconds:
+                proc.terminate()
+                proc.wait()
+                status = "time limit"
+                break
+            time.sleep(0.1)
+    wall = time.perf_counter() - t0
+    if status is None:
+        status = "finished" if proc.returncode == 0 else f"crashed (exit {proc.returncode})"
+    tail = log.read_text(encoding="utf-8", errors="replace").strip().splitlines()[-1:] or [""]
+
+    snap  = srv.origin.snapshot()
+    o     = snap["outcomes"]
+    pages = o.get("replayed", 0) + o.get("substituted", 0) + o.get("malformed", 0)
+    return {
+        "scraper": name, "status": status, "seconds": round(wall, 2),
+        "requests": sum(v for k, v in o.items() if k != "bytes"),
+        "pages": pages, "pages_per_s": round(pages / wall, 1) if wall else None,
+        "mb_served": round(o.get("bytes", 0) / 1e6, 2),
+        "faults": {k: o.get(k, 0) for k in ("429", "timeout", "malformed")},
+        "misses": o.get("miss", 0) + o.get("unrouted", 0),
+        "peak_rss_mb": round(peak, 1) if peak else None,
+        "routes": snap["routes"], "last_line": tail[0][:200], "log": str(log),
+    }
+
+def bench(names: List[str], args):
+    from mnoi import GROUPS
+    origin = FakeOrigin(args.archive, args.latency, args.p429, args.ptimeout,
+                        args.pmalformed, args.hang, args.seed)
+    if not origin.by_url:
+        sys.exit(f"❌  nothing recorded under {origin.archive.root} – run the scrapers once first")
+    print(f"📼  replaying {len(origin.by_url)} pages: "
+          + ", ".join(f"{r} {len(v)}" for r, v in origin.by_route.items()))
+    srv = start(origin)
+    report = []
+    try:
+        for name in names:
+            with tempfile.TemporaryDirectory(prefix=f"mnoi-{name}-") as tmp:
+                r = bench_one(name, GROUPS["scrape"][name], srv, args, pathlib.Path(tmp))
+            report.append(r)
+            f = r["faults"]
+            peak = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] else "n/a"
+            print(f"   {name:<13} {r['pages']:>5} pages {r['pages_per_s']:>7} /s  "
+                  f"429×{f['429']} timeout×{f['timeout']} malformed×{f['malformed']} "
+                  f"miss×{r['misses']}  peak {peak}  {r['status']}")
+    finally:
+        srv.shutdown()
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    dest = OUT_DIR / "report.json"
+    dest.write_text(json.dumps({"settings": {k: getattr(args, k) for k in (
+        "seconds", "latency", "p429", "ptimeout", "pmalformed", "hang", "client_timeout",
+        "keep_sleeps", "seed")}, "scrapers": report}, indent=2), encoding="utf-8")
+    print(f"✅  {dest}")
+
+# ───────────────────────── main ───────────────────────────────
+def _fault_args(p):
+    p.add_argument("--archive", type=pathlib.Path, default=ARCHIVE_DIR)
+    p.add_argument("--latency", type=float, default=0, metavar="MS", help="mean added latency (±50%%)")
+    p.add_argument("--p429", type=float, default=0)
+    p.add_argument("--ptimeout", type=float, default=0)
+    p.add_argument("--pmalformed", type=float, default=0)
+    p.add_argument("--hang", type=float, default=3.0, help="seconds a 'timeout' holds the connection")
+    p.add_argument("--seed", type=int, default=0)
+
+def main():
+    ap = argparse.ArgumentParser(description="Fake origin + offline scraper load test")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("bench", help="run scrapers against the fake origin")
+    b.add_argument("scrapers", nargs="*", metavar="scraper", help=", ".join(INPUTS))
+    b.add_argument("--seconds", type=float, default=20, help="time limit per scraper")
+    b.add_argument("--client-timeout", type=float, default=2.0)
+    b.add_argument("--keep-sleeps", action="store_true", help="keep the scrapers' polite delays")
+    _fault_args(b)
+    s = sub.add_parser("serve", help="only run the server")
+    s.add_argument("--port", type=int, default=8765)
+    _fault_args(s)
+    c = sub.add_parser("client")                      # internal: one scraper, in its own process
+    c.add_argument("target")
+    c.add_argument("--origin", required=True)
+    c.add_argument("--client-timeout", type=float, default=2.0)
+    c.add_argument("--keep-sleeps", action="store_true")
+    c.add_argument("--scratch", type=pathlib.Path, required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "client":
+        run_client(args.target, args.origin, args.client_timeout, args.keep_sleeps, args.scratch)
+    elif args.cmd == "serve":
+        srv = start(FakeOrigin(args.archive, args.latency, args.p429, args.ptimeout,
+                               args.pmalformed, args.hang, args.seed), args.port)
+        print(f"🎭  fake origin on http://127.0.0.1:{srv.server_address[1]}/<host>/<path> "
+              f"({len(srv.origin.by_url)} pages) – Ctrl-C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            srv.shutdown()
+    else:
+        unknown = [n for n in args.scrapers if n not in INPUTS]
+        if unknown:
+            ap.error(f"unknown scraper(s): {', '.join(unknown)} (choose from {', '.join(INPUTS)})")
+        bench(args.scrapers or list(INPUTS), args)
+
+if __name__ == "__main__":
+    main()
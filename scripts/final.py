@@ -1,12 +1,10 @@
-import json, pathlib
+import json
 
-CITIES_FILE = pathlib.Path("public/cities_with_businesses_2.json")
-BIZ_FILE    = pathlib.Path("public/city_businesses_2.json")
-OUT_FILE    = pathlib.Path("public/cities_with_businesses_merged.json")  # Or overwrite the original
+from paths import PUBLIC_DIR
 
-# Load both files
-cities = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
-biz_data = json.loads(BIZ_FILE.read_text(encoding="utf-8"))["cities"]
+CITIES_FILE = PUBLIC_DIR / "cities_with_businesses_2.json"
+BIZ_FILE    = PUBLIC_DIR / "city_businesses_2.json"
+OUT_FILE    = PUBLIC_DIR / "cities_with_businesses_merged.json"  # Or overwrite the original
 
 def find_biz_website(biz_list, name, industry, desc, cat):
     """Find matching company in scraped businesses by name, category, optionally industry/desc."""
@@ -31,15 +29,10 @@ def find_biz_website(biz_list, name, industry, desc, cat):
             return b.get("website")
     return None
 
-updated = []
-unmatched = 0
-
-for city in cities:
-    cname = city["city"]
-    businesses = city.get("businesses", [])
-    biz_lookup = biz_data.get(cname, {})
-
-    for b in businesses:
+def add_websites(city: dict, biz_lookup: dict) -> int:
+    """Fill b["website"] for the city's businesses from its scraped buckets; returns misses."""
+    unmatched = 0
+    for b in city.get("businesses", []):
         cat = b.get("employee_category")
         name = b.get("name", "")
         industry = b.get("industry", "")
@@ -49,15 +42,29 @@ for city in cities:
             b["website"] = website
         else:
             unmatched += 1  # Count if not found
+    return unmatched
 
-    updated.append(city)
+def main():
+    # Load both files
+    cities = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
+    biz_data = json.loads(BIZ_FILE.read_text(encoding="utf-8"))["cities"]
 
-OUT_FILE.write_text(json.dumps({"cities": updated}, indent=2, ensure_ascii=False), encoding="utf-8")
-print(f"✅  Merged company websites for all cities.")
-print(f"🔎  {unmatched} businesses had no website found.")
+    updated = []
+    unmatched = 0
 
-# Optionally print examples:
-for city in updated:
-    for b in city.get("businesses", []):
-        if "website" in b:
-            print(f"{city['city']}: {b['name']} — {b['website']}")
+    for city in cities:
+        unmatched += add_websites(city, biz_data.get(city["city"], {}))
+        updated.append(city)
+
+    OUT_FILE.write_text(json.dumps({"cities": updated}, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"✅  Merged company websites for all cities.")
+    print(f"🔎  {unmatched} businesses had no website found.")
+
+    # Optionally print examples:
+    for city in updated:
+        for b in city.get("businesses", []):
+            if "website" in b:
+                print(f"{city['city']}: {b['name']} — {b['website']}")
+
+if __name__ == "__main__":
+    main()
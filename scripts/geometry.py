@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+State outline + world mask
+--------------------------
+INPUT : public/gz_2010_us_040_00_20m.json   (Census TIGER state outlines, shared by all states)
+OUTPUT: <state dir>/<xx>_border.geojson     FeatureCollection with the one state
+        <state dir>/<xx>_mask.geojson       world polygon minus that state (for dimming)
+
+The state comes from MNOI_STATE (default MN → public/mn_border.geojson).
+
+    python scripts/geometry.py border
+    python scripts/geometry.py mask          # needs shapely
+"""
+import argparse, json
+
+from paths import PUBLIC_DIR, PUBLIC_ROOT, PREFIX
+from states import current
+
+STATES_FILE = PUBLIC_ROOT / "gz_2010_us_040_00_20m.json"
+BORDER_FILE = PUBLIC_DIR / f"{PREFIX}_border.geojson"
+MASK_FILE   = PUBLIC_DIR / f"{PREFIX}_mask.geojson"
+
+def outline(fips: str = None) -> dict:
+    fips = fips or current().fips
+    src = json.loads(STATES_FILE.read_text(encoding="utf-8"))
+    return next(f for f in src["features"] if f["properties"]["STATE"] == fips)
+
+def border():
+    out = {"type": "FeatureCollection", "features": [outline()]}
+    PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
+    BORDER_FILE.write_text(json.dumps(out))
+    print(f"✅  {BORDER_FILE} written")
+
+def mask():
+    import shapely.geometry as sg
+
+    world = sg.Polygon([(-180, -90), (180, -90), (180, 90), (-180, 90)])
+    out = {
+        "type": "FeatureCollection",
+        "features": [sg.mapping(world.difference(sg.shape(outline()["geometry"])))],
+    }
+    PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
+    MASK_FILE.write_text(json.dumps(out))
+    print(f"✅  {MASK_FILE} written")
+
+def main():
+    ap = argparse.ArgumentParser(description="Bake state border / mask GeoJSON")
+    ap.add_argument("what", choices=("border", "mask"))
+    args = ap.parse_args()
+    {"border": border, "mask": mask}[args.what]()
+
+if __name__ == "__main__":
+    main()
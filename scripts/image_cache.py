@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Local image cache for city photos
+---------------------------------
+INPUT : public/city_images.json   (Wikimedia hotlinks from city_images.py)
+OUTPUT: data/img_src/<ab>/<sha256>.<ext>       originals, content-addressed
+        public/img/<sha16>-<width>.{webp,jpg}  resized derivatives
+        public/city_images.json                same records + "thumb" block
+
+Each original is downloaded once (url → hash lives in data/img_src/index.json),
+derivatives are rendered in a process pool and only for widths that are
+missing on disk. Each record gains:
+
+  "thumb": {
+      "width": 330, "height": 220,
+      "placeholder": "data:image/jpeg;base64,…",   # ~16px blurred preview
+      "src": "/img/3fa1…-320.jpg",
+      "srcset": {"webp": "/img/…-160.webp 160w, …", "jpg": "…"}
+  }
+"""
+import base64, hashlib, io, json, pathlib, time
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+from PIL import Image, ImageFilter
+
+from paths import PUBLIC_DIR, DATA_DIR
+
+# ── paths ───────────────────────────────────────────────────────────────────
+INFILE     = PUBLIC_DIR / "city_images.json"
+OUTFILE    = PUBLIC_DIR / "city_images.json"
+STORE_DIR  = PUBLIC_DIR / "img"             # served derivatives only
+SRC_DIR    = DATA_DIR / "img_src"           # originals never ship with the site
+INDEX_FILE = SRC_DIR / "index.json"         # image_url → sha256
+
+# ── derivative settings ─────────────────────────────────────────────────────
+WIDTHS        = (160, 320, 640)
+FORMATS       = (("webp", "WEBP", {"quality": 78, "method": 4}),
+                 ("jpg",  "JPEG", {"quality": 82, "optimize": True, "progressive": True}))
+PLACEHOLDER_W = 16
+URL_PREFIX    = "/img"
+
+UA = "mn-opportunity-index/1.0 (image cache; contact via repo)"
+S  = requests.Session()
+
+# ───────────────────────── helpers ────────────────────────────
+def original_path(digest: str, ext: str) -> pathlib.Path:
+    return SRC_DIR / digest[:2] / f"{digest}.{ext}"
+
+def derivative_name(digest: str, width: int, ext: str) -> str:
+    return f"{digest[:16]}-{width}.{ext}"
+
+def guess_ext(url: str) -> str:
+    ext = url.rsplit(".", 1)[-1].lower()
+    return {"jpeg": "jpg"}.get(ext, ext) if ext in ("jpg", "jpeg", "png", "gif", "webp") else "bin"
+
+def fetch_original(url: str):
+    """Download `url` once and store it under its sha256. Returns (digest, ext)."""
+    r = S.get(url, headers={"User-Agent": UA}, timeout=20)
+    r.raise_for_status()
+    digest = hashlib.sha256(r.content).hexdigest()
+    ext    = guess_ext(url)
+    path   = original_path(digest, ext)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".part")
+        tmp.write_bytes(r.content)
+        tmp.replace(path)
+    return digest, ext
+
+def target_widths(orig_w: int):
+    """Requested widths that don't upscale; tiny originals keep their own width."""
+    widths = [w for w in WIDTHS if w <= orig_w]
+    return widths or [orig_w]
+
+def render(job):
+    """Worker: (digest, meta), or (digest, {"error": …}) if the original can't be decoded."""
+    digest, ext = job
+    try:
+        return digest, _render(digest, ext)
+    except Exception as e:      # one bad original must not sink the pool
+        return digest, {"error": f"{type(e).__name__}: {e}"}
+
+def _render(digest: str, ext: str) -> dict:
+    """Build every missing derivative + the placeholder for one original."""
+    with Image.open(original_path(digest, ext)) as im:
+        im = im.convert("RGB")
+        orig_w, orig_h = im.size
+        widths = target_widths(orig_w)
+
+        for w in widths:
+            h = max(1, round(orig_h * w / orig_w))
+            resized = None
+            for out_ext, fmt, opts in FORMATS:
+                dest = STORE_DIR / derivative_name(digest, w, out_ext)
+                if dest.exists():
+                    continue
+                if resized is None:
+                    resized = im if w == orig_w else im.resize((w, h), Image.LANCZOS)
+                resized.save(dest, fmt, **opts)
+
+        ph_h = max(1, round(orig_h * PLACEHOLDER_W / orig_w))
+        tiny = im.resize((PLACEHOLDER_W, ph_h), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+        buf = io.BytesIO()
+        tiny.save(buf, "JPEG", quality=40)
+        placeholder = "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+    return {"width": orig_w, "height": orig_h, "widths": widths, "placeholder": placeholder}
+
+def thumb_block(digest: str, meta: dict) -> dict:
+    widths = meta["widths"]
+    srcset = {
+        out_ext: ", ".join(f"{URL_PREFIX}/{derivative_name(digest, w, out_ext)} {w}w" for w in widths)
+        for out_ext, _, _ in FORMATS
+    }
+    # default src: the largest derivative that is ≤ 320px (what the panels render at)
+    default_w = max([w for w in widths if w <= 320] or widths[:1])
+    return {
+        "width": meta["width"],
+        "height": meta["height"],
+        "placeholder": meta["placeholder"],
+        "src": f"{URL_PREFIX}/{derivative_name(digest, default_w, 'jpg')}",
+        "srcset": srcset,
+    }
+
+# ───────────────────────── main ───────────────────────────────
+def main():
+    records = json.loads(INFILE.read_text(encoding="utf-8"))
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    SRC_DIR.mkdir(parents=True, exist_ok=True)
+    index = json.loads(INDEX_FILE.read_text(encoding="utf-8")) if INDEX_FILE.exists() else {}
+
+    # ---------- 1. download each distinct url once ----------
+    urls = sorted({r["image_url"] for r in records if r.get("image_url")})
+    todo = [u for u in urls
+            if u not in index or not original_path(index[u]["sha256"], index[u]["ext"]).exists()]
+    print(f"🖼️  {len(urls)} distinct images, {len(todo)} to download …")
+
+    failed = []
+    for idx, url in enumerate(todo, 1):
+        try:
+            digest, ext = fetch_original(url)
+            index[url] = {"sha256": digest, "ext": ext}
+            print(f"[{idx}/{len(todo)}] {digest[:12]} ← {url}")
+        except Exception as e:
+            print(f"[{idx}/{len(todo)}] ⚠️  {url}: {e}")
+            failed.append(url)
+        time.sleep(0.1)  # be nice to upload.wikimedia.org
+
+    INDEX_FILE.write_text(json.dumps(index, indent=2), encoding="utf-8")
+
+    # ---------- 2. derivatives in a process pool ----------
+    wanted = set(urls)
+    jobs = sorted({(v["sha256"], v["ext"]) for u, v in index.items() if u in wanted})
+    with ProcessPoolExecutor() as pool:
+        meta = dict(pool.map(render, jobs, chunksize=8))
+    broken = {d: m["error"] for d, m in meta.items() if "error" in m}
+    for d, err in broken.items():
+        print(f"⚠️  can't render {original_path(d, dict(jobs)[d])}: {err}")
+    meta = {d: m for d, m in meta.items() if d not in broken}
+
+    # ---------- 3. enrich records ----------
+    missing = 0
+    for r in records:
+        entry = index.get(r.get("image_url") or "")
+        if entry and entry["sha256"] in meta:
+            r["thumb"] = thumb_block(entry["sha256"], meta[entry["sha256"]])
+        else:
+            r.pop("thumb", None)
+            missing += 1
+
+    OUTFILE.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✅  {len(meta)} images cached, {missing} records without a local thumb → {OUTFILE}")
+    if failed:
+        print(f"⚠️  {len(failed)} downloads failed; rerun to retry them.")
+    if broken:
+        print(f"⚠️  {len(broken)} originals could not be decoded; their records have no thumb.")
+
+if __name__ == "__main__":
+    main()
@@ -18,23 +18,15 @@ Each city gains a new key:
   ]
 """
 import json
-from pathlib import Path
 
-DEMO_FILE  = Path("public/cities_with_demo.json")
-BIZ_FILE   = Path("public/city_businesses_2.json")
-OUT_FILE   = Path("public/cities_with_businesses.json")
+from paths import PUBLIC_DIR, work_file
 
-# ---------- load ----------
-demo_data = json.loads(DEMO_FILE.read_text())
-biz_data  = json.loads(BIZ_FILE.read_text()).get("cities", {})
-
-# Build a quick, case-insensitive lookup for the business dict
-biz_lookup = {city.lower(): buckets for city, buckets in biz_data.items()}
-
-for city_rec in demo_data["cities"]:
-    name = city_rec["city"].lower()
-    buckets = biz_lookup.get(name, {})
+DEMO_FILE  = work_file("cities_with_demo.json", PUBLIC_DIR)
+BIZ_FILE   = PUBLIC_DIR / "city_businesses_2.json"
+OUT_FILE   = PUBLIC_DIR / "cities_with_businesses.json"
 
+def merge_city(city_rec: dict, buckets: dict) -> None:
+    """Attach one city's 500+ / 100-499 listings as city_rec["businesses"]."""
     merged = []
     for size in ("500+", "100-499"):
         for biz in buckets.get(size, []):
@@ -48,6 +40,20 @@ for city_rec in demo_data["cities"]:
     if merged:
         city_rec["businesses"] = merged   # attach to the city record
 
-# ---------- save ----------
-OUT_FILE.write_text(json.dumps(demo_data, indent=2))
-print(f"✅  Wrote {OUT_FILE} with business data merged.")
+def main():
+    # ---------- load ----------
+    demo_data = json.loads(DEMO_FILE.read_text())
+    biz_data  = json.loads(BIZ_FILE.read_text()).get("cities", {})
+
+    # Build a quick, case-insensitive lookup for the business dict
+    biz_lookup = {city.lower(): buckets for city, buckets in biz_data.items()}
+
+    for city_rec in demo_data["cities"]:
+        merge_city(city_rec, biz_lookup.get(city_rec["city"].lower(), {}))
+
+    # ---------- save ----------
+    OUT_FILE.write_text(json.dumps(demo_data, indent=2))
+    print(f"✅  Wrote {OUT_FILE} with business data merged.")
+
+if __name__ == "__main__":
+    main()
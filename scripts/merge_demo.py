@@ -1,10 +1,11 @@
 # merge_demo.py
-import json, re, pathlib
+import json, re
 
-ROOT = pathlib.Path(__file__).resolve().parent
-UNI_FILE  = ROOT / "../public/basic_cities_with_uni.json"
-DEMO_FILE = ROOT / "../public/mn_demo_full.json"           # <-- put your demographics here
-OUT_FILE  = ROOT / "cities_with_demo.json"
+from paths import PUBLIC_DIR, SCRIPTS_DIR, PREFIX, work_file
+
+UNI_FILE  = PUBLIC_DIR / "basic_cities_with_uni.json"
+DEMO_FILE = PUBLIC_DIR / f"{PREFIX}_demo_full.json"           # <-- put your demographics here
+OUT_FILE  = work_file("cities_with_demo.json", SCRIPTS_DIR)
 
 # ---------- helpers ---------------------------------------------------------
 def parse_race_block(txt: str) -> dict:
@@ -20,34 +21,38 @@ def clean_demo_city(name: str) -> str:
             .lower()
     )
 
-# ---------- load files ------------------------------------------------------
-uni_data  = json.loads(UNI_FILE.read_text(encoding="utf-8"))["cities"]
-demo_raw  = json.loads(DEMO_FILE.read_text(encoding="utf-8"))
-
-demo_lookup = {
-    clean_demo_city(d["city"]): {
-        "median_age": d["median_age"],
-        "median_income": d["median_income"],
-        "race_breakdown": parse_race_block(d["race_ethnicity"])
+def main():
+    # ---------- load files ------------------------------------------------------
+    uni_data  = json.loads(UNI_FILE.read_text(encoding="utf-8"))["cities"]
+    demo_raw  = json.loads(DEMO_FILE.read_text(encoding="utf-8"))
+
+    demo_lookup = {
+        clean_demo_city(d["city"]): {
+            "median_age": d["median_age"],
+            "median_income": d["median_income"],
+            "race_breakdown": parse_race_block(d["race_ethnicity"])
+        }
+        for d in demo_raw
     }
-    for d in demo_raw
-}
-
-# ---------- merge -----------------------------------------------------------
-merged, missing = [], []
-
-for c in uni_data:
-    key = c["city"].lower()
-    if key in demo_lookup:
-        merged.append({**c, **demo_lookup[key]})
-    else:
-        missing.append(c["city"])
-
-# ---------- write output ----------------------------------------------------
-OUT_FILE.write_text(
-    json.dumps({"cities": merged, "no_demo_data": missing}, indent=2),
-    encoding="utf-8"
-)
-
-print(f"✅  Wrote {len(merged)} merged cities; "
-      f"{len(missing)} had no matching demo data → {OUT_FILE}")
+
+    # ---------- merge -----------------------------------------------------------
+    merged, missing = [], []
+
+    for c in uni_data:
+        key = c["city"].lower()
+        if key in demo_lookup:
+            merged.append({**c, **demo_lookup[key]})
+        else:
+            missing.append(c["city"])
+
+    # ---------- write output ----------------------------------------------------
+    OUT_FILE.write_text(
+        json.dumps({"cities": merged, "no_demo_data": missing}, indent=2),
+        encoding="utf-8"
+    )
+
+    print(f"✅  Wrote {len(merged)} merged cities; "
+          f"{len(missing)} had no matching demo data → {OUT_FILE}")
+
+if __name__ == "__main__":
+    main()
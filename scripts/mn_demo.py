@@ -1,10 +1,16 @@
 # scripts/scrape_mn_demo_full.py
-import json, random, time, re, pathlib, requests, string
+import json, random, time, re, requests, string
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
-BASE         = "https://www.minnesota-demographics.com"
-OUT          = pathlib.Path("public/mn_demo_full.json")
+from page_archive import archive_page
+from paths import PUBLIC_DIR, PREFIX
+from snapshots import record_snapshot
+from states import current
+
+STATE        = current()
+BASE         = f"https://www.{STATE.slug}-demographics.com"
+OUT          = PUBLIC_DIR / f"{PREFIX}_demo_full.json"
 LETTERS      = list(string.ascii_uppercase)        # A-Z
 SLEEP_RANGE  = (2.0, 5.0)                          # polite delay
 
@@ -30,6 +36,7 @@ def soup_get(url: str) -> BeautifulSoup:
         timeout=25,
     )
     r.raise_for_status()
+    archive_page(url, r.text, r.status_code)
     return BeautifulSoup(r.text, "html.parser")
 
 def clean_num(txt: str):
@@ -39,8 +46,8 @@ def clean_num(txt: str):
     except ValueError:
         return None
 
-def scrape_city(city_url: str) -> dict:
-    soup  = soup_get(city_url)
+def parse_city(html) -> dict:
+    soup  = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "html.parser")
     title = soup.find("h1").get_text(strip=True)
     city  = title.split(",")[0]
 
@@ -70,29 +77,79 @@ def scrape_city(city_url: str) -> dict:
         "race_ethnicity": race_para,
     }
 
+def scrape_city(city_url: str) -> dict:
+    return parse_city(soup_get(city_url))
+
+def parse_letter_page(html) -> list:
+    """[(city_url, city_key)] listed on one counties-cities-that-begin-with-X page."""
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "html.parser")
+    h2 = soup.find("h2", string=re.compile(rf"cities in {re.escape(STATE.name)}", re.I))
+    anchor_ul = h2.find_next("ul") if h2 else None
+    if not anchor_ul:
+        return []
+    return [(urljoin(BASE, a["href"]), a.get_text(strip=True).lower())
+            for a in anchor_ul.select("a[href]")]
+
+def letter_url(letter: str) -> str:
+    return f"{BASE}/counties-cities-that-begin-with-{letter}"
+
+def write_output(results: list):
+    OUT.parent.mkdir(exist_ok=True, parents=True)
+    OUT.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+def rebuild(index_pages: dict, city_pages: dict):
+    """page_archive entry point: the demographics file from archived letter + city pages.
+
+    Cities (or whole letters) that weren't archived keep their previous record.
+    """
+    from merge_demo import clean_demo_city
+    if not any(letter_url(l) in index_pages for l in LETTERS):
+        print(f"⚠️  no letter pages archived – {OUT.name} left as is")
+        return
+    prev = json.loads(OUT.read_text(encoding="utf-8")) if OUT.exists() else []
+    prev_by_key = {clean_demo_city(r["city"]): r for r in prev}
+    results, seen, rebuilt = [], set(), 0
+    for letter in LETTERS:
+        links = index_pages.get(letter_url(letter))
+        if links is None:
+            results += [r for k, r in prev_by_key.items() if k[:1] == letter.lower() and k not in seen]
+            seen.update(k for k in prev_by_key if k[:1] == letter.lower())
+            continue
+        for city_url, city_key in links:
+            if city_key in seen:
+                continue
+            seen.add(city_key)
+            rec = city_pages.get(city_url)
+            if rec is not None:
+                rebuilt += 1
+            elif city_key in prev_by_key:
+                rec = prev_by_key[city_key]
+            else:
+                continue
+            results.append(rec)
+    write_output(results)
+    print(f"✅  Rebuilt {rebuilt}/{len(results)} cities from the archive → {OUT}")
+
 # ───────────────────────── main loop ──────────────────────────
 def main():
-    print("🚀 Starting full MN demographics scrape …")
+    print(f"🚀 Starting full {STATE.code} demographics scrape …")
     results, seen = [], set()
 
     for letter in LETTERS:
-        page_url = f"{BASE}/counties-cities-that-begin-with-{letter}"
+        page_url = letter_url(letter)
         try:
             soup = soup_get(page_url)
         except requests.HTTPError as e:
             print(f"⚠️  Skip letter {letter}: {e}")
             continue
 
-        h2 = soup.find("h2", string=re.compile(r"cities in minnesota", re.I))
-        anchor_ul = h2.find_next("ul") if h2 else None
-        if not anchor_ul:
+        links = parse_letter_page(soup)
+        if not links:
             print(f"— Letter {letter}: no cities found, skipping.")
             continue
 
         print(f"\n=== Letter {letter} ({page_url}) ===")
-        for a in anchor_ul.select("a[href]"):
-            city_url = urljoin(BASE, a["href"])
-            city_key = a.get_text(strip=True).lower()
+        for city_url, city_key in links:
             if city_key in seen:
                 continue
             seen.add(city_key)
@@ -107,9 +164,9 @@ def main():
             time.sleep(random.uniform(*SLEEP_RANGE))
 
     # always write whatever we collected, even if empty
-    OUT.parent.mkdir(exist_ok=True, parents=True)
-    OUT.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    write_output(results)
     print(f"\n✅  Done! {len(results)} cities saved → {OUT.resolve()}")
+    record_snapshot("demographics")
 
 if __name__ == "__main__":
     main()
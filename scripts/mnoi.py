@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+mnoi – one entry point for the data pipeline
+--------------------------------------------
+    python scripts/mnoi.py list                          # what's available
+    python scripts/mnoi.py scrape businesses news        # network scrapes
+    python scripts/mnoi.py merge                         # every merge step, in pipeline order
+    python scripts/mnoi.py merge demographics businesses # …or just some
+    python scripts/mnoi.py report
+    python scripts/mnoi.py geometry border mask
+    python scripts/mnoi.py publish
+
+    python scripts/mnoi.py search query "hospital"       # tools keep their own arguments
+    python scripts/mnoi.py db ingest --force
+    python scripts/mnoi.py serve --port 8000
+
+    python scripts/mnoi.py --public-dir /tmp/site --data-dir /tmp/cache merge
+    python scripts/mnoi.py --states MN,WI,IA merge       # one process per state (states.py)
+
+Nothing is imported until a command runs, and then only that command's
+module, so requests / bs4 / pandas / shapely / PIL load only for the steps
+that use them. `--public-dir` / `--data-dir` are passed to every script
+through MNOI_PUBLIC_DIR / MNOI_DATA_DIR (see paths.py). `--states` with one
+code just sets MNOI_STATE; with several it hands the command to
+states.run_states, which runs it per state on a process pool.
+"""
+import argparse, importlib, os, sys, time
+
+# group → {target: "module" | "module:function"}; dict order is run order
+GROUPS = {
+    "scrape": {
+        "universities": "scrape_unis",
+        "demographics": "mn_demo",
+        "businesses":   "scrape_businesses",
+        "counties":     "county_scraper",
+        "news":         "news_scraper",
+        "images":       "city_images",
+    },
+    "merge": {
+        "coords":       "convert_coors",
+        "universities": "merge_unis_cities",
+        "demographics": "merge_demo",
+        "reduce":       "reduced_business",
+        "businesses":   "merge_businesses",
+        "uni-details":  "uni_2",
+        "websites":     "final",
+        "counties":     "county_merge",
+        "news":         "city_news_fix",
+    },
+    "report": {
+        "businesses":   "business_report",
+        "duplicates":   "duplicate",
+        "dedupe":       "dedupe",
+    },
+    "geometry": {
+        "border":       "geometry:border",
+        "mask":         "geometry:mask",
+    },
+}
+# run with no targets → these (scrapes hit the network, so always name them)
+DEFAULTS = {"scrape": (), "merge": tuple(GROUPS["merge"]), "report": tuple(GROUPS["report"]),
+            "geometry": ("border",)}
+
+# command → module whose own main() parses the remaining arguments
+TOOLS = {
+    "publish": ("publish",      "content-hashed artifacts + JSON patches"),
+    "search":  ("search_index", "build / query the full-text index"),
+    "columns": ("city_columns", "build / inspect city_columns.bin"),
+    "table":   ("business_table", "global business table + cities_compact.json"),
+    "clusters": ("cluster_map", "zoom-level map clusters → city_clusters.json"),
+    "access":  ("commute_shed", "employers / enrollment within commute radii → cities_full.json"),
+    "stream":  ("stream_merge", "merge cities as scrape_businesses streams them (run alongside it)"),
+    "db":      ("db",           "SQLite store: ingest / export"),
+    "serve":   ("api_server",   "local read API"),
+    "history": ("snapshots",    "scraper output history: record / list / trend / diff"),
+    "recrawl": ("recrawl",      "scrape_businesses crawl schedule: plan / reset"),
+    "archive": ("page_archive", "raw page archive: reparse / stats"),
+    "loadtest": ("fake_origin", "offline scraper load test against a replaying fake origin"),
+    "images":  ("image_cache",  "download + resize city images"),
+    "models":  ("models",       "record codec benchmark"),
+}
+
+def _call(target: str, prog: str, argv=()):
+    mod, _, fn = target.partition(":")
+    saved = sys.argv
+    sys.argv = [prog, *argv]          # scripts with their own argparse see only their args
+    try:
+        getattr(importlib.import_module(mod), fn or "main")()
+    finally:
+        sys.argv = saved
+
+def run_group(group: str, targets, ap):
+    table = GROUPS[group]
+    unknown = [t for t in targets if t not in table]
+    if unknown:
+        ap.error(f"unknown {group} target(s): {', '.join(unknown)} (choose from {', '.join(table)})")
+    targets = list(targets) or list(DEFAULTS[group])
+    if not targets:
+        ap.error(f"name what to {group}: {', '.join(table)}")
+    for t in sorted(targets, key=list(table).index):
+        print(f"\n▶  {group} {t}  ({table[t]})")
+        t0 = time.perf_counter()
+        _call(table[t], f"mnoi {group} {t}")
+        print(f"   {group} {t} done in {time.perf_counter() - t0:.1f}s")
+
+def list_commands():
+    for group, table in GROUPS.items():
+        default = DEFAULTS[group]
+        print(f"{group:<9} " + ", ".join(f"{t}*" if t in default else t for t in table))
+    for cmd, (mod, help_) in TOOLS.items():
+        print(f"{cmd:<9} {help_}  ({mod}.py)")
+    print("\n* runs when the group is given no targets")
+
+def main():
+    ap = argparse.ArgumentParser(prog="mnoi", description="MN Opportunity Index data pipeline")
+    ap.add_argument("--public-dir", help="where served files live (default: public/)")
+    ap.add_argument("--data-dir", help="caches, archives, database (default: data/)")
+    ap.add_argument("--states", help="comma-separated postal codes or 'all' (default: MN)")
+    ap.add_argument("--workers", type=int, help="processes for --states (default: cpu count)")
+    sub = ap.add_subparsers(dest="cmd", required=True, metavar="command")
+    sub.add_parser("list", help="show groups, targets and tools")
+    for group in GROUPS:
+        p = sub.add_parser(group, help=f"targets: {', '.join(GROUPS[group])}")
+        p.add_argument("targets", nargs="*", metavar="target")
+    for cmd, (_, help_) in TOOLS.items():
+        p = sub.add_parser(cmd, help=help_, add_help=False)
+        p.add_argument("args", nargs=argparse.REMAINDER)
+    # REMAINDER won't take a leading option (`mnoi search --help`), so tools get the leftovers too
+    args, extra = ap.parse_known_args()
+    if extra and args.cmd not in TOOLS:
+        ap.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    if args.public_dir:
+        os.environ["MNOI_PUBLIC_DIR"] = os.path.abspath(args.public_dir)
+    if args.data_dir:
+        os.environ["MNOI_DATA_DIR"] = os.path.abspath(args.data_dir)
+    if args.states:
+        import states
+        try:
+            codes = states.parse_states(args.states)
+        except ValueError as e:
+            ap.error(str(e))
+        if len(codes) > 1 and args.cmd != "list":
+            argv = [args.cmd, *(args.targets if args.cmd in GROUPS else extra + args.args)]
+            results = states.run_states(codes, argv, args.workers)
+            sys.exit(0 if all(r["ok"] for r in results) else 1)
+        os.environ["MNOI_STATE"] = codes[0]
+
+    if args.cmd == "list":
+        list_commands()
+    elif args.cmd in GROUPS:
+        run_group(args.cmd, args.targets, ap)
+    else:
+        _call(TOOLS[args.cmd][0], f"mnoi {args.cmd}", extra + args.args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Typed city records
+------------------
+Slotted dataclasses for the records every stage passes around, plus a
+validating decoder / compact encoder for cities_full.json and its
+predecessors (basic_cities*.json, cities_with_demo.json,
+cities_with_businesses*.json) and for the city_news*.json story map.
+
+Decoding does the clean-up once so downstream code doesn't have to:
+  * footnote markers ("27-43000[4]", "… seat . [ 4 ] With …") are stripped
+  * cp1252 mojibake from earlier merges ("44Â°56â€²52â€³N") is repaired
+  * DMS coordinates are parsed into decimal `lat` / `lon`
+  * repeated strings (county, industry, size band, …) are interned
+
+This is a typed, memory-saving layer, not a faster one: decoding is
+json.loads plus the validation/clean-up pass, so it costs roughly twice
+a bare json.loads, and encode_cities pays for rebuilding the dicts on
+top of json.dumps. What you get back is ~30% less resident memory
+than the dict tree and records that fail loudly on a bad shape.
+`bench` prints the current numbers for both sides.
+
+Usage:
+    from models import load_cities, dump_cities
+    cities = load_cities(PUBLIC_DIR / "cities_full.json")
+
+    python scripts/models.py bench [path]     # load/dump/memory vs plain json
+"""
+import json, pathlib, re, sys, time, tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from convert_coors import dms_to_decimal
+from paths import PUBLIC_DIR
+
+FOOTNOTE_RE = re.compile(r"\s*\[\s*(?:\d{1,3}|[a-z]|note \d+|citation needed)\s*\]")
+MOJIBAKE_RE = re.compile("[ÃÂâ][\x80-\xbf\u0152-\u2122]")
+DAGGERS     = (" ††", " †")
+
+_intern = sys.intern
+
+
+class RecordError(ValueError):
+    """A record doesn't match the expected shape."""
+
+
+# ───────────────────────── records ────────────────────────────
+@dataclass(slots=True)
+class Business:
+    name: str
+    employee_category: str
+    industry: str
+    description: str
+    website: Optional[str] = None
+
+
+@dataclass(slots=True)
+class University:
+    name: str
+    enrollment: Optional[float] = None
+    website: Optional[str] = None
+    tuition: Optional[int] = None
+
+
+@dataclass(slots=True)
+class Story:
+    title: str
+    link: str
+    description: str = ""
+
+
+@dataclass(slots=True)
+class City:
+    city: str
+    population_2020: Optional[int] = None
+    county: Optional[str] = None
+    latitude: Optional[str] = None          # raw DMS, kept for display
+    longitude: Optional[str] = None
+    lat: Optional[float] = None             # decimal degrees, parsed once
+    lon: Optional[float] = None
+    incorporated_year: Optional[int] = None
+    website: Optional[str] = None
+    fips_code: Optional[str] = None
+    gnis_id: Optional[str] = None
+    density_sq_mi: Optional[float] = None
+    wikipedia_url: Optional[str] = None
+    overview: Optional[str] = None
+    overview_characters: Optional[int] = None
+    is_county_seat: bool = False
+    is_state_capital: bool = False
+    median_age: Optional[float] = None
+    median_income: Optional[int] = None
+    race_breakdown: Optional[Dict[str, float]] = None
+    county_website: Optional[str] = None
+    universities: Optional[List[University]] = None
+    businesses: Optional[List[Business]] = None
+    access: Optional[Dict[str, Dict[str, int]]] = None   # commute_shed.py: radius → counts
+
+
+# ───────────────────────── decode helpers ─────────────────────
+def fix_mojibake(text: Optional[str]) -> Optional[str]:
+    """Undo UTF-8 that was decoded as cp1252 somewhere upstream."""
+    if not text or not MOJIBAKE_RE.search(text):
+        return text
+    try:
+        return text.encode("cp1252").decode("utf-8")
+    except UnicodeError:
+        return text
+
+def strip_footnotes(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    return FOOTNOTE_RE.sub("", text) if "[" in text else text
+
+def _opt(rec: dict, key: str, types, where: str):
+    val = rec.get(key)
+    if val is None or isinstance(val, types):
+        return val
+    raise RecordError(f"{where}: {key!r} should be {types}, got {type(val).__name__}")
+
+def _req_str(rec: dict, key: str, where: str) -> str:
+    val = rec.get(key)
+    if not isinstance(val, str):
+        raise RecordError(f"{where}: missing or non-string {key!r}")
+    return val
+
+def _num(rec: dict, key: str, where: str):
+    return _opt(rec, key, (int, float), where)
+
+def _coord(raw: Optional[str], where: str) -> Optional[float]:
+    if not raw:
+        return None
+    try:
+        return round(dms_to_decimal(raw), 6)
+    except ValueError as e:
+        raise RecordError(f"{where}: {e}") from None
+
+def decode_business(rec: dict, where: str = "business") -> Business:
+    if not isinstance(rec, dict):
+        raise RecordError(f"{where}: expected object")
+    return Business(
+        name=_req_str(rec, "name", where),
+        employee_category=_intern(_req_str(rec, "employee_category", where)),
+        industry=_intern(rec.get("industry") or ""),
+        description=_intern(rec.get("description") or ""),
+        website=_opt(rec, "website", str, where),
+    )
+
+def decode_university(rec: dict, where: str = "university") -> University:
+    if not isinstance(rec, dict):
+        raise RecordError(f"{where}: expected object")
+    return University(
+        name=_req_str(rec, "name", where),
+        enrollment=_num(rec, "enrollment", where),
+        website=_opt(rec, "website", str, where),
+        tuition=_opt(rec, "tuition", int, where),
+    )
+
+def decode_story(rec: dict, where: str = "story") -> Story:
+    if not isinstance(rec, dict):
+        raise RecordError(f"{where}: expected object")
+    return Story(
+        title=_req_str(rec, "title", where),
+        link=_req_str(rec, "link", where),
+        description=rec.get("description") or "",
+    )
+
+def decode_city(rec: dict) -> City:
+    if not isinstance(rec, dict):
+        raise RecordError("city: expected object")
+    raw_name = _req_str(rec, "city", "city")
+    where    = f"city {raw_name!r}"
+
+    # predecessors still carry the † / †† seat/capital markers in the name
+    name, seat, cap = raw_name, rec.get("is_county_seat", False), rec.get("is_state_capital", False)
+    if "is_county_seat" not in rec and raw_name.endswith("†"):
+        seat = True
+        cap  = raw_name.endswith("††")
+    for mark in DAGGERS:
+        if name.endswith(mark):
+            name = name[: -len(mark)]
+            break
+
+    latitude  = fix_mojibake(_opt(rec, "latitude", str, where))
+    longitude = fix_mojibake(_opt(rec, "longitude", str, where))
+    lat = _coord(latitude, where) if "lat" not in rec else _num(rec, "lat", where)
+    lon = _coord(longitude, where) if "lon" not in rec else _num(rec, "lon", where)
+
+    county = _opt(rec, "county", str, where)
+    unis   = _opt(rec, "universities", list, where)
+    biz    = _opt(rec, "businesses", list, where)
+    race   = _opt(rec, "race_breakdown", dict, where)
+    access = _opt(rec, "access", dict, where)
+
+    return City(
+        city=name,
+        population_2020=_opt(rec, "population_2020", int, where),
+        county=_intern(county) if county else county,
+        latitude=latitude,
+        longitude=longitude,
+        lat=lat,
+        lon=lon,
+        incorporated_year=_opt(rec, "incorporated_year", int, where),
+        website=_opt(rec, "website", str, where),
+        fips_code=strip_footnotes(_opt(rec, "fips_code", str, where)),
+        gnis_id=strip_footnotes(_opt(rec, "gnis_id", str, where)),
+        density_sq_mi=_num(rec, "density_sq_mi", where),
+        wikipedia_url=_opt(rec, "wikipedia_url", str, where),
+        overview=strip_footnotes(fix_mojibake(_opt(rec, "overview", str, where))),
+        overview_characters=_opt(rec, "overview_characters", int, where),
+        is_county_seat=bool(seat),
+        is_state_capital=bool(cap),
+        median_age=_num(rec, "median_age", where),
+        median_income=_opt(rec, "median_income", int, where),
+        race_breakdown={_intern(k): v for k, v in race.items()} if race else race,
+        county_website=_intern(rec["county_website"]) if rec.get("county_website") else rec.get("county_website"),
+        universities=[decode_university(u, where) for u in unis] if unis is not None else None,
+        businesses=[decode_business(b, where) for b in biz] if biz is not None else None,
+        access=access,
+    )
+
+# ───────────────────────── encode helpers ─────────────────────
+def _drop_none(d: dict, keep=()) -> dict:
+    return {k: v for k, v in d.items() if v is not None or k in keep}
+
+def business_to_dict(b: Business) -> dict:
+    return _drop_none({
+        "name": b.name,
+        "employee_category": b.employee_category,
+        "industry": b.industry,
+        "description": b.description,
+        "website": b.website,
+    })
+
+def university_to_dict(u: University) -> dict:
+    return {"name": u.name, "enrollment": u.enrollment, "website": u.website, "tuition": u.tuition}
+
+def story_to_dict(s: Story) -> dict:
+    return {"title": s.title, "link": s.link, "description": s.description}
+
+_ALWAYS = ("population_2020", "county", "latitude", "longitude", "incorporated_year",
+           "website", "fips_code", "gnis_id", "density_sq_mi", "wikipedia_url",
+           "overview", "overview_characters", "median_age", "median_income")
+
+def city_to_dict(c: City) -> dict:
+    out = {
+        "city": c.city,
+        "population_2020": c.population_2020,
+        "county": c.county,
+        "latitude": c.latitude,
+        "longitude": c.longitude,
+        "lat": c.lat,
+        "lon": c.lon,
+        "incorporated_year": c.incorporated_year,
+        "website": c.website,
+        "fips_code": c.fips_code,
+        "gnis_id": c.gnis_id,
+        "density_sq_mi": c.density_sq_mi,
+        "wikipedia_url": c.wikipedia_url,
+        "overview": c.overview,
+        "overview_characters": c.overview_characters,
+        "is_county_seat": c.is_county_seat,
+        "is_state_capital": c.is_state_capital,
+        "median_age": c.median_age,
+        "median_income": c.median_income,
+        "race_breakdown": c.race_breakdown,
+        "county_website": c.county_website,
+        "universities": [university_to_dict(u) for u in c.universities] if c.universities is not None else None,
+        "businesses": [business_to_dict(b) for b in c.businesses] if c.businesses is not None else None,
+        "access": c.access,
+    }
+    return _drop_none(out, keep=_ALWAYS)
+
+# ───────────────────────── public API ─────────────────────────
+def decode_cities(raw) -> List[City]:
+    """Decode the {"cities": [...]} payload from bytes/str (or an already parsed dict)."""
+    data = json.loads(raw) if isinstance(raw, (bytes, str)) else raw
+    if not isinstance(data, dict) or not isinstance(data.get("cities"), list):
+        raise RecordError('expected an object with a "cities" array')
+    return [decode_city(c) for c in data["cities"]]
+
+def encode_cities(cities: List[City], indent: Optional[int] = None) -> bytes:
+    payload = {"cities": [city_to_dict(c) for c in cities]}
+    seps = (",", ":") if indent is None else (",", ": ")
+    return json.dumps(payload, indent=indent, separators=seps, ensure_ascii=False).encode("utf-8")
+
+def decode_news(raw) -> Dict[str, List[Story]]:
+    data = json.loads(raw) if isinstance(raw, (bytes, str)) else raw
+    if not isinstance(data, dict):
+        raise RecordError("expected an object mapping city → stories")
+    return {_intern(city): [decode_story(s, f"news {city!r}") for s in stories]
+            for city, stories in data.items()}
+
+def encode_news(news: Dict[str, List[Story]], indent: Optional[int] = None) -> bytes:
+    payload = {city: [story_to_dict(s) for s in stories] for city, stories in news.items()}
+    return json.dumps(payload, indent=indent, ensure_ascii=False).encode("utf-8")
+
+def load_cities(path=PUBLIC_DIR / "cities_full.json") -> List[City]:
+    return decode_cities(pathlib.Path(path).read_bytes())
+
+def dump_cities(cities: List[City], path, indent: Optional[int] = None) -> None:
+    pathlib.Path(path).write_bytes(encode_cities(cities, indent=indent))
+
+def load_news(path=PUBLIC_DIR / "city_news_fixed.json") -> Dict[str, List[Story]]:
+    return decode_news(pathlib.Path(path).read_bytes())
+
+# ───────────────────────── benchmark ──────────────────────────
+def _best_of(fn, n=5):
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def _traced(fn):
+    tracemalloc.start()
+    obj = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+def bench(path: pathlib.Path):
+    raw = path.read_bytes()
+    plain, plain_mem = _traced(lambda: json.loads(raw))
+    typed, typed_mem = _traced(lambda: decode_cities(raw))
+    n = len(typed)
+
+    print(f"📊  {path.name}: {len(raw)/1e6:.2f} MB, {n} cities")
+    print(f"   load  json.loads       {_best_of(lambda: json.loads(raw)):7.1f} ms")
+    print(f"   load  decode_cities    {_best_of(lambda: decode_cities(raw)):7.1f} ms  (validated + cleaned)")
+    # same formatting on both sides, so the numbers compare the encoders, not the whitespace
+    for label, indent, seps in (("compact", None, (",", ":")), ("indent=2", 2, (",", ": "))):
+        dumped = lambda: json.dumps(plain, indent=indent, separators=seps, ensure_ascii=False).encode("utf-8")
+        print(f"   dump  json.dumps(dict) {_best_of(dumped):7.1f} ms  {len(dumped())/1e6:5.2f} MB  ({label})")
+        print(f"   dump  encode_cities    {_best_of(lambda: encode_cities(typed, indent=indent)):7.1f} ms  "
+              f"{len(encode_cities(typed, indent=indent))/1e6:5.2f} MB  ({label})")
+    print(f"   mem   dict tree        {plain_mem/1e6:7.2f} MB  ({plain_mem/n/1e3:.1f} KB/city)")
+    print(f"   mem   typed records    {typed_mem/1e6:7.2f} MB  ({typed_mem/n/1e3:.1f} KB/city)")
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(pathlib.Path(sys.argv[2]) if len(sys.argv) > 2 else PUBLIC_DIR / "cities_full.json")
+    else:
+        cities = load_cities()
+        print(f"✅  {len(cities)} cities decoded cleanly")
@@ -2,19 +2,29 @@ import json
 import time
 import requests
 from bs4 import BeautifulSoup
-from pathlib import Path
 
-CITIES_FILE = Path("public/cities_with_businesses_merged.json")
-OUT_FILE = Path("public/city_news.json")
+from page_archive import archive_page
+from paths import PUBLIC_DIR, PREFIX
+from snapshots import record_snapshot
+
+CITIES_FILE = PUBLIC_DIR / "cities_with_businesses_merged.json"
+OUT_FILE = PUBLIC_DIR / "city_news.json"
 FROM_DATE = "2025-01-01"
 
+def search_url(city_query, from_date=FROM_DATE):
+    return f"https://www.fox9.com/search?q={city_query.replace(' ', '%20')}&sort=relevance&page=1&from={from_date}"
+
 def scrape_fox9_news(city_query, from_date=FROM_DATE):
-    url = f"https://www.fox9.com/search?q={city_query.replace(' ', '%20')}&sort=relevance&page=1&from={from_date}"
+    url = search_url(city_query, from_date)
     r = requests.get(url, headers={
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
     })
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+    archive_page(url, r.text, r.status_code)
+    return parse_fox9_news(r.text)
+
+def parse_fox9_news(html):
+    soup = BeautifulSoup(html, "html.parser")
     articles = soup.find_all("article")[:3]
     results = []
     for art in articles:
@@ -35,6 +45,25 @@ def scrape_fox9_news(city_query, from_date=FROM_DATE):
         })
     return results
 
+def rebuild(pages):
+    """page_archive entry point: city_news.json from archived search pages.
+
+    Cities whose search page wasn't archived keep their previous stories.
+    """
+    city_list = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
+    prev = json.loads(OUT_FILE.read_text(encoding="utf-8")) if OUT_FILE.exists() else {}
+    news_by_city, rebuilt = {}, 0
+    for city in city_list:
+        name = city["city"]
+        stories = pages.get(search_url(f"{name} {PREFIX}"))
+        if stories is None:
+            stories = prev.get(name, [])
+        else:
+            rebuilt += 1
+        news_by_city[name] = stories
+    OUT_FILE.write_text(json.dumps(news_by_city, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"📰 Rebuilt {rebuilt}/{len(city_list)} cities from the archive → {OUT_FILE}")
+
 def main():
     data = json.loads(CITIES_FILE.read_text(encoding="utf-8"))
     city_list = data["cities"]
@@ -44,7 +73,7 @@ def main():
     for idx, city in enumerate(city_list):
         city_name = city["city"]
         # Query like: "red wing mn"
-        q = f"{city_name} mn"
+        q = f"{city_name} {PREFIX}"
         print(f"[{idx+1}/{len(city_list)}] {q}...")
         try:
             stories = scrape_fox9_news(q)
@@ -61,7 +90,8 @@ def main():
         time.sleep(1.0)  # Be kind; could go even faster if you want to YOLO
 
     OUT_FILE.write_text(json.dumps(news_by_city, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"\n📰 Finished! {no_news_count} cities had no news → {OUT_FILE.relative_to(Path.cwd())}")
+    print(f"\n📰 Finished! {no_news_count} cities had no news → {OUT_FILE}")
+    record_snapshot("news")
 
 if __name__ == "__main__":
     main()
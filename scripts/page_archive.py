@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Raw page archive + offline re-extraction
+----------------------------------------
+Every scraper passes the HTML it fetches through `archive_page()`, which
+appends it to a compressed, append-only archive keyed by URL and fetch time:
+
+  data/pages/pages-00001.gz   concatenated gzip members, one per page body
+  data/pages/index.jsonl      {"url", "fetched_at", "status", "seg", "offset", "length", "sha1"}
+
+Identical re-fetches of a URL only add an index line pointing at the bytes
+already stored. When a selector breaks, fix the extractor and run
+
+    python scripts/page_archive.py reparse news            # one extractor
+    python scripts/page_archive.py reparse                 # all of them
+    python scripts/page_archive.py stats
+
+`reparse` runs the *current* extractor code over the latest archived copy of
+each matching URL in a process pool and writes data/reparse/<name>.json
+({url: extracted}). It then rebuilds every scraper output whose extractors
+all ran, through that scraper's own `rebuild()`:
+
+  businesses + business_websites         → city_businesses_2.json
+  demographics_index + demographics      → <state>_demo_full.json
+  news                                   → city_news.json
+  county_index + county_websites         → counties.json
+
+Pages that were never archived fall back to the output's previous contents,
+the same way a scrape keeps listings it didn't refetch. Changing an
+extractor therefore costs CPU time, not a re-scrape. `--dump-only` skips
+the rebuild.
+
+Writers hold an flock on the segment they append to, so several scrapers
+(or state workers) can archive into the same directory at once.
+
+Set MNOI_ARCHIVE=0 to disable archiving for a run.
+"""
+import argparse, datetime as dt, gzip, hashlib, importlib, json, os, pathlib, re, sys, threading, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+from paths import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:               # Windows: single-writer only
+    fcntl = None
+
+ROOT        = pathlib.Path(__file__).resolve().parent
+ARCHIVE_DIR = DATA_DIR / "pages"
+REPARSE_DIR = DATA_DIR / "reparse"
+
+SEGMENT_BYTES = 256 * 1024 * 1024
+CHUNK         = 64            # pages per worker task
+
+# name → (url pattern, "module:function", extractor wants the url as 2nd arg)
+EXTRACTORS = {
+    "businesses":        (r"careeronestop\.org/Toolkit/Jobs/find-businesses-results\.aspx",
+                          "scrape_businesses:reparse_band_page", True),
+    "business_websites": (r"careeronestop\.org/Toolkit/Jobs/(?!find-businesses-results)",
+                          "scrape_businesses:parse_business_website", False),
+    "demographics":      (r"-demographics\.com/(?!counties-cities-that-begin-with)[^?]+$",
+                          "mn_demo:parse_city", False),
+    "demographics_index": (r"-demographics\.com/counties-cities-that-begin-with-",
+                          "mn_demo:parse_letter_page", False),
+    "news":              (r"fox9\.com/search\?", "news_scraper:parse_fox9_news", False),
+    "city_images":       (r"en\.wikipedia\.org/wiki/(?!List_of)(?!.*_County,_)",
+                          "city_images:parse_infobox_image", False),
+    "county_websites":   (r"en\.wikipedia\.org/wiki/.*_County,_",
+                          "county_scraper:parse_county_website", False),
+    "county_index":      (r"en\.wikipedia\.org/wiki/List_of_counties_in_",
+                          "county_scraper:parse_county_rows", False),
+}
+
+# output → ("module:function" called with each extractor's {url: result}, extractors it needs)
+OUTPUTS = {
+    "city_businesses_2.json": ("scrape_businesses:rebuild", ("businesses", "business_websites")),
+    "demo_full.json":         ("mn_demo:rebuild", ("demographics_index", "demographics")),
+    "city_news.json":         ("news_scraper:rebuild", ("news",)),
+    "counties.json":          ("county_scraper:rebuild", ("county_index", "county_websites")),
+}
+
+
+class PageArchive:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root  = pathlib.Path(root)
+        self.index = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+        self._seen: Optional[Dict[str, dict]] = None   # sha1 → stored location
+        self._seg: Optional[pathlib.Path] = None       # current segment, found once per process
+
+    # ---------- write ----------
+    def _segment(self) -> pathlib.Path:
+        if self._seg is None:
+            segs = sorted(self.root.glob("pages-*.gz"))
+            self._seg = segs[-1] if segs else self.root / "pages-00001.gz"
+        return self._seg
+
+    def _next_segment(self, full: pathlib.Path):
+        n = int(full.stem.split("-")[1]) + 1
+        self._seg = self.root / f"pages-{n:05d}.gz"
+
+    def _append(self, member: bytes) -> dict:
+        """Append one gzip member under an exclusive lock, so the offset is ours even across processes."""
+        while True:
+            seg = self._segment()
+            with open(seg, "ab") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, os.SEEK_END)     # re-read under the lock: others may have written
+                    if offset >= SEGMENT_BYTES:
+                        self._next_segment(seg)
+                        continue
+                    f.write(member)
+                    f.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+            return {"seg": seg.name, "offset": offset, "length": len(member)}
+
+    def _load_seen(self):
+        self._seen = {}
+        for e in self.entries(latest=False):
+            self._seen[e["sha1"]] = {k: e[k] for k in ("seg", "offset", "length")}
+
+    def add(self, url: str, body: str, status: int = 200) -> dict:
+        raw  = body.encode("utf-8")
+        sha1 = hashlib.sha1(raw).hexdigest()
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if self._seen is None:
+                self._load_seen()
+            loc = self._seen.get(sha1)
+            if loc is None:
+                loc = self._seen[sha1] = self._append(gzip.compress(raw, 6))
+            entry = {"url": url, "fetched_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+                     "status": status, "sha1": sha1, **loc}
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            fd = os.open(self.index, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)                       # one O_APPEND write: lines never interleave
+            finally:
+                os.close(fd)
+        return entry
+
+    # ---------- read ----------
+    def entries(self, pattern: Optional[str] = None, latest: bool = True) -> Iterator[dict]:
+        """Index entries (optionally URL-filtered); with `latest`, only the newest per URL."""
+        if not self.index.exists():
+            return iter(())
+        rx = re.compile(pattern) if pattern else None
+        rows = []
+        with open(self.index, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                if rx is None or rx.search(e["url"]):
+                    rows.append(e)
+        if latest:
+            newest = {}
+            for e in rows:                       # index is append-only → later wins
+                newest[e["url"]] = e
+            rows = list(newest.values())
+        return iter(rows)
+
+    def read(self, entry: dict) -> str:
+        with open(self.root / entry["seg"], "rb") as f:
+            f.seek(entry["offset"])
+            return gzip.decompress(f.read(entry["length"])).decode("utf-8")
+
+
+_default: Optional[PageArchive] = None
+
+def archive_page(url: str, body: str, status: int = 200) -> None:
+    """Scraper hook. Never lets an archive problem break a scrape."""
+    global _default
+    if os.environ.get("MNOI_ARCHIVE", "1") == "0":
+        return
+    try:
+        if _default is None:
+            _default = PageArchive()
+        _default.add(url, body, status)
+    except OSError as e:
+        print(f"   ⚠️ archive write failed for {url}: {e}")
+
+# ───────────────────────── reparse ────────────────────────────
+def _resolve(target: str):
+    if str(ROOT) not in sys.path:          # spawned workers may not inherit scripts/ on the path
+        sys.path.insert(0, str(ROOT))
+    mod, fn = target.split(":")
+    return getattr(importlib.import_module(mod), fn)
+
+def _reparse_chunk(job):
+    """Worker: run one extractor over a chunk of archived pages."""
+    root, target, with_url, entries = job
+    archive, fn = PageArchive(root), _resolve(target)
+    out, errors = {}, []
+    for e in entries:
+        try:
+            html = archive.read(e)
+            out[e["url"]] = fn(html, e["url"]) if with_url else fn(html)
+        except Exception as exc:
+            errors.append({"url": e["url"], "error": f"{type(exc).__name__}: {exc}"})
+    return out, errors
+
+def reparse(names: List[str], root=ARCHIVE_DIR, workers: Optional[int] = None,
+            outputs: bool = True) -> Dict[str, dict]:
+    """Re-extract `names`, dump them, and rebuild the outputs they complete; returns {name: {url: result}}."""
+    archive = PageArchive(root)
+    REPARSE_DIR.mkdir(parents=True, exist_ok=True)
+    done: Dict[str, dict] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name in names:
+            pattern, target, with_url = EXTRACTORS[name]
+            entries = [e for e in archive.entries(pattern) if e["status"] == 200]
+            t0 = time.perf_counter()
+            jobs = [(str(archive.root), target, with_url, entries[i:i + CHUNK])
+                    for i in range(0, len(entries), CHUNK)]
+            results, errors = {}, []
+            for out, errs in pool.map(_reparse_chunk, jobs):
+                results.update(out)
+                errors.extend(errs)
+            dest = REPARSE_DIR / f"{name}.json"
+            dest.write_text(json.dumps({"results": results, "errors": errors}, indent=2, ensure_ascii=False),
+                            encoding="utf-8")
+            print(f"✓ {name}: {len(results)} pages re-extracted, {len(errors)} errors "
+                  f"in {time.perf_counter() - t0:.1f}s → {dest}")
+            done[name] = results
+
+    if outputs:
+        for out, (target, needs) in OUTPUTS.items():
+            if all(n in done for n in needs):
+                _resolve(target)(*(done[n] for n in needs))
+            elif any(n in done for n in needs):
+                print(f"— {out}: also reparse {', '.join(n for n in needs if n not in done)} to rebuild it")
+    return done
+
+def stats(root=ARCHIVE_DIR):
+    archive = PageArchive(root)
+    all_entries = list(archive.entries(latest=False))
+    on_disk = sum(p.stat().st_size for p in archive.root.glob("pages-*.gz"))
+    print(f"📦  {len(all_entries)} fetches, {len({e['url'] for e in all_entries})} distinct URLs, "
+          f"{len({e['sha1'] for e in all_entries})} distinct bodies, {on_disk/1e6:.1f} MB on disk")
+    for name, (pattern, _, _) in EXTRACTORS.items():
+        print(f"   {name:<20} {sum(1 for _ in archive.entries(pattern))} URLs")
+
+def main():
+    ap = argparse.ArgumentParser(description="Raw page archive tools")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("reparse", help="re-run extractors over archived pages")
+    rp.add_argument("names", nargs="*", metavar="extractor", help=", ".join(EXTRACTORS))
+    rp.add_argument("--workers", type=int, default=None, help="default: one per core")
+    rp.add_argument("--dump-only", action="store_true",
+                    help="only write data/reparse/<name>.json, don't rebuild scraper outputs")
+    sub.add_parser("stats")
+    args = ap.parse_args()
+
+    if args.cmd == "stats":
+        stats()
+        return
+    unknown = [n for n in args.names if n not in EXTRACTORS]
+    if unknown:
+        ap.error(f"unknown extractor(s): {', '.join(unknown)} (choose from {', '.join(EXTRACTORS)})")
+    reparse(args.names or list(EXTRACTORS), workers=args.workers, outputs=not args.dump_only)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Shared locations for the pipeline scripts
+-----------------------------------------
+    PUBLIC_ROOT  files the app serves          (default public/,  env MNOI_PUBLIC_DIR)
+    DATA_ROOT    local caches, archives, db    (default data/,    env MNOI_DATA_DIR)
+    STATE        postal code being processed   (default MN,       env MNOI_STATE)
+
+Work is partitioned per state. Minnesota keeps the original layout
+(PUBLIC_DIR = public/, DATA_DIR = data/) so the app is unaffected. Every
+other state gets public/states/<xx>/ and data/states/<xx>/, with the same
+file names inside ("<xx>_border.geojson", "<xx>_cities_dec.json", …).
+
+Paths are resolved once, at import time, so `mnoi --states …` sets the
+environment variables before it imports any script.
+"""
+import os, pathlib
+
+DEFAULT_STATE = "MN"
+
+SCRIPTS_DIR = pathlib.Path(__file__).resolve().parent
+REPO_DIR    = SCRIPTS_DIR.parent
+PUBLIC_ROOT = pathlib.Path(os.environ.get("MNOI_PUBLIC_DIR") or REPO_DIR / "public").resolve()
+DATA_ROOT   = pathlib.Path(os.environ.get("MNOI_DATA_DIR") or REPO_DIR / "data").resolve()
+STATE       = (os.environ.get("MNOI_STATE") or DEFAULT_STATE).upper()
+PREFIX      = STATE.lower()                 # "mn" → mn_border.geojson, mn_cities_dec.json, …
+
+def state_dir(root: pathlib.Path, state: str) -> pathlib.Path:
+    return root if state.upper() == DEFAULT_STATE else root / "states" / state.lower()
+
+PUBLIC_DIR = state_dir(PUBLIC_ROOT, STATE)
+DATA_DIR   = state_dir(DATA_ROOT, STATE)
+
+def work_file(name: str, legacy_dir: pathlib.Path) -> pathlib.Path:
+    """Intermediate file: where it has always lived for Minnesota, DATA_DIR for other states."""
+    return legacy_dir / name if STATE == DEFAULT_STATE else DATA_DIR / name
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Publish content-hashed artifacts + JSON Patch deltas
+----------------------------------------------------
+INPUT : public/<artifact>            (cities_full.json, city_images.json, …)
+OUTPUT: public/dist/<stem>.<hash><suffix>            immutable copy
+        public/dist/<stem>.<from>-<to>.patch.json    RFC 6902 patch vs previous build
+        public/dist/manifest.json                    the only file that must not be cached
+
+manifest.json:
+  {
+    "version": 7, "generated_at": "…",
+    "artifacts": {
+      "cities_full.json": {
+        "file": "cities_full.3fa2c1d9e0ab4c11.json", "hash": "3fa2c1d9e0ab4c11", "bytes": 1711910,
+        "patch": {"from": "<previous hash>", "file": "…patch.json", "bytes": 2311, "ops": 14} | null
+      }, …
+    }
+  }
+
+Hashed files never change, so they can be served with
+`Cache-Control: public, max-age=31536000, immutable`. A client that still
+holds the previous version's document fetches the patch and applies it
+(src/artifacts.js). Everyone else downloads the full file. A patch is only
+written when it is at most PATCH_MAX_RATIO of the full file; every patch is
+re-applied here and checked against the new document before it is published.
+
+Files from the current and previous manifest are kept. Older ones are pruned.
+
+    python scripts/publish.py            # after the build scripts have run
+"""
+import datetime as dt, hashlib, json, pathlib, time
+from difflib import SequenceMatcher
+from typing import Any, List, Optional
+
+from paths import PUBLIC_DIR, PREFIX
+
+DIST_DIR   = PUBLIC_DIR / "dist"
+MANIFEST   = DIST_DIR / "manifest.json"
+
+ARTIFACTS = (
+    "cities_full.json",
+    "cities_compact.json",
+    "business_table.json",
+    "city_clusters.json",
+    "city_images.json",
+    "city_news_fixed.json",
+    "cities_with_businesses.json",
+    f"{PREFIX}_cities_dec.json",
+    f"{PREFIX}_border.geojson",
+)
+OPTIONAL = (                   # build outputs that may not exist yet
+    "search_index.json",
+    "business_dupes.json",
+    "city_columns.bin",
+)
+JSON_SUFFIXES   = (".json", ".geojson")
+HASH_LEN        = 16
+PATCH_MAX_RATIO = 0.5
+
+# ───────────────────────── RFC 6902 ───────────────────────────
+def _ptr(path: List) -> str:
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in path)
+
+def _same(a, b) -> bool:
+    return type(a) is type(b) and a == b
+
+def json_diff(a: Any, b: Any, path: Optional[List] = None, ops: Optional[List[dict]] = None) -> List[dict]:
+    """add / remove / replace ops turning `a` into `b`.
+
+    Lists are aligned with difflib on each element's canonical JSON, so one
+    record inserted into or dropped from a long array costs one op, not a
+    cascade of replaces.
+    """
+    path = [] if path is None else path
+    ops  = [] if ops is None else ops
+    if isinstance(a, dict) and isinstance(b, dict):
+        for k in a:
+            if k not in b:
+                ops.append({"op": "remove", "path": _ptr(path + [k])})
+        for k, v in b.items():
+            if k not in a:
+                ops.append({"op": "add", "path": _ptr(path + [k]), "value": v})
+            elif not _same(a[k], v):
+                json_diff(a[k], v, path + [k], ops)
+    elif isinstance(a, list) and isinstance(b, list):
+        fa = [json.dumps(x, sort_keys=True) for x in a]
+        fb = [json.dumps(x, sort_keys=True) for x in b]
+        # after each block the list reads b[:j2], so b's indices are the live ones
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, fa, fb, autojunk=False).get_opcodes():
+            if tag == "equal":
+                continue
+            m, n = i2 - i1, j2 - j1
+            for k in range(min(m, n)):
+                json_diff(a[i1 + k], b[j1 + k], path + [j1 + k], ops)
+            for k in range(m, n):
+                ops.append({"op": "add", "path": _ptr(path + [j1 + k]), "value": b[j1 + k]})
+            for _ in range(n, m):
+                ops.append({"op": "remove", "path": _ptr(path + [j1 + n])})
+    elif not _same(a, b):
+        ops.append({"op": "replace", "path": _ptr(path), "value": b})
+    return ops
+
+def _parse_ptr(ptr: str) -> List[str]:
+    if not ptr:
+        return []
+    if not ptr.startswith("/"):
+        raise ValueError(f"bad JSON pointer {ptr!r}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in ptr[1:].split("/")]
+
+def apply_patch(doc: Any, ops: List[dict]) -> Any:
+    """Apply add / remove / replace ops (the subset json_diff emits) in place."""
+    for op in ops:
+        parts = _parse_ptr(op["path"])
+        if not parts:
+            if op["op"] == "remove":
+                raise ValueError("cannot remove the document root")
+            doc = op["value"]
+            continue
+        parent = doc
+        for p in parts[:-1]:
+            parent = parent[int(p)] if isinstance(parent, list) else parent[p]
+        last = parts[-1]
+        if isinstance(parent, list):
+            i = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(i, op["value"])
+            elif op["op"] == "remove":
+                del parent[i]
+            else:
+                parent[i] = op["value"]
+        else:
+            if op["op"] == "remove":
+                del parent[last]
+            else:
+                parent[last] = op["value"]
+    return doc
+
+# ───────────────────────── publish ────────────────────────────
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:HASH_LEN]
+
+def hashed_name(name: str, h: str) -> str:
+    p = pathlib.PurePath(name)
+    return f"{p.stem}.{h}{p.suffix}"
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {"version": 0, "artifacts": {}}
+
+def make_patch(name: str, prev: dict, raw: bytes, h: str) -> Optional[dict]:
+    prev_file = DIST_DIR / prev["file"]
+    if not name.endswith(JSON_SUFFIXES) or not prev_file.exists():
+        return None
+    old = json.loads(prev_file.read_bytes())
+    new = json.loads(raw)
+    ops = json_diff(old, new)
+    body = json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(body) > PATCH_MAX_RATIO * len(raw):
+        return None
+    if apply_patch(json.loads(prev_file.read_bytes()), ops) != new:
+        raise RuntimeError(f"{name}: patch {prev['hash']} → {h} does not reproduce the new document")
+    stem = pathlib.PurePath(name).stem
+    patch_file = f"{stem}.{prev['hash']}-{h}.patch.json"
+    (DIST_DIR / patch_file).write_bytes(body)
+    return {"from": prev["hash"], "file": patch_file, "bytes": len(body), "ops": len(ops)}
+
+def prune(keep: set):
+    removed = 0
+    for p in DIST_DIR.iterdir():
+        if p.name != MANIFEST.name and p.name not in keep:
+            p.unlink()
+            removed += 1
+    return removed
+
+def main():
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    prev_manifest = load_manifest()
+    prev_entries  = prev_manifest["artifacts"]
+
+    entries, changed = {}, []
+    names = list(ARTIFACTS) + [n for n in OPTIONAL if (PUBLIC_DIR / n).exists()]
+    for name in names:
+        raw = (PUBLIC_DIR / name).read_bytes()
+        h   = content_hash(raw)
+        prev = prev_entries.get(name)
+        if prev and prev["hash"] == h:
+            entries[name] = prev
+            continue
+        out = DIST_DIR / hashed_name(name, h)
+        if not out.exists():
+            out.write_bytes(raw)
+        patch = make_patch(name, prev, raw, h) if prev else None
+        entries[name] = {"file": out.name, "hash": h, "bytes": len(raw), "patch": patch}
+        changed.append(name)
+
+    version = prev_manifest["version"] + (1 if changed or set(entries) != set(prev_entries) else 0)
+    manifest = {
+        "version": version,
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "artifacts": entries,
+    }
+    keep = {e["file"] for e in entries.values()}
+    keep |= {e["patch"]["file"] for e in entries.values() if e.get("patch")}
+    keep |= {e["file"] for e in prev_entries.values()}     # clients mid-upgrade
+    removed = prune(keep)
+    MANIFEST.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    print(f"📦  manifest v{version}: {len(entries)} artifacts, {len(changed)} changed, "
+          f"{removed} stale files pruned ({(time.perf_counter() - t0)*1000:.0f} ms)")
+    for name in changed:
+        e = entries[name]
+        delta = (f"patch {e['patch']['bytes']/1e3:.1f} kB ({e['patch']['ops']} ops)"
+                 if e["patch"] else "no patch")
+        print(f"   {name:<28} {e['bytes']/1e3:>8.1f} kB  → {e['file']}  [{delta}]")
+    print(f"✅  Wrote {MANIFEST}")
+
+if __name__ == "__main__":
+    main()
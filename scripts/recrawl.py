@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Yield-aware recrawl scheduler for scrape_businesses
+---------------------------------------------------
+INPUT : public/basic_cities_with_uni.json     cities + population_2020
+        public/city_businesses_2.json         previous run (seeds the state on first use)
+OUTPUT: data/crawl_state.json                 per city/band crawl history:
+          {"Rochester|500+": {"last": 1718000000.0, "rows": 31, "digest": "…",
+                              "crawls": 4, "changes": 1, "empty_streak": 0}, …}
+
+Each run only crawls the city/band pairs expected to have changed, within
+a request budget:
+
+  never crawled         first, always; costed at the band's mean listing count
+                        so far (NEW_ROWS before there is any history)
+  known empty           skipped (negative cache) until a re-probe is due:
+                        REPROBE_DAYS × empty_streak (max ×4) after the last look,
+                        spread ±25% per pair so a seeded state doesn't come due
+                        all at once, then crawled next (one request)
+  everything else       ranked by expected changed listings per request:
+                          P(change) = (changes + 1) / (crawls + 2)
+                          staleness = 1 - exp(-days since last crawl / TAU_DAYS)
+                          value     = P(change) × staleness × (rows + 1) × log10(population + 10)
+                          cost      = result pages + one profile fetch per listing
+
+Pairs that don't fit the budget keep their previous listings.
+
+    python scripts/recrawl.py plan --budget 3000       # what the next run would crawl
+    python scripts/scrape_businesses.py --budget 3000
+    python scripts/scrape_businesses.py --all          # ignore the schedule
+"""
+import argparse, hashlib, json, math, time
+from typing import Dict, List, NamedTuple, Optional
+
+from paths import DATA_DIR
+
+STATE_FILE   = DATA_DIR / "crawl_state.json"
+
+REPROBE_DAYS = 90
+TAU_DAYS     = 30
+PAGE_SIZE    = 25
+NEW_ROWS     = 10            # listings assumed for a never-crawled pair with no history to go on
+DAY          = 86400
+
+class Task(NamedTuple):
+    city: str
+    band: str           # "500+" / "100-499"
+    reason: str         # new / reprobe / refresh / forced
+    cost: int           # estimated requests
+    score: float
+
+def digest(rows: List[dict]) -> str:
+    return hashlib.sha1("\n".join(sorted(r["name"] for r in rows)).encode("utf-8")).hexdigest()[:16]
+
+def spread(key: str) -> float:
+    """Stable 0.75–1.25 factor per pair."""
+    return 0.75 + int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF / 2
+
+def est_cost(rows: int) -> int:
+    return max(1, math.ceil(rows / PAGE_SIZE)) + rows
+
+# ───────────────────────── state ──────────────────────────────
+class CrawlState:
+    def __init__(self, pairs: Optional[Dict[str, dict]] = None):
+        self.pairs = pairs or {}
+
+    @staticmethod
+    def key(city: str, band: str) -> str:
+        return f"{city}|{band}"
+
+    def get(self, city: str, band: str) -> Optional[dict]:
+        return self.pairs.get(self.key(city, band))
+
+    def record(self, city: str, band: str, rows: List[dict], now: float):
+        p = self.pairs.setdefault(self.key(city, band),
+                                  {"crawls": 0, "changes": 0, "empty_streak": 0})
+        d = digest(rows)
+        if "digest" in p and p["digest"] != d:
+            p["changes"] += 1
+        p.update(last=now, rows=len(rows), digest=d, crawls=p["crawls"] + 1,
+                 empty_streak=0 if rows else p["empty_streak"] + 1)
+
+    @classmethod
+    def load(cls, previous_output=None, bands=("500+", "100-499")) -> "CrawlState":
+        """The saved state, or one seeded from the last scrape_businesses output."""
+        if STATE_FILE.exists():
+            return cls(json.loads(STATE_FILE.read_text(encoding="utf-8")))
+        state = cls()
+        if previous_output is None or not previous_output.exists():
+            return state
+        prev = json.loads(previous_output.read_text(encoding="utf-8"))
+        when = previous_output.stat().st_mtime
+        for city in [*prev.get("cities", {}), *prev.get("no_results", [])]:
+            for band in bands:
+                state.record(city, band, prev.get("cities", {}).get(city, {}).get(band, []), when)
+        return state
+
+    def save(self):
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_text(json.dumps(self.pairs, indent=1, ensure_ascii=False), encoding="utf-8")
+
+# ───────────────────────── planning ───────────────────────────
+def plan(cities: List[dict], state: CrawlState, bands, budget: Optional[int] = None,
+         now: Optional[float] = None, force: bool = False):
+    """(tasks to run in order, {"skipped_empty", "over_budget", "estimated_requests"})."""
+    now = now or time.time()
+    seen = {band: [p["rows"] for k, p in state.pairs.items() if k.rsplit("|", 1)[1] == band] for band in bands}
+    new_cost = {band: est_cost(round(sum(r) / len(r)) if r else NEW_ROWS) for band, r in seen.items()}
+    first, ranked, skipped = [], [], 0
+    for c in cities:
+        city, pop = c["city"], c.get("population_2020") or 0
+        for band in bands:
+            p = state.get(city, band)
+            if force:
+                first.append(Task(city, band, "forced", est_cost(p["rows"]) if p else new_cost[band], math.inf))
+                continue
+            if p is None:
+                first.append(Task(city, band, "new", new_cost[band], math.inf))
+                continue
+            age = (now - p["last"]) / DAY
+            if p["rows"] == 0:
+                due = REPROBE_DAYS * min(p["empty_streak"], 4) * spread(state.key(city, band))
+                if age < due:
+                    skipped += 1
+                else:
+                    first.append(Task(city, band, "reprobe", 1, math.inf))
+                continue
+            p_change = (p["changes"] + 1) / (p["crawls"] + 2)
+            stale    = 1 - math.exp(-age / TAU_DAYS)
+            value    = p_change * stale * (p["rows"] + 1) * math.log10(pop + 10)
+            cost     = est_cost(p["rows"])
+            ranked.append(Task(city, band, "refresh", cost, value / cost))
+    ranked.sort(key=lambda t: -t.score)
+
+    tasks, spent, over = [], 0, 0
+    for t in first + ranked:
+        if budget is not None and spent + t.cost > budget:
+            over += 1
+            continue
+        tasks.append(t)
+        spent += t.cost
+    return tasks, {"skipped_empty": skipped, "over_budget": over, "estimated_requests": spent}
+
+def summary(tasks: List[Task], info: dict) -> str:
+    by = {}
+    for t in tasks:
+        by[t.reason] = by.get(t.reason, 0) + 1
+    parts = ", ".join(f"{n} {r}" for r, n in by.items()) or "nothing"
+    return (f"🗓️  {len(tasks)} city/band pairs ({parts}), ~{info['estimated_requests']} requests; "
+            f"{info['skipped_empty']} known-empty skipped, {info['over_budget']} over budget")
+
+# ───────────────────────── main ───────────────────────────────
+def main():
+    from scrape_businesses import BANDS, CITIES_FILE, OUT_FILE
+
+    ap = argparse.ArgumentParser(description="Recrawl schedule for scrape_businesses")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("plan", help="show what the next run would crawl")
+    p.add_argument("--budget", type=int, default=None, help="max requests")
+    p.add_argument("--top", type=int, default=15)
+    sub.add_parser("reset", help="forget the crawl history")
+    args = ap.parse_args()
+
+    if args.cmd == "reset":
+        STATE_FILE.unlink(missing_ok=True)
+        print(f"✅  Removed {STATE_FILE}")
+        return
+    cities = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
+    state = CrawlState.load(OUT_FILE, [label for _, label in BANDS])
+    tasks, info = plan(cities, state, [label for _, label in BANDS], args.budget)
+    print(summary(tasks, info))
+    for t in tasks[:args.top]:
+        print(f"   {t.reason:<8} {t.city:<24} {t.band:<8} ~{t.cost:>3} req  score {t.score:.3g}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
-import json, random, re, time, pathlib, requests
-from typing import Dict, List
-from urllib.parse import urlencode
+import argparse, json, random, re, time, requests
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
 from bs4 import BeautifulSoup
 
+from page_archive import archive_page
+from paths import DATA_DIR, PUBLIC_DIR, STATE
+from snapshots import record_snapshot
+
 # ── paths ───────────────────────────────────────────────────────────────────
-ROOT        = pathlib.Path(__file__).resolve().parent
-PUBLIC_DIR  = ROOT / ".." / "public"
 CITIES_FILE = PUBLIC_DIR / "basic_cities_with_uni.json"
 OUT_FILE    = PUBLIC_DIR / "city_businesses_2.json"   # CHANGED OUTPUT
+STREAM_FILE = DATA_DIR / "city_businesses.ndjson"     # one line per city as it finishes (stream_merge.py)
 
 # ── CareerOneStop constants ─────────────────────────────────────────────────
 COS_BASE = "https://www.careeronestop.org/Toolkit/Jobs/find-businesses-results.aspx"
@@ -20,15 +23,28 @@ UAS = [
 ]
 
 S = requests.Session()
+REQUESTS = 0                                          # fetches this run (recrawl budget)
+BUDGET: Optional[int] = None                          # hard cap on REQUESTS, set by --budget
+
+class BudgetSpent(Exception):
+    """Raised instead of fetching once REQUESTS reaches BUDGET."""
 
 def canon(text: str) -> str:
     text = text.lower().replace("saint", "st").replace(".", " ")
     return re.sub(r"\s+", " ", text).strip()
 
-def soup_get(url: str) -> BeautifulSoup:
+def fetch_html(url: str) -> str:
+    global REQUESTS
+    if BUDGET is not None and REQUESTS >= BUDGET:
+        raise BudgetSpent(f"request budget ({BUDGET}) spent")
+    REQUESTS += 1
     r = S.get(url, headers={"User-Agent": random.choice(UAS)}, timeout=25)
     r.raise_for_status()
-    return BeautifulSoup(r.text, "html.parser")
+    archive_page(url, r.text, r.status_code)
+    return r.text
+
+def soup_get(url: str) -> BeautifulSoup:
+    return BeautifulSoup(fetch_html(url), "html.parser")
 
 def build_url(loc: str, band: str, page: int) -> str:
     q = {
@@ -42,93 +58,122 @@ def build_url(loc: str, band: str, page: int) -> str:
     }
     return f"{COS_BASE}?{urlencode(q, safe=',')}"
 
+def parse_business_website(html: str):
+    soup = BeautifulSoup(html, "html.parser")
+    # Find any tag with "Website" in its text
+    tags = soup.find_all(string=lambda text: text and "website" in text.lower())
+    for tag in tags:
+        td = tag.find_parent("td")
+        if td:
+            tr = td.find_parent("tr")
+            if tr:
+                tds = tr.find_all("td")
+                for idx, cell in enumerate(tds):
+                    if cell == td and idx + 1 < len(tds):
+                        next_td = tds[idx + 1]
+                        a = next_td.find("a", href=True)
+                        if a and a["href"].startswith("http"):
+                            return a["href"]
+    for tag in tags:
+        td = tag.find_parent("td")
+        if td:
+            next_td = td.find_next_sibling("td")
+            if next_td:
+                a = next_td.find("a", href=True)
+                if a and a["href"].startswith("http"):
+                    return a["href"]
+    return None
+
 def get_business_website(company_profile_url: str):
     try:
-        soup = soup_get(company_profile_url)
-        # Find any tag with "Website" in its text
-        tags = soup.find_all(string=lambda text: text and "website" in text.lower())
-        for tag in tags:
-            td = tag.find_parent("td")
-            if td:
-                tr = td.find_parent("tr")
-                if tr:
-                    tds = tr.find_all("td")
-                    for idx, cell in enumerate(tds):
-                        if cell == td and idx + 1 < len(tds):
-                            next_td = tds[idx + 1]
-                            a = next_td.find("a", href=True)
-                            if a and a["href"].startswith("http"):
-                                return a["href"]
-        for tag in tags:
-            td = tag.find_parent("td")
-            if td:
-                next_td = td.find_next_sibling("td")
-                if next_td:
-                    a = next_td.find("a", href=True)
-                    if a and a["href"].startswith("http"):
-                        return a["href"]
+        return parse_business_website(fetch_html(company_profile_url))
+    except BudgetSpent:
+        raise
     except Exception as e:
         print(f"   ⚠️ Error scraping business website: {company_profile_url}\n   {e}")
     return None
 
-def scrape_band(city_key: str, loc: str, code: str) -> List[Dict]:
-    rows, page = [], 1
-    while True:
-        tbody = soup_get(build_url(loc, code, page)).find("tbody")
-        if not tbody:
-            break
+def parse_band_page(html: str, city_key: str) -> List[Dict]:
+    """Rows on one results page whose city matches `city_key`; `profile_url` is left for the caller."""
+    rows = []
+    tbody = BeautifulSoup(html, "html.parser").find("tbody")
+    if not tbody:
+        return rows
 
-        added = 0
-        for tr in tbody.find_all("tr"):
-            tds = tr.find_all("td", recursive=False)
-            if len(tds) < 3:
-                continue
+    for tr in tbody.find_all("tr"):
+        tds = tr.find_all("td", recursive=False)
+        if len(tds) < 3:
+            continue
 
-            # col-0 : name + city
-            outer = tds[0].find("div")
-            if not outer:
-                continue
-            divs = outer.find_all("div", recursive=False)
-            if len(divs) < 3:
-                continue
+        # col-0 : name + city
+        outer = tds[0].find("div")
+        if not outer:
+            continue
+        divs = outer.find_all("div", recursive=False)
+        if len(divs) < 3:
+            continue
 
-            a_tag = divs[0].find("a")
-            name = re.sub(r'[“”"]', "", a_tag.get_text(strip=True))
-            biz_url = a_tag.get("href", None)
-            city_raw = re.sub(r"\s+", " ", divs[2].get_text(strip=True))
+        a_tag = divs[0].find("a")
+        name = re.sub(r'[“”"]', "", a_tag.get_text(strip=True))
+        biz_url = a_tag.get("href", None)
+        city_raw = re.sub(r"\s+", " ", divs[2].get_text(strip=True))
 
-            if city_key not in canon(city_raw):
-                continue
+        if city_key not in canon(city_raw):
+            continue
+
+        desc_div = tds[1].find("div")
+        desc = re.sub(r'[“”"]', "", desc_div.get_text(strip=True)) if desc_div else ""
+        ind_div = tds[2].find("div")
+        industry = re.sub(r'[“”"]', "", ind_div.get_text(strip=True)) if ind_div else ""
+
+        profile_url = None
+        if biz_url and biz_url.startswith("/Toolkit/Jobs"):
+            profile_url = "https://www.careeronestop.org" + biz_url
+
+        rows.append(
+            {
+                "name": name,
+                "description": desc,
+                "industry": industry,
+                "raw_city": city_raw,
+                "profile_url": profile_url,
+            }
+        )
+    return rows
+
+def reparse_band_page(html: str, url: str) -> Dict:
+    """page_archive entry point: the city key and band come from the archived URL."""
+    q = parse_qs(urlsplit(url).query)
+    loc = q.get("location", [""])[0]
+    rows = parse_band_page(html, canon(loc.rsplit(",", 1)[0]))
+    return {
+        "location": loc,
+        "band": q.get("empsizefilter", [""])[0],
+        "page": int(q.get("curPage", ["1"])[0]),
+        "rows": rows,
+    }
+
+def scrape_band(city_key: str, loc: str, code: str) -> List[Dict]:
+    rows, page = [], 1
+    while True:
+        page_rows = parse_band_page(fetch_html(build_url(loc, code, page)), city_key)
 
-            desc_div = tds[1].find("div")
-            desc = re.sub(r'[“”"]', "", desc_div.get_text(strip=True)) if desc_div else ""
-            ind_div = tds[2].find("div")
-            industry = re.sub(r'[“”"]', "", ind_div.get_text(strip=True)) if ind_div else ""
-
-            website = None
-            if biz_url and biz_url.startswith("/Toolkit/Jobs"):
-                company_profile_url = "https://www.careeronestop.org" + biz_url
-                website = get_business_website(company_profile_url)
-
-            rows.append(
-                {
-                    "name": name,
-                    "description": desc,
-                    "industry": industry,
-                    "raw_city": city_raw,
-                    "website": website,
-                }
-            )
-            added += 1
-
-        if added < 25:
+        for row in page_rows:
+            profile_url = row.pop("profile_url")
+            row["website"] = get_business_website(profile_url) if profile_url else None
+            rows.append(row)
+
+        if len(page_rows) < 25:
             break
         page += 1
         time.sleep(random.uniform(0.2, 0.5))  # Lower delay, but not zero
     return rows
 
+def city_loc(city: str) -> str:
+    return f"{city.replace('Saint', 'St.')}, {STATE}"
+
 def scrape_city(city: str) -> Dict[str, List[Dict]]:
-    loc      = f"{city.replace('Saint', 'St.')}, MN"
+    loc      = city_loc(city)
     city_key = canon(city)
     out = {}
     for code, label in BANDS:
@@ -137,40 +182,136 @@ def scrape_city(city: str) -> Dict[str, List[Dict]]:
             out[label] = band_rows
     return out
 
+def write_output(bands_of: Dict[str, dict]):
+    """city_businesses_2.json from {city: {band: rows}}; returns (merged, no_results)."""
+    merged     = {c: b for c, b in bands_of.items() if b}
+    no_results = [c for c, b in bands_of.items() if not b]
+    OUT_FILE.write_text(
+        json.dumps({"cities": merged, "no_results": no_results}, indent=2),
+        encoding="utf-8"
+    )
+    return merged, no_results
+
+def rebuild(band_pages: Dict[str, dict], websites: Dict[str, str]):
+    """page_archive entry point: city_businesses_2.json from archived result + profile pages.
+
+    A city/band whose result pages weren't all archived keeps its previous listings.
+    """
+    city_list = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
+    prev = json.loads(OUT_FILE.read_text(encoding="utf-8"))["cities"] if OUT_FILE.exists() else {}
+    labels = [label for _, label in BANDS]
+    bands_of, rebuilt = {}, 0
+    for e in city_list:
+        city = e["city"]
+        bands = dict(prev.get(city, {}))
+        for code, label in BANDS:
+            rows, page, complete = [], 1, False
+            while (rec := band_pages.get(build_url(city_loc(city), code, page))) is not None:
+                for row in rec["rows"]:
+                    row = dict(row)
+                    profile_url = row.pop("profile_url")
+                    row["website"] = websites.get(profile_url) if profile_url else None
+                    rows.append(row)
+                if len(rec["rows"]) < 25:
+                    complete = True
+                    break
+                page += 1
+            if not complete:
+                continue
+            rebuilt += 1
+            if rows:
+                bands[label] = rows
+            else:
+                bands.pop(label, None)
+        bands_of[city] = {b: bands[b] for b in labels if bands.get(b)}
+    merged, no_results = write_output(bands_of)
+    print(f"✅  Rebuilt {rebuilt} city/band pairs from the archive; {len(merged)} cities with "
+          f"businesses, {len(no_results)} with no results → {OUT_FILE}")
+
 def main():
+    from recrawl import CrawlState, plan, summary
+
+    ap = argparse.ArgumentParser(description="Scrape CareerOneStop employers per city")
+    ap.add_argument("--budget", type=int, default=None, help="max requests this run (see recrawl.py)")
+    ap.add_argument("--all", action="store_true", help="crawl every city/band, ignoring the schedule")
+    args = ap.parse_args()
+
+    global BUDGET
+    BUDGET = args.budget
     PUBLIC_DIR.mkdir(exist_ok=True, parents=True)
+    DATA_DIR.mkdir(exist_ok=True, parents=True)
     city_list = json.loads(CITIES_FILE.read_text(encoding="utf-8"))["cities"]
-    print(f"🚀 Scraping {len(city_list)} MN cities for businesses …")
-
-    merged, no_results = {}, []
-
-    for idx, entry in enumerate(city_list, 1):
-        city = entry["city"]
-        print(f"[{idx}/{len(city_list)}] {city}")
-        try:
-            bands = scrape_city(city)
-        except Exception as e:
-            print("   ⚠️ error:", e)
-            no_results.append(city)
-            continue
+    labels    = [label for _, label in BANDS]
+    code_of   = {label: code for code, label in BANDS}
+
+    # previous listings carry over for every pair the schedule leaves alone
+    prev  = json.loads(OUT_FILE.read_text(encoding="utf-8"))["cities"] if OUT_FILE.exists() else {}
+    state = CrawlState.load(OUT_FILE, labels)
+    tasks, info = plan(city_list, state, labels, args.budget, force=args.all)
+    print(f"🚀 Scraping {STATE} businesses")
+    print(summary(tasks, info))
+
+    todo = {}
+    for t in tasks:
+        todo.setdefault(t.city, []).append(t.band)
+    bands_of = {e["city"]: dict(prev.get(e["city"], {})) for e in city_list}
+
+    stream = open(STREAM_FILE, "w", encoding="utf-8")
+
+    def emit(rec):
+        stream.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        stream.flush()
+
+    emit({"started": time.time(), "total": len(city_list)})
+    for city, bands in bands_of.items():
+        if city not in todo:
+            emit({"city": city, "bands": bands, "cached": True})
 
-        bands = {k: v for k, v in bands.items() if v}
+    errors, out_of_budget, streamed = 0, False, set()
+    for idx, (city, band_list) in enumerate(todo.items(), 1):
+        print(f"[{idx}/{len(todo)}] {city} ({', '.join(band_list)})")
+        for band in band_list:
+            try:
+                rows = scrape_band(canon(city), city_loc(city), code_of[band])
+            except BudgetSpent:                  # a half-fetched band keeps its previous listings
+                out_of_budget = True
+                break
+            except Exception as e:
+                print("   ⚠️ error:", e)            # keep the previous listings
+                errors += 1
+                continue
+            state.record(city, band, rows, time.time())
+            if rows:
+                bands_of[city][band] = rows
+            else:
+                bands_of[city].pop(band, None)
+
+        bands = {b: bands_of[city][b] for b in labels if bands_of[city].get(b)}
+        bands_of[city] = bands
+        emit({"city": city, "bands": bands})
+        streamed.add(city)
         if bands:
-            total = sum(len(v) for v in bands.values())
-            print(f"   ✓ {total} businesses")
-            merged[city] = bands
+            print(f"   ✓ {sum(len(v) for v in bands.values())} businesses")
         else:
             print("   — no businesses")
-            no_results.append(city)
+        if out_of_budget:
+            print(f"⏹  request budget ({args.budget}) spent")
+            break
 
         time.sleep(random.uniform(0.2, 1.2))  # Shorter polite pause between cities
 
-    OUT_FILE.write_text(
-        json.dumps({"cities": merged, "no_results": no_results}, indent=2),
-        encoding="utf-8"
-    )
-    print(f"\n✅  Finished! {len(merged)} cities scraped, "
-          f"{len(no_results)} with no results → {OUT_FILE}")
+    # cities the budget cut off still go down the stream, with what city_businesses_2.json keeps
+    for city in todo:
+        if city not in streamed:
+            bands_of[city] = {b: bands_of[city][b] for b in labels if bands_of[city].get(b)}
+            emit({"city": city, "bands": bands_of[city], "cached": True})
+    emit({"done": True, "t": time.time(), "cities": sum(1 for b in bands_of.values() if b)})
+    stream.close()
+    state.save()
+    merged, no_results = write_output(bands_of)
+    print(f"\n✅  Finished! {REQUESTS} requests, {errors} errors; {len(merged)} cities with "
+          f"businesses, {len(no_results)} with no results → {OUT_FILE}")
+    record_snapshot("businesses")
 
 if __name__ == "__main__":
     main()
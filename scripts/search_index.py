@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Full-text search over cities, employers and news
+------------------------------------------------
+Builds a compact inverted index from cities_full.json + city_news_fixed.json
+and answers BM25F queries against it, e.g. employers matching "hospital"
+or stories mentioning "plant closure".
+
+    python scripts/search_index.py build
+    python scripts/search_index.py query "hospital" [--kind business] [--by-city]
+    python scripts/search_index.py complete "manu"
+
+Documents:
+  city      name ×4, county ×2, overview ×1
+  business  name ×3, industry ×2, description ×1.5
+  news      title ×3, description ×1
+
+Output → public/search_index.json
+  {
+    "version": 1, "k1": 1.2, "n_docs": N,
+    "kinds": ["city", "business", "news"],
+    "docs":  [[kind_idx, city_idx, "label", "url-or-null"], …],
+    "cities": ["Minneapolis", …],
+    "terms": ["aaa", …],                              # sorted → prefix bisect
+    "postings": ["<doc gaps>;<weights>", …]           # aligned with terms
+  }
+Weights are BM25F pseudo-frequencies (field boost × length-normalised tf,
+summed over fields) precomputed at build time, so a query only needs
+idf · w / (k1 + w) per posting.
+"""
+import argparse, bisect, json, math, pathlib, re, time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from models import load_cities, load_news
+from paths import PUBLIC_DIR
+
+OUT_FILE   = PUBLIC_DIR / "search_index.json"
+
+K1, B = 1.2, 0.75
+KINDS = ("city", "business", "news")
+BOOSTS = {
+    "city":     {"name": 4.0, "county": 2.0, "overview": 1.0},
+    "business": {"name": 3.0, "industry": 2.0, "description": 1.5},
+    "news":     {"title": 3.0, "description": 1.0},
+}
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was "
+    "were which with".split()
+)
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# ───────────────────────── text ───────────────────────────────
+def stem(tok: str) -> str:
+    """Tiny plural folding: hospitals → hospital, clinics → clinic, closures → closure."""
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith(("ss", "us", "is")):
+        return tok[:-1]
+    return tok
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+# ───────────────────────── build ──────────────────────────────
+def collect_docs(cities, news):
+    """Yield (kind, city_idx, label, url, {field: text})."""
+    for ci, c in enumerate(cities):
+        yield "city", ci, c.city, c.wikipedia_url, {"name": c.city, "county": c.county, "overview": c.overview}
+        for b in c.businesses or []:
+            yield "business", ci, b.name, b.website, {
+                "name": b.name, "industry": b.industry, "description": b.description}
+        for s in news.get(c.city, []):
+            yield "news", ci, s.title, s.link, {"title": s.title, "description": s.description}
+
+def build(public_dir=PUBLIC_DIR) -> dict:
+    public_dir = pathlib.Path(public_dir)
+    cities = load_cities(public_dir / "cities_full.json")
+    news   = load_news(public_dir / "city_news_fixed.json")
+
+    docs, field_tokens = [], []
+    for kind, ci, label, url, fields in collect_docs(cities, news):
+        docs.append([KINDS.index(kind), ci, label, url])
+        field_tokens.append((kind, {f: tokenize(t) for f, t in fields.items()}))
+
+    # average field length per (kind, field) for BM25F length normalisation
+    totals, counts = defaultdict(int), defaultdict(int)
+    for kind, fields in field_tokens:
+        for f, toks in fields.items():
+            totals[kind, f] += len(toks)
+            counts[kind, f] += 1
+    avg = {k: (totals[k] / counts[k]) or 1.0 for k in totals}
+
+    postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+    for doc_id, (kind, fields) in enumerate(field_tokens):
+        weights = defaultdict(float)
+        for f, toks in fields.items():
+            if not toks:
+                continue
+            norm  = 1 - B + B * len(toks) / avg[kind, f]
+            boost = BOOSTS[kind][f]
+            tf = defaultdict(int)
+            for t in toks:
+                tf[t] += 1
+            for t, n in tf.items():
+                weights[t] += boost * n / norm
+        for t, w in weights.items():
+            postings[t][doc_id] = w
+
+    terms = sorted(postings)
+    encoded = []
+    for t in terms:
+        ids = sorted(postings[t])
+        gaps = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+        encoded.append(",".join(map(str, gaps)) + ";" +
+                       ",".join(f"{postings[t][d]:.3g}" for d in ids))
+
+    return {
+        "version": 1, "k1": K1, "n_docs": len(docs), "kinds": list(KINDS),
+        "docs": docs, "cities": [c.city for c in cities],
+        "terms": terms, "postings": encoded,
+    }
+
+# ───────────────────────── query ──────────────────────────────
+class SearchIndex:
+    """Query side of search_index.json. Posting lists are decoded lazily and memoised."""
+
+    def __init__(self, data: dict):
+        self.k1     = data["k1"]
+        self.n_docs = data["n_docs"]
+        self.kinds  = data["kinds"]
+        self.docs   = data["docs"]
+        self.cities = data["cities"]
+        self.terms  = data["terms"]
+        self._raw   = data["postings"]
+        self._term_ix = {t: i for i, t in enumerate(self.terms)}
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, path=OUT_FILE):
+        return cls(json.loads(pathlib.Path(path).read_text(encoding="utf-8")))
+
+    def postings(self, term: str):
+        """[(doc_id, weight)] for a term, [] if unknown."""
+        ti = self._term_ix.get(term)
+        if ti is None:
+            return []
+        hit = self._decoded.get(ti)
+        if hit is None:
+            gaps, weights = self._raw[ti].split(";")
+            ids, acc = [], 0
+            for g in gaps.split(","):
+                acc += int(g)
+                ids.append(acc)
+            hit = self._decoded[ti] = list(zip(ids, map(float, weights.split(","))))
+        return hit
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Indexed terms starting with `prefix`, most frequent first."""
+        prefix = prefix.lower()
+        lo = bisect.bisect_left(self.terms, prefix)
+        hi = bisect.bisect_left(self.terms, prefix + "￿")
+        cands = self.terms[lo:hi]
+        if len(cands) > limit:
+            cands = sorted(cands, key=lambda t: -self._raw[self._term_ix[t]].count(","))[:limit]
+        return cands
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, kind: Optional[str] = None, k: int = 10,
+               prefix: bool = True) -> List[dict]:
+        """BM25F ranked hits. With `prefix`, the last query word also matches as a prefix."""
+        toks = tokenize(query)
+        if not toks:
+            return []
+        want = self.kinds.index(kind) if kind else None
+
+        groups = [[t] for t in toks]
+        last = TOKEN_RE.findall(query.lower())[-1]
+        if prefix and not query.endswith(" ") and last not in STOPWORDS:
+            groups[-1] = sorted(set(groups[-1]) | set(self.complete(last, limit=25)))
+
+        scores = defaultdict(float)
+        for group in groups:
+            best = {}
+            for t in group:
+                plist = self.postings(t)
+                idf = self._idf(len(plist))
+                for d, w in plist:
+                    s = idf * w * (self.k1 + 1) / (self.k1 + w)
+                    if s > best.get(d, 0.0):
+                        best[d] = s
+            for d, s in best.items():
+                scores[d] += s
+
+        # documents that match every query word rank above partial matches
+        coverage = defaultdict(int)
+        for group in groups:
+            for d in {d for t in group for d, _ in self.postings(t)}:
+                coverage[d] += 1
+
+        ranked = sorted(
+            (d for d in scores if want is None or self.docs[d][0] == want),
+            key=lambda d: (-coverage[d], -scores[d]),
+        )[:k]
+        return [self._hit(d, scores[d]) for d in ranked]
+
+    def cities_with(self, query: str, kind: str = "business", k: int = 25) -> List[dict]:
+        """Roll document hits up to cities: 'which cities have a hospital employer'."""
+        hits = self.search(query, kind=kind, k=self.n_docs, prefix=False)
+        by_city = {}
+        for h in hits:
+            row = by_city.setdefault(h["city"], {"city": h["city"], "score": 0.0, "matches": []})
+            row["score"] += h["score"]
+            if len(row["matches"]) < 5:
+                row["matches"].append(h["label"])
+        rows = sorted(by_city.values(), key=lambda r: -r["score"])[:k]
+        for r in rows:
+            r["score"] = round(r["score"], 3)
+        return rows
+
+    def _hit(self, d: int, score: float) -> dict:
+        kind_ix, ci, label, url = self.docs[d]
+        return {"kind": self.kinds[kind_ix], "city": self.cities[ci], "label": label,
+                "url": url, "score": round(score, 3)}
+
+# ───────────────────────── CLI ────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Build or query the full-text search index")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build")
+    q = sub.add_parser("query")
+    q.add_argument("text")
+    q.add_argument("--kind", choices=KINDS)
+    q.add_argument("--by-city", action="store_true")
+    q.add_argument("-k", type=int, default=10)
+    c = sub.add_parser("complete")
+    c.add_argument("prefix")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        t0 = time.perf_counter()
+        data = build()
+        OUT_FILE.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        print(f"✅  {data['n_docs']} docs, {len(data['terms'])} terms → {OUT_FILE} "
+              f"({OUT_FILE.stat().st_size/1e6:.2f} MB, {(time.perf_counter() - t0)*1000:.0f} ms)")
+        return
+
+    t0 = time.perf_counter()
+    index = SearchIndex.load()
+    t1 = time.perf_counter()
+    if args.cmd == "complete":
+        results = index.complete(args.prefix)
+    elif args.by_city:
+        results = index.cities_with(args.text, kind=args.kind or "business", k=args.k)
+    else:
+        results = index.search(args.text, kind=args.kind, k=args.k)
+    t2 = time.perf_counter()
+    for r in results:
+        print(" ", r)
+    print(f"\n⏱️  load {(t1 - t0)*1000:.0f} ms, query {(t2 - t1)*1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Historical snapshots of scraper outputs
+---------------------------------------
+INPUT : public/city_businesses_2.json   (scrape_businesses.py)  → "businesses"
+        public/mn_demo_full.json        (mn_demo.py)            → "demographics"
+        public/city_news.json           (news_scraper.py)       → "news"
+OUTPUT: data/snapshots/manifest.json    id dictionaries + one summary row per snapshot
+        data/snapshots/<source>-000001.seg
+
+Each of those scrapers overwrites its output, so every run also records a
+snapshot here. A snapshot keeps per-city metrics as fixed-point ints
+(median_age × 10) and memberships as (city, key) pairs, e.g.
+("Rochester", "500+|Mayo Clinic"), stored as changes against the
+source's previous snapshot:
+
+  <metric>.city / <metric>.delta   cities whose value changed, and by how much
+  <metric>.cleared                 cities whose value went missing
+  members.add / members.drop       city_id << 32 | key_id
+
+Id columns are sorted and delta-encoded. Every column is stored in the
+narrowest int dtype that holds it, so an unchanged rerun costs a few
+hundred bytes. Every KEYFRAME_EVERY-th snapshot of a source is a keyframe
+(changes against nothing). Any point in time is therefore rebuilt from at
+most KEYFRAME_EVERY segments. The manifest holds per-snapshot statewide
+totals, medians and add/drop counts, so statewide trends read no
+segments at all.
+
+Segment layout follows city_columns.bin:
+
+  bytes 0-3    b"MNOS"
+  bytes 4-7    header length H, uint32 little-endian
+  bytes 8-8+H  UTF-8 JSON header, space-padded to a multiple of 8
+  …            columns, little-endian, each 8-byte aligned
+
+    python scripts/snapshots.py record [businesses demographics news]
+    python scripts/snapshots.py list
+    python scripts/snapshots.py trend businesses [--metric employers_500] [--city Rochester]
+    python scripts/snapshots.py diff businesses [--city Rochester] [--since 2026-07-01 | --from 3 --to 7]
+
+The scrapers record automatically; set MNOI_SNAPSHOTS=0 to turn that off.
+"""
+import argparse, json, os, pathlib, statistics, struct, time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from paths import DATA_DIR, PUBLIC_DIR, PREFIX
+
+SNAP_DIR = DATA_DIR / "snapshots"
+
+MAGIC   = b"MNOS"
+VERSION = 1
+ALIGN   = 8
+KEYFRAME_EVERY = 8
+CITY_SHIFT     = 32
+NARROW  = ("<i1", "<i2", "<i4", "<i8")
+
+# ───────────────────────── sources ────────────────────────────
+def _businesses(data) -> tuple:
+    metrics = {"employers_500": {}, "employers_100_499": {}}
+    for city in data.get("no_results", []):
+        metrics["employers_500"][city] = metrics["employers_100_499"][city] = 0
+    members = set()
+    for city, bands in data.get("cities", {}).items():
+        metrics["employers_500"][city]     = len(bands.get("500+", []))
+        metrics["employers_100_499"][city] = len(bands.get("100-499", []))
+        members.update((city, f"{band}|{r['name']}") for band, rows in bands.items() for r in rows)
+    return metrics, members
+
+def _demographics(data) -> tuple:
+    metrics = {"median_income": {}, "median_age": {}}
+    for rec in data:
+        city = rec["city"].replace("Demographic Statistics", "").strip()
+        for m, vals in metrics.items():
+            if rec.get(m) is not None:
+                vals[city] = rec[m]
+    return metrics, set()
+
+def _news(data) -> tuple:
+    metrics = {"news_count": {city: len(stories) for city, stories in data.items()}}
+    members = {(city, s["link"]) for city, stories in data.items() for s in stories if s.get("link")}
+    return metrics, members
+
+# source → (scraper output, {metric: fixed-point scale}, extractor)
+SOURCES = {
+    "businesses":   (PUBLIC_DIR / "city_businesses_2.json",
+                     {"employers_500": 1, "employers_100_499": 1}, _businesses),
+    "demographics": (PUBLIC_DIR / f"{PREFIX}_demo_full.json",
+                     {"median_income": 1, "median_age": 10}, _demographics),
+    "news":         (PUBLIC_DIR / "city_news.json", {"news_count": 1}, _news),
+}
+
+# ───────────────────────── segments ───────────────────────────
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+# numpy is imported where it's used: the scrapers import this module for the
+# hook, and neither their startup nor a missing numpy should depend on it
+def _narrow(values) -> "numpy.ndarray":
+    import numpy as np
+    a = np.asarray(values, dtype=np.int64)
+    lo, hi = (int(a.min()), int(a.max())) if len(a) else (0, 0)
+    for dt in NARROW:
+        info = np.iinfo(dt)
+        if info.min <= lo and hi <= info.max:
+            return a.astype(dt)
+    return a
+
+def _delta(sorted_ids) -> "numpy.ndarray":
+    import numpy as np
+    return _narrow(np.diff(np.asarray(sorted_ids, dtype=np.int64), prepend=0))
+
+def _undelta(col: "numpy.ndarray") -> "numpy.ndarray":
+    import numpy as np
+    return np.cumsum(col, dtype=np.int64)
+
+def encode(header: dict, cols: Dict[str, "numpy.ndarray"]) -> bytes:
+    # header size depends on the offsets it contains → lay out twice
+    header_len = 0
+    while True:
+        offset = 8 + header_len
+        specs = []
+        for name, col in cols.items():
+            offset += _pad(offset)
+            specs.append({"name": name, "dtype": col.dtype.str, "offset": offset, "count": len(col)})
+            offset += col.nbytes
+        raw = json.dumps({**header, "columns": specs}, ensure_ascii=False,
+                         separators=(",", ":")).encode("utf-8")
+        raw += b" " * _pad(8 + len(raw))
+        if len(raw) == header_len:
+            break
+        header_len = len(raw)
+
+    out = bytearray(MAGIC + struct.pack("<I", len(raw)) + raw)
+    for col in cols.values():
+        out += b"\0" * _pad(len(out))
+        out += col.tobytes()
+    return bytes(out)
+
+def read_segment(path) -> Tuple[dict, Dict[str, "numpy.ndarray"]]:
+    import numpy as np
+    buf = pathlib.Path(path).read_bytes()
+    if buf[:4] != MAGIC:
+        raise ValueError(f"{path}: not a snapshot segment")
+    (n,) = struct.unpack_from("<I", buf, 4)
+    header = json.loads(buf[8:8 + n])
+    if header["version"] != VERSION:
+        raise ValueError(f"{path}: unsupported version {header['version']}")
+    return header, {c["name"]: np.frombuffer(buf, dtype=np.dtype(c["dtype"]),
+                                             count=c["count"], offset=c["offset"])
+                    for c in header["columns"]}
+
+# ───────────────────────── store ──────────────────────────────
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _unscale(v, scale: int):
+    return v if v is None or scale == 1 else v / scale
+
+def _median(values) -> Optional[float]:
+    return float(statistics.median(values)) if values else None
+
+class SnapshotStore:
+    """State per source is ({metric: {city_id: int}}, {member code})."""
+
+    def __init__(self, root=SNAP_DIR):
+        self.root = pathlib.Path(root)
+        self.manifest_file = self.root / "manifest.json"
+        if self.manifest_file.exists():
+            self.m = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+        else:
+            self.m = {"version": VERSION, "cities": [], "keys": [], "sources": {}}
+        self.city_ids = {c: i for i, c in enumerate(self.m["cities"])}
+        self.key_ids  = {k: i for i, k in enumerate(self.m["keys"])}
+        self.by_lower = {}
+        for i, c in enumerate(self.m["cities"]):
+            self.by_lower.setdefault(c.lower(), i)
+
+    def _cid(self, city: str) -> int:
+        if city not in self.city_ids:
+            self.city_ids[city] = len(self.m["cities"])
+            self.by_lower.setdefault(city.lower(), self.city_ids[city])
+            self.m["cities"].append(city)
+        return self.city_ids[city]
+
+    def _kid(self, key: str) -> int:
+        if key not in self.key_ids:
+            self.key_ids[key] = len(self.m["keys"])
+            self.m["keys"].append(key)
+        return self.key_ids[key]
+
+    def city_id(self, city: str) -> int:
+        i = self.city_ids.get(city, self.by_lower.get(city.lower()))
+        if i is None:
+            raise KeyError(f"no snapshots mention {city!r}")
+        return i
+
+    def _band(self, code: int) -> str:
+        """"500+" for "500+|Mayo Clinic"; "" for keys without a band."""
+        key = self.m["keys"][code & 0xFFFFFFFF]
+        return key.partition("|")[0] if "|" in key else ""
+
+    def snapshots(self, source: str) -> List[dict]:
+        return self.m["sources"].get(source, [])
+
+    def _save(self):
+        tmp = self.manifest_file.with_name("manifest.json.tmp")
+        tmp.write_text(json.dumps(self.m, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.manifest_file)
+
+    # ---------- point-in-time state ----------
+    def state(self, source: str, seq: int) -> tuple:
+        """Metrics + members as of snapshot `seq` (1-based): nearest keyframe + the deltas after it."""
+        snaps = self.snapshots(source)
+        if not 1 <= seq <= len(snaps):
+            raise KeyError(f"{source} has no snapshot #{seq}")
+        k = seq - 1
+        while not snaps[k]["keyframe"]:
+            k -= 1
+        metrics, members = {}, set()
+        for s in snaps[k:seq]:
+            header, cols = read_segment(self.root / s["file"])
+            for m in header["metrics"]:
+                vals = metrics.setdefault(m, {})
+                for cid, d in zip(_undelta(cols[f"{m}.city"]).tolist(), cols[f"{m}.delta"].tolist()):
+                    vals[cid] = vals.get(cid, 0) + d
+                for cid in _undelta(cols[f"{m}.cleared"]).tolist():
+                    vals.pop(cid, None)
+            members.update(_undelta(cols["members.add"]).tolist())
+            members.difference_update(_undelta(cols["members.drop"]).tolist())
+        return metrics, members
+
+    # ---------- write ----------
+    def record(self, source: str, taken_at: Optional[str] = None, force: bool = False) -> Optional[dict]:
+        """Snapshot the source's current output; None if nothing changed since the last one."""
+        path, scales, extract = SOURCES[source]
+        raw_metrics, raw_members = extract(json.loads(path.read_text(encoding="utf-8")))
+        new_metrics = {m: {self._cid(c): int(round(v * scales[m])) for c, v in raw_metrics.get(m, {}).items()}
+                       for m in scales}
+        new_members = {self._cid(c) << CITY_SHIFT | self._kid(k) for c, k in raw_members}
+
+        snaps = self.snapshots(source)
+        old_metrics, old_members = self.state(source, len(snaps)) if snaps else ({}, set())
+        adds, drops = new_members - old_members, old_members - new_members
+        if snaps and not force and not adds and not drops and \
+                all(new_metrics[m] == old_metrics.get(m, {}) for m in scales):
+            return None
+
+        keyframe = len(snaps) % KEYFRAME_EVERY == 0
+        base_metrics, base_members = ({}, set()) if keyframe else (old_metrics, old_members)
+        cols = {}
+        for m in scales:
+            new, base = new_metrics[m], base_metrics.get(m, {})
+            changed = sorted(c for c, v in new.items() if base.get(c) != v)
+            cols[f"{m}.city"]    = _delta(changed)
+            cols[f"{m}.delta"]   = _narrow([new[c] - base.get(c, 0) for c in changed])
+            cols[f"{m}.cleared"] = _delta(sorted(base.keys() - new.keys()))
+        cols["members.add"]  = _delta(sorted(new_members - base_members))
+        cols["members.drop"] = _delta(sorted(base_members - new_members))
+
+        seq = len(snaps) + 1
+        taken_at = taken_at or _now_iso()
+        name = f"{source}-{seq:06d}.seg"
+        self.root.mkdir(parents=True, exist_ok=True)
+        blob = encode({"version": VERSION, "source": source, "seq": seq, "taken_at": taken_at,
+                       "keyframe": keyframe, "metrics": scales}, cols)
+        (self.root / name).write_bytes(blob)
+
+        summary = {
+            "seq": seq, "taken_at": taken_at, "keyframe": keyframe, "file": name, "bytes": len(blob),
+            "source_mtime": datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+                                    .strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "totals": {m: {"cities": len(v), "sum": _unscale(sum(v.values()), scales[m]),
+                           "median": _unscale(_median(list(v.values())), scales[m])}
+                       for m, v in new_metrics.items()},
+            "members": len(new_members),
+            "adds": dict(Counter(self._band(c) for c in adds)),
+            "drops": dict(Counter(self._band(c) for c in drops)),
+        }
+        self.m["sources"].setdefault(source, []).append(summary)
+        self._save()
+        return summary
+
+    # ---------- queries ----------
+    def resolve(self, source: str, when: Optional[str]) -> int:
+        """Seq of the last snapshot taken on or before `when` (ISO date/time), or the latest."""
+        snaps = self.snapshots(source)
+        if not snaps:
+            raise KeyError(f"no {source} snapshots yet")
+        if when is None:
+            return len(snaps)
+        hits = [s["seq"] for s in snaps if s["taken_at"][:len(when)] <= when]
+        if not hits:
+            raise KeyError(f"no {source} snapshot on or before {when}")
+        return hits[-1]
+
+    def statewide_trend(self, source: str, metric: Optional[str] = None) -> List[dict]:
+        """One row per snapshot, from the manifest alone."""
+        rows = []
+        for s in self.snapshots(source):
+            totals = s["totals"] if metric is None else {metric: s["totals"][metric]}
+            rows.append({"seq": s["seq"], "taken_at": s["taken_at"], "totals": totals,
+                         "members": s["members"], "adds": s["adds"], "drops": s["drops"]})
+        return rows
+
+    def city_trend(self, source: str, city: str, metric: str) -> List[dict]:
+        """The city's value at every snapshot: one binary search per segment, no state rebuilt."""
+        import numpy as np
+        cid, scale = self.city_id(city), SOURCES[source][1][metric]
+        value, rows = None, []
+        for s in self.snapshots(source):
+            _, cols = read_segment(self.root / s["file"])
+            if s["keyframe"]:
+                value = None
+            ids = _undelta(cols[f"{metric}.city"])
+            j = int(np.searchsorted(ids, cid))
+            if j < len(ids) and ids[j] == cid:
+                value = (value or 0) + int(cols[f"{metric}.delta"][j])
+            cleared = _undelta(cols[f"{metric}.cleared"])
+            j = int(np.searchsorted(cleared, cid))
+            if j < len(cleared) and cleared[j] == cid:
+                value = None
+            rows.append({"seq": s["seq"], "taken_at": s["taken_at"],
+                         metric: _unscale(value, scale)})
+        return rows
+
+    def diff(self, source: str, a: int, b: int, city: Optional[str] = None, top: int = 10) -> dict:
+        """Member adds/drops and metric changes between snapshots a and b (one city, or statewide)."""
+        snaps, scales = self.snapshots(source), SOURCES[source][1]
+        (ma, sa), (mb, sb) = self.state(source, a), self.state(source, b)
+        out = {"source": source, "from": {k: snaps[a - 1][k] for k in ("seq", "taken_at")},
+               "to": {k: snaps[b - 1][k] for k in ("seq", "taken_at")}}
+        split = lambda codes: sorted((self.m["cities"][c >> CITY_SHIFT], self.m["keys"][c & 0xFFFFFFFF])
+                                     for c in codes)
+        if city is not None:
+            cid = self.city_id(city)
+            out["city"] = self.m["cities"][cid]
+            mine = lambda codes: {c for c in codes if c >> CITY_SHIFT == cid}
+            sa, sb = mine(sa), mine(sb)
+            out["metrics"] = {}
+            for m, scale in scales.items():
+                va, vb = ma.get(m, {}).get(cid), mb.get(m, {}).get(cid)
+                out["metrics"][m] = {"from": _unscale(va, scale), "to": _unscale(vb, scale),
+                                     "change": None if va is None or vb is None else _unscale(vb - va, scale)}
+            out["adds"]  = [k for _, k in split(sb - sa)]
+            out["drops"] = [k for _, k in split(sa - sb)]
+            return out
+
+        out["metrics"] = {}
+        for m, scale in scales.items():
+            va, vb = ma.get(m, {}), mb.get(m, {})
+            moves = sorted((_unscale(vb[c] - va[c], scale), self.m["cities"][c]) for c in va.keys() & vb.keys()
+                           if vb[c] != va[c])
+            out["metrics"][m] = {
+                "from": snaps[a - 1]["totals"].get(m), "to": snaps[b - 1]["totals"].get(m),
+                "cities_changed": len(moves),
+                "top_gains":  [{"city": c, "change": d} for d, c in reversed(moves[-top:]) if d > 0],
+                "top_losses": [{"city": c, "change": d} for d, c in moves[:top] if d < 0],
+            }
+        net = Counter()
+        for c in sb - sa:
+            net[c >> CITY_SHIFT] += 1
+        for c in sa - sb:
+            net[c >> CITY_SHIFT] -= 1
+        out["adds"]  = len(sb - sa)
+        out["drops"] = len(sa - sb)
+        out["net_by_city"] = [{"city": self.m["cities"][c], "net": n}
+                              for c, n in sorted(net.items(), key=lambda kv: -abs(kv[1]))[:top] if n]
+        return out
+
+# ───────────────────────── scraper hook ───────────────────────
+def record_snapshot(source: str) -> None:
+    """Scraper hook. Never lets a snapshot problem break a scrape."""
+    if os.environ.get("MNOI_SNAPSHOTS", "1") == "0":
+        return
+    try:
+        s = SnapshotStore().record(source)
+    except (ImportError, OSError, ValueError, KeyError) as e:
+        print(f"   ⚠️ {source} snapshot failed: {e}")
+        return
+    if s is None:
+        print(f"📸  {source}: unchanged since the last snapshot")
+    else:
+        print(f"📸  {source} snapshot #{s['seq']} ({s['bytes']} bytes"
+              f"{', keyframe' if s['keyframe'] else ''})")
+
+# ───────────────────────── CLI ────────────────────────────────
+def _fmt(v) -> str:
+    return "—" if v is None else f"{v:,.1f}".removesuffix(".0")
+
+def main():
+    ap = argparse.ArgumentParser(description="Historical snapshots of scraper outputs")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("record", help="snapshot the current scraper outputs")
+    p.add_argument("sources", nargs="*", help=f"default: all of {', '.join(SOURCES)}")
+    p.add_argument("--at", help="taken_at to store (ISO, default now), for backfills")
+    p.add_argument("--force", action="store_true", help="record even if nothing changed")
+    sub.add_parser("list", help="snapshots per source")
+    p = sub.add_parser("trend", help="per-snapshot series, statewide or for one city")
+    p.add_argument("source", choices=SOURCES)
+    p.add_argument("--metric")
+    p.add_argument("--city")
+    p = sub.add_parser("diff", help="adds / drops / metric changes between two snapshots")
+    p.add_argument("source", choices=SOURCES)
+    p.add_argument("--city")
+    p.add_argument("--since", help="compare the latest snapshot with the last one on or before this date")
+    p.add_argument("--from", dest="a", type=int, help="snapshot seq (default: the one before --to)")
+    p.add_argument("--to", dest="b", type=int, help="snapshot seq (default: latest)")
+    p.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    store = SnapshotStore()
+    if args.cmd == "record":
+        unknown = [s for s in args.sources if s not in SOURCES]
+        if unknown:
+            ap.error(f"unknown source(s): {', '.join(unknown)} (choose from {', '.join(SOURCES)})")
+        for source in args.sources or SOURCES:
+            if not SOURCES[source][0].exists():
+                print(f"⚠️  {source}: {SOURCES[source][0]} missing, skipped")
+                continue
+            t0 = time.perf_counter()
+            s = store.record(source, args.at, args.force)
+            ms = (time.perf_counter() - t0) * 1000
+            if s is None:
+                print(f"📸  {source}: unchanged since the last snapshot ({ms:.0f} ms)")
+            else:
+                print(f"📸  {source} #{s['seq']}: {s['bytes']:,} bytes"
+                      f"{' (keyframe)' if s['keyframe'] else ''}, "
+                      f"+{sum(s['adds'].values())} / -{sum(s['drops'].values())} members ({ms:.0f} ms)")
+        return
+
+    if args.cmd == "list":
+        for source in SOURCES:
+            snaps = store.snapshots(source)
+            size = sum(s["bytes"] for s in snaps)
+            print(f"{source}: {len(snaps)} snapshots, {size/1e3:.1f} kB")
+            for s in snaps:
+                print(f"   #{s['seq']:<4} {s['taken_at']}  {s['bytes']:>8,} B  {s['members']:>6} members"
+                      f"  +{sum(s['adds'].values())}/-{sum(s['drops'].values())}"
+                      f"{'  keyframe' if s['keyframe'] else ''}")
+        return
+
+    scales = SOURCES[args.source][1]
+    if getattr(args, "metric", None) and args.metric not in scales:
+        ap.error(f"{args.source} metrics: {', '.join(scales)}")
+    try:
+        if args.cmd == "trend":
+            if args.city:
+                store.city_id(args.city)
+                for m in [args.metric] if args.metric else scales:
+                    print(f"{args.city} · {m}")
+                    for r in store.city_trend(args.source, args.city, m):
+                        print(f"   #{r['seq']:<4} {r['taken_at']}  {_fmt(r[m])}")
+                return
+            for r in store.statewide_trend(args.source, args.metric):
+                tot = "  ".join(f"{m} Σ{_fmt(t['sum'])} med {_fmt(t['median'])}" for m, t in r["totals"].items())
+                adds = ", ".join(f"{k or 'all'} +{n}" for k, n in r["adds"].items())
+                drops = ", ".join(f"{k or 'all'} -{n}" for k, n in r["drops"].items())
+                print(f"   #{r['seq']:<4} {r['taken_at']}  {tot}  {adds} {drops}".rstrip())
+            return
+
+        b = args.b if args.b is not None else store.resolve(args.source, None)
+        a = args.a
+        if a is None:
+            a = store.resolve(args.source, args.since) if args.since else b - 1
+            if a < 1:
+                raise SystemExit(f"❌  {args.source} has no snapshot before #{b} – nothing to compare")
+        d = store.diff(args.source, a, b, args.city)
+    except KeyError as e:
+        raise SystemExit(f"❌  {e.args[0]}") from None
+
+    if args.json:
+        print(json.dumps(d, indent=2, ensure_ascii=False))
+        return
+    print(f"{args.source} #{d['from']['seq']} ({d['from']['taken_at']}) → "
+          f"#{d['to']['seq']} ({d['to']['taken_at']})" + (f" · {d['city']}" if args.city else ""))
+    for m, v in d["metrics"].items():
+        if args.city:
+            print(f"   {m:<18} {_fmt(v['from'])} → {_fmt(v['to'])}  ({_fmt(v['change'])})")
+        else:
+            print(f"   {m:<18} Σ {_fmt(v['from'] and v['from']['sum'])} → {_fmt(v['to'] and v['to']['sum'])}, "
+                  f"median {_fmt(v['from'] and v['from']['median'])} → {_fmt(v['to'] and v['to']['median'])}, "
+                  f"{v['cities_changed']} cities changed")
+    if args.city:
+        for k in d["adds"]:
+            print(f"   + {k}")
+        for k in d["drops"]:
+            print(f"   - {k}")
+    else:
+        print(f"   members +{d['adds']} / -{d['drops']}")
+        for r in d["net_by_city"]:
+            print(f"     {r['city']:<24} {r['net']:+d}")
+
+if __name__ == "__main__":
+    main()
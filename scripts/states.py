@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+States: registry + per-state process pool
+-----------------------------------------
+Every pipeline step works on one state, picked by MNOI_STATE (see paths.py).
+This runs a whole mnoi command once per state, each in its own process,
+as many at a time as there are cores:
+
+    python scripts/mnoi.py --states MN,WI,IA,ND,SD geometry border
+    python scripts/mnoi.py --states all --workers 8 merge
+
+OUTPUT: <state dir>/…                    whatever the command writes, per state
+        data/logs/<command>-<xx>.log     each state's stdout / stderr
+        public/states/index.json         combined index:
+          {
+            "version": 1,
+            "states": [{"code": "MN", "fips": "27", "name": "Minnesota", "dir": ".",
+                        "ok": true, "seconds": 3.1, "cities": 851, "files": [...]}, …],
+            "cities": [["MN", "Minneapolis", 44.98, -93.27, 429954], …]   # from <xx>_cities_dec.json
+          }
+
+Each state gets a fresh interpreter (spawn, one task per child), because
+paths.py resolves its directories at import time. States are independent,
+so wall time drops with core count until the slowest single state dominates.
+A new state needs its seed list, <state dir>/basic_cities.json, just as
+Minnesota does.
+"""
+import json, os, sys, time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# paths is imported inside the functions: a pool child imports this module to
+# find _run_state, and paths must not resolve until MNOI_STATE is set.
+
+class State(NamedTuple):
+    code: str       # postal code, "MN"
+    fips: str       # Census STATE, "27"
+    name: str       # "Minnesota"
+
+    @property
+    def slug(self) -> str:          # minnesota-demographics.com, new-york-demographics.com
+        return self.name.lower().replace(" ", "-")
+
+    @property
+    def wiki(self) -> str:          # List_of_counties_in_New_York
+        return self.name.replace(" ", "_")
+
+STATES: Dict[str, State] = {s.code: s for s in (
+    State("AL", "01", "Alabama"),        State("AK", "02", "Alaska"),
+    State("AZ", "04", "Arizona"),        State("AR", "05", "Arkansas"),
+    State("CA", "06", "California"),     State("CO", "08", "Colorado"),
+    State("CT", "09", "Connecticut"),    State("DE", "10", "Delaware"),
+    State("DC", "11", "District of Columbia"),
+    State("FL", "12", "Florida"),        State("GA", "13", "Georgia"),
+    State("HI", "15", "Hawaii"),         State("ID", "16", "Idaho"),
+    State("IL", "17", "Illinois"),       State("IN", "18", "Indiana"),
+    State("IA", "19", "Iowa"),           State("KS", "20", "Kansas"),
+    State("KY", "21", "Kentucky"),       State("LA", "22", "Louisiana"),
+    State("ME", "23", "Maine"),          State("MD", "24", "Maryland"),
+    State("MA", "25", "Massachusetts"),  State("MI", "26", "Michigan"),
+    State("MN", "27", "Minnesota"),      State("MS", "28", "Mississippi"),
+    State("MO", "29", "Missouri"),       State("MT", "30", "Montana"),
+    State("NE", "31", "Nebraska"),       State("NV", "32", "Nevada"),
+    State("NH", "33", "New Hampshire"),  State("NJ", "34", "New Jersey"),
+    State("NM", "35", "New Mexico"),     State("NY", "36", "New York"),
+    State("NC", "37", "North Carolina"), State("ND", "38", "North Dakota"),
+    State("OH", "39", "Ohio"),           State("OK", "40", "Oklahoma"),
+    State("OR", "41", "Oregon"),         State("PA", "42", "Pennsylvania"),
+    State("RI", "44", "Rhode Island"),   State("SC", "45", "South Carolina"),
+    State("SD", "46", "South Dakota"),   State("TN", "47", "Tennessee"),
+    State("TX", "48", "Texas"),          State("UT", "49", "Utah"),
+    State("VT", "50", "Vermont"),        State("VA", "51", "Virginia"),
+    State("WA", "53", "Washington"),     State("WV", "54", "West Virginia"),
+    State("WI", "55", "Wisconsin"),      State("WY", "56", "Wyoming"),
+)}
+
+def current() -> State:
+    from paths import STATE
+    try:
+        return STATES[STATE]
+    except KeyError:
+        raise SystemExit(f"❌  MNOI_STATE={STATE!r} is not a state code") from None
+
+def parse_states(spec: str) -> List[str]:
+    """'MN, wi,IA' → ['MN', 'WI', 'IA']; 'all' → every state + DC."""
+    if spec.strip().lower() == "all":
+        return list(STATES)
+    codes = [c.strip().upper() for c in spec.split(",") if c.strip()]
+    unknown = [c for c in codes if c not in STATES]
+    if unknown:
+        raise ValueError(f"unknown state code(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(codes))
+
+# ───────────────────────── worker ─────────────────────────────
+def _run_state(code: str, argv: Sequence[str]) -> dict:
+    """One `mnoi <argv>` for one state, output to its log file. Runs in a fresh process."""
+    os.environ["MNOI_STATE"] = code
+    from paths import DATA_ROOT
+    log = DATA_ROOT / "logs" / f"{argv[0]}-{code.lower()}.log"
+    log.parent.mkdir(parents=True, exist_ok=True)
+    t0, error = time.perf_counter(), None
+    with open(log, "w", encoding="utf-8", buffering=1) as fh:
+        sys.stdout = sys.stderr = fh
+        sys.argv = ["mnoi", *argv]
+        try:
+            import mnoi
+            mnoi.main()
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = f"exit {e.code}"
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    return {"code": code, "ok": error is None, "error": error,
+            "seconds": round(time.perf_counter() - t0, 2), "log": str(log)}
+
+def run_states(codes: Sequence[str], argv: Sequence[str], workers: Optional[int] = None) -> List[dict]:
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(codes)))
+    print(f"🗺️  mnoi {' '.join(argv)} × {len(codes)} state(s) on {workers} process(es)")
+    t0, results = time.perf_counter(), []
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        futs = [pool.submit(_run_state, c, list(argv)) for c in codes]
+        for f in as_completed(futs):
+            r = f.result()
+            results.append(r)
+            mark = "✅" if r["ok"] else f"❌  {r['error']} –"
+            print(f"   {mark} {r['code']} in {r['seconds']:.1f}s  ({r['log']})")
+    results.sort(key=lambda r: codes.index(r["code"]))
+    print(f"⏱️  {sum(r['ok'] for r in results)}/{len(codes)} ok, "
+          f"{time.perf_counter() - t0:.1f}s wall vs {sum(r['seconds'] for r in results):.1f}s summed")
+    write_index(results)
+    return results
+
+# ───────────────────────── combined index ─────────────────────
+def _state_entry(code: str, run: Optional[dict]) -> Tuple[dict, List[list]]:
+    from paths import PUBLIC_ROOT, state_dir
+    s, d = STATES[code], state_dir(PUBLIC_ROOT, code)
+    dec = d / f"{code.lower()}_cities_dec.json"
+    cities = json.loads(dec.read_text(encoding="utf-8")) if dec.exists() else []
+    entry = {
+        "code": s.code, "fips": s.fips, "name": s.name,
+        "dir": d.relative_to(PUBLIC_ROOT).as_posix(),
+        "cities": len(cities),
+        "files": sorted(p.name for p in d.glob("*") if p.suffix in (".json", ".geojson", ".bin")),
+    }
+    if run:
+        entry.update(ok=run["ok"], seconds=run["seconds"])
+    return entry, [[s.code, c["n"], c["lat"], c["lon"], c.get("pop")] for c in cities]
+
+def write_index(results: List[dict]):
+    """Merge this run into public/states/index.json; states not in the run keep their entry."""
+    from paths import PUBLIC_ROOT
+    index_file = PUBLIC_ROOT / "states" / "index.json"
+    old = json.loads(index_file.read_text(encoding="utf-8")) if index_file.exists() else {}
+    runs = {r["code"]: r for r in results}
+    prev = {e["code"]: e for e in old.get("states", [])}
+    entries, cities = [], []
+    for code in STATES:
+        if code not in runs and code not in prev:
+            continue
+        entry, rows = _state_entry(code, runs.get(code))
+        if code not in runs:
+            entry.update({k: prev[code][k] for k in ("ok", "seconds") if k in prev[code]})
+        entries.append(entry)
+        cities.extend(rows)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    index_file.write_text(json.dumps({"version": 1, "states": entries, "cities": cities},
+                                     ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    print(f"✅  {index_file}: {len(entries)} state(s), {len(cities)} cities")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Streaming scrape → merge
+------------------------
+INPUT : data/city_businesses.ndjson        appended by scrape_businesses.py, one line per city:
+          {"started": 1718000000.0, "total": 855}
+          {"city": "Rochester", "bands": {"500+": [...], "100-499": [...]}}
+          {"city": "Adrian", "bands": {}, "error": "…"}
+          {"done": true, "t": 1718003600.0, "cities": 612}
+        cities_with_demo.json, unis_cleaned.json, counties.json   (as in the batch steps)
+OUTPUT: cities_with_businesses_countyweb.json                   (county_merge's output)
+
+Runs the merge_businesses → uni_2 → final → county_merge chain one city at
+a time, as scrape_businesses finishes each city, instead of after all of
+them. Each arriving city is rebuilt from its demographics record with the
+same per-city functions the batch steps use. Cities that haven't arrived
+yet look as if they had no listings. Once the done marker is read, the
+output is byte-identical to running the batch chain on the finished scrape.
+
+Every `started` record starts the merge over. When following (not --once),
+a stream whose `started` is older than this process (minus --grace) is the
+previous run's and is skipped until scrape_businesses truncates it.
+
+The output is rewritten atomically at most every --every seconds while
+cities arrive, and once more at the end.
+
+    python scripts/scrape_businesses.py & python scripts/stream_merge.py
+    python scripts/stream_merge.py --once          # consume what's there and stop
+"""
+import argparse, copy, json, os, time
+from collections import defaultdict
+from typing import Iterator, Optional
+
+import county_merge, merge_businesses, uni_2
+from final import add_websites
+from scrape_businesses import STREAM_FILE
+
+POLL_S = 0.5
+
+def _same_head(path, head: bytes) -> bool:
+    """True while the file still starts with the line we read first (no truncate-and-rewrite)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(head)) == head
+    except FileNotFoundError:
+        return False
+
+def follow(path, idle: Optional[float], poll: float = POLL_S,
+           since: Optional[float] = None) -> Iterator[dict]:
+    """Records as they're appended to `path`; ends at the done marker or after `idle` s without data.
+
+    With `since`, records of a run whose `started` stamp is older than that are
+    skipped – until the producer truncates it, the file still holds the previous
+    run, done marker included. A file that shrinks or whose first line changes
+    means the producer started over, which yields {"restart": True}.
+    """
+    pos, buf, quiet, head = 0, b"", 0.0, b""
+    live = since is None
+    while True:
+        size = path.stat().st_size if path.exists() else 0
+        if pos and (size < pos or not _same_head(path, head)):
+            pos, buf, head = 0, b"", b""
+            if live:
+                yield {"restart": True}
+            live = since is None
+            continue
+        if size > pos:
+            with open(path, "rb") as f:
+                f.seek(pos)
+                buf += f.read(size - pos)
+            pos, quiet = size, 0.0
+            *lines, buf = buf.split(b"\n")        # a partial last line waits for the rest
+            if lines and not head:
+                head = lines[0] + b"\n"
+            for line in lines:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if "started" in rec:
+                    live = since is None or rec["started"] >= since
+                if not live:
+                    continue
+                yield rec
+                if rec.get("done"):
+                    return
+            continue
+        if idle is not None and quiet >= idle:
+            return
+        time.sleep(poll)
+        quiet += poll
+
+class StreamMerge:
+    def __init__(self):
+        self.base = json.loads(merge_businesses.DEMO_FILE.read_text())["cities"]
+        self.unis = json.loads(uni_2.UNIS_FILE.read_text(encoding="utf-8"))
+        self.counties = json.loads(county_merge.COUNTIES_FILE.read_text(encoding="utf-8"))
+        self.by_lower = defaultdict(list)
+        for i, rec in enumerate(self.base):
+            self.by_lower[rec["city"].lower()].append(i)
+        self.reset()
+
+    def reset(self):
+        self.biz, self.biz_lower = {}, {}
+        self.cities = [self.enrich(i) for i in range(len(self.base))]
+        self.seen = 0
+
+    def enrich(self, i: int) -> dict:
+        """One city through the whole batch chain, from its pristine demographics record."""
+        rec = copy.deepcopy(self.base[i])
+        merge_businesses.merge_city(rec, self.biz_lower.get(rec["city"].lower(), {}))
+        uni_2.add_uni_details(rec, self.unis)
+        add_websites(rec, self.biz.get(rec["city"], {}))
+        county_merge.add_county_website(rec, self.counties)
+        return rec
+
+    def add(self, city: str, bands: dict):
+        self.seen += 1
+        if bands:                      # city_businesses_2.json only lists cities with listings
+            self.biz[city] = bands
+            self.biz_lower[city.lower()] = bands
+        for i in self.by_lower.get(city.lower(), ()):
+            self.cities[i] = self.enrich(i)
+
+    def write(self, path):
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"cities": self.cities}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+def main():
+    ap = argparse.ArgumentParser(description="Merge cities as scrape_businesses streams them")
+    ap.add_argument("--every", type=float, default=2.0, help="seconds between output rewrites")
+    ap.add_argument("--idle", type=float, default=600.0, help="give up after this long without data")
+    ap.add_argument("--once", action="store_true", help="read what's there, write, stop")
+    ap.add_argument("--grace", type=float, default=30.0,
+                    help="also accept a scrape that started up to this many seconds before us")
+    args = ap.parse_args()
+
+    out = county_merge.OUT_FILE
+    sm = StreamMerge()
+    print(f"📡  following {STREAM_FILE} → {out}")
+    # --once takes the file as it is; otherwise wait for this run's scrape, not the last one's
+    since = None if args.once else time.time() - args.grace
+    last_write, total, done = 0.0, None, None
+    for rec in follow(STREAM_FILE, 0 if args.once else args.idle, since=since):
+        if rec.get("restart"):
+            print("   ↺ producer restarted – waiting for its started record")
+        elif "started" in rec:
+            sm.reset()
+            total = rec["total"]
+        elif rec.get("done"):
+            done = rec
+        else:
+            sm.add(rec["city"], rec.get("bands") or {})
+            if time.monotonic() - last_write >= args.every:
+                sm.write(out)
+                last_write = time.monotonic()
+                print(f"   {sm.seen}/{total or '?'} cities merged")
+    sm.write(out)
+
+    with_biz = sum(1 for c in sm.cities if c.get("businesses"))
+    print(f"✅  {sm.seen} streamed cities, {with_biz} with businesses → {out}")
+    if done:
+        print(f"   output ready {time.time() - done['t']:.1f}s after the last page was fetched")
+    else:
+        print("   ⚠️ no done marker yet – the scrape is still running or stopped early")
+
+if __name__ == "__main__":
+    main()
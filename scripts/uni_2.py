@@ -1,19 +1,14 @@
 import json
-from pathlib import Path
 
-CITIES_FILE = Path("public/cities_with_businesses.json")
-UNIS_FILE = Path("public/unis_cleaned.json")
-OUTFILE = Path("public/cities_with_businesses_2.json")
+from paths import PUBLIC_DIR
 
-# Load data
-with CITIES_FILE.open(encoding="utf-8") as f:
-    cities = json.load(f)
-with UNIS_FILE.open(encoding="utf-8") as f:
-    unis = json.load(f)
+CITIES_FILE = PUBLIC_DIR / "cities_with_businesses.json"
+UNIS_FILE = PUBLIC_DIR / "unis_cleaned.json"
+OUTFILE = PUBLIC_DIR / "cities_with_businesses_2.json"
 
-missing_website_count = 0
-
-for city in cities["cities"]:
+def add_uni_details(city: dict, unis: dict) -> int:
+    """Copy website / tuition onto the city's universities; returns how many still lack a website."""
+    missing_website_count = 0
     city_name = city["city"]
     # Build lookup: {name_lower: {website, tuition}}
     city_uni_lookup = {}
@@ -36,9 +31,25 @@ for city in cities["cities"]:
                 uni["tuition"] = None
             if not uni["website"]:
                 missing_website_count += 1
+    return missing_website_count
+
+def main():
+    # Load data
+    with CITIES_FILE.open(encoding="utf-8") as f:
+        cities = json.load(f)
+    with UNIS_FILE.open(encoding="utf-8") as f:
+        unis = json.load(f)
+
+    missing_website_count = 0
+
+    for city in cities["cities"]:
+        missing_website_count += add_uni_details(city, unis)
+
+    # Save new merged file
+    OUTFILE.write_text(json.dumps(cities, indent=2, ensure_ascii=False), encoding="utf-8")
 
-# Save new merged file
-OUTFILE.write_text(json.dumps(cities, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"✅ Updated and saved as {OUTFILE}")
+    print(f"❗️Total universities in the official city list missing website: {missing_website_count}")
 
-print(f"✅ Updated and saved as {OUTFILE}")
-print(f"❗️Total universities in the official city list missing website: {missing_website_count}")
+if __name__ == "__main__":
+    main()
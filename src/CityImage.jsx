@@ -0,0 +1,40 @@
+// Renders a city photo from a city_images.json record.
+// Prefers the local thumbnails written by scripts/image_cache.py and falls
+// back to the original Wikimedia hotlink for records that have no "thumb".
+export default function CityImage({ image, city }) {
+  if (!image) return null;
+
+  const style = {
+    maxWidth: "100%",
+    height: "auto",
+    borderRadius: "1rem",
+    marginBottom: "1.2rem",
+    boxShadow: "0 2px 8px rgba(0,0,0,0.07)",
+  };
+
+  const { thumb } = image;
+  if (!thumb) {
+    return <img src={image.image_url} alt={`Skyline of ${city}`} style={style} />;
+  }
+
+  return (
+    <picture>
+      <source type="image/webp" srcSet={thumb.srcset.webp} sizes="(max-width: 520px) 100vw, 460px" />
+      <img
+        src={thumb.src}
+        srcSet={thumb.srcset.jpg}
+        sizes="(max-width: 520px) 100vw, 460px"
+        width={thumb.width}
+        height={thumb.height}
+        loading="lazy"
+        decoding="async"
+        alt={`Skyline of ${city}`}
+        style={{
+          ...style,
+          backgroundImage: `url(${thumb.placeholder})`,
+          backgroundSize: "cover",
+        }}
+      />
+    </picture>
+  );
+}
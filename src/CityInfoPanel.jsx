@@ -1,20 +1,21 @@
 import { Link } from "react-router-dom";
 import { useEffect, useState } from "react";
+import CityImage from "./CityImage";
+import { loadArtifact } from "./artifacts";
 
 // Helper for slugs (needed for images)
 const normalize = (str) => str.toLowerCase().replace(/[^a-z0-9]/g, "");
 
 export default function CityInfoPanel({ city }) {
-  const [imageUrl, setImageUrl] = useState(null);
+  const [image, setImage] = useState(null);
 
   // Fetch city image on mount or city change
   useEffect(() => {
-    fetch("/city_images.json")
-      .then((r) => r.json())
+    loadArtifact("city_images.json")
       .then((arr) => {
         if (!city) return;
         const img = arr.find((rec) => normalize(rec.city) === normalize(city.city));
-        setImageUrl(img?.image_url || null);
+        setImage(img?.image_url ? img : null);
       });
   }, [city]);
 
@@ -67,18 +68,7 @@ export default function CityInfoPanel({ city }) {
       }}
     >
       <h1 className="display-4 mb-4">{city.city}</h1>
-      {imageUrl && (
-        <img
-          src={imageUrl}
-          alt={`Skyline of ${city.city}`}
-          style={{
-            maxWidth: "100%",
-            borderRadius: "1rem",
-            marginBottom: "1.2rem",
-            boxShadow: "0 2px 8px rgba(0,0,0,0.07)"
-          }}
-        />
-      )}
+      <CityImage image={image} city={city.city} />
       <div className="mb-4">
         {stats.map((s) => (
           <div key={s.label} className="d-flex align-items-center justify-content-center mb-2">
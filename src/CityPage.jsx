@@ -1,5 +1,8 @@
 import { useParams, Link } from "react-router-dom";
 import { useEffect, useState } from "react";
+import CityImage from "./CityImage";
+import { loadArtifact } from "./artifacts";
+import { loadCompactCities, withBusinesses } from "./businessTable";
 
 // Helper for slugs
 const slugify = (str) =>
@@ -8,27 +11,25 @@ const slugify = (str) =>
 export default function CityPage() {
   const { slug } = useParams();
   const [city, setCity] = useState(null);
-  const [imageUrl, setImageUrl] = useState(null);
+  const [image, setImage] = useState(null);
 
   // Fetch city info
   useEffect(() => {
-    fetch("/cities_full.json")
-      .then((r) => r.json())
-      .then((data) => {
-        const match = data.cities.find((c) => slugify(c.city) === slug);
-        setCity(match || false);
+    loadCompactCities()
+      .then(({ cities, table }) => {
+        const match = cities.find((c) => slugify(c.city) === slug);
+        setCity(withBusinesses(table, match) || false);
       });
   }, [slug]);
 
   // Fetch city image
   useEffect(() => {
-    fetch("/city_images.json")
-      .then((r) => r.json())
+    loadArtifact("city_images.json")
       .then((arr) => {
         if (!city) return;
         const normalize = (str) => str.toLowerCase().replace(/[^a-z0-9]/g, "");
         const img = arr.find((rec) => normalize(rec.city) === normalize(city.city));
-        setImageUrl(img?.image_url || null);
+        setImage(img?.image_url ? img : null);
       });
   }, [city]);
 
@@ -37,8 +38,7 @@ export default function CityPage() {
   // --- Add this useEffect after you load city:
   useEffect(() => {
     if (!city) return;
-    fetch("/city_news_fixed.json")
-      .then((r) => r.json())
+    loadArtifact("city_news_fixed.json")
       .then((newsData) => {
         // Normalize names to handle things like "Minneapolis †"
         const normalize = (str) => str.toLowerCase().replace(/[^a-z0-9]/g, "");
@@ -147,18 +147,7 @@ export default function CityPage() {
           ← Back to map
         </Link>
 
-        {imageUrl && (
-          <img
-            src={imageUrl}
-            alt={`Skyline of ${city.city}`}
-            style={{
-              maxWidth: "100%",
-              borderRadius: "1rem",
-              marginBottom: "1.2rem",
-              boxShadow: "0 2px 8px rgba(0,0,0,0.07)"
-            }}
-          />
-        )}
+        <CityImage image={image} city={city.city} />
 
         <h1 className="display-4 mb-4">{city.city}</h1>
 
@@ -1,6 +1,7 @@
 import { useParams, Link } from "react-router-dom";
 import { useEffect, useState } from "react";
 import CityInfoPanel from "./CityInfoPanel";
+import { loadCompactCities, withBusinesses } from "./businessTable";
 
 // Helper for slugs
 const slugify = (str) =>
@@ -8,15 +9,14 @@ const slugify = (str) =>
 
 export default function CompareCities() {
   const { city1, city2 } = useParams();
-  const [data, setData] = useState([]);
+  const [data, setData] = useState({ cities: [], table: null });
   const [loading, setLoading] = useState(true);
 
   // Load all city data ONCE
   useEffect(() => {
-    fetch("/cities_full.json")
-      .then((r) => r.json())
+    loadCompactCities()
       .then((data) => {
-        setData(data.cities);
+        setData(data);
         setLoading(false);
       });
   }, []);
@@ -25,8 +25,8 @@ export default function CompareCities() {
     return <div style={{ margin: 60 }}>Loading…</div>;
   }
 
-  const c1 = data.find((c) => slugify(c.city) === city1);
-  const c2 = data.find((c) => slugify(c.city) === city2);
+  const c1 = withBusinesses(data.table, data.cities.find((c) => slugify(c.city) === city1));
+  const c2 = withBusinesses(data.table, data.cities.find((c) => slugify(c.city) === city2));
 
   if (!c1 || !c2) {
     return (
@@ -6,10 +6,13 @@ import {
   GeoJSON,
   CircleMarker,
   Tooltip,
-  useMap
+  useMap,
+  useMapEvents
 } from "react-leaflet";
 import L from "leaflet";
 import "leaflet/dist/leaflet.css";
+import { loadArtifact } from "./artifacts";
+import { loadCityClusters, visibleFeatures } from "./cityClusters";
 
 const slugify = (str) =>
   str.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/(^-|-$)/g, "");
@@ -37,8 +40,73 @@ function FitToBorder({ geojson }) {
   return null;
 }
 
-const safeJSON = (r, url) =>
-  r.ok ? r.json() : Promise.reject(new Error(`Fetch failed → ${url}`));
+function CityDot({ city: c, onClick }) {
+  return (
+    <CircleMarker
+      center={[c.lat, c.lon]}
+      radius={4}
+      stroke={false}
+      pathOptions={{ color: DOT_COLOR }}
+      fillOpacity={0.95}
+      eventHandlers={{ click: onClick }}
+    >
+      <Tooltip direction="top" offset={[0, -2]} opacity={0.9}>
+        <div style={{ textAlign: "center", lineHeight: 1.2 }}>
+          <strong>{c.n}</strong>
+          {c.meta && (
+            <>
+              <br />
+              <small>
+                pop: {c.meta.population_2020.toLocaleString()}
+              </small>
+            </>
+          )}
+          <br />
+          <small>score {c.s}</small>
+        </div>
+      </Tooltip>
+    </CircleMarker>
+  );
+}
+
+// Precomputed clusters (scripts/cluster_map.py): only the features of the
+// tiles on screen at the current zoom are drawn.
+function ClusterLayer({ clusters, cities, onCity }) {
+  const map = useMap();
+  const [view, setView] = useState(() => ({ zoom: map.getZoom(), bounds: map.getBounds() }));
+  useMapEvents({
+    moveend: () => setView({ zoom: map.getZoom(), bounds: map.getBounds() }),
+  });
+
+  return visibleFeatures(clusters, view.zoom, view.bounds).map((f) => {
+    if (f.count === 1) {
+      const c = cities[f.city];
+      return c && <CityDot key={c.id} city={c} onClick={() => onCity(c)} />;
+    }
+    return (
+      <CircleMarker
+        key={`${f.lat},${f.lon},${f.count}`}
+        center={[f.lat, f.lon]}
+        radius={6 + 3 * Math.log2(f.count)}
+        pathOptions={{ color: DOT_COLOR, weight: 1 }}
+        fillOpacity={0.6}
+        eventHandlers={{ click: () => map.setView([f.lat, f.lon], f.expandZoom) }}
+      >
+        <Tooltip direction="top" opacity={0.9}>
+          <div style={{ textAlign: "center", lineHeight: 1.2 }}>
+            <strong>{f.count} cities</strong>
+            <br />
+            <small>pop: {f.population.toLocaleString()}</small>
+            <br />
+            <small>
+              {f.employers_500} employers 500+, {f.employers_100_499} 100–499
+            </small>
+          </div>
+        </Tooltip>
+      </CircleMarker>
+    );
+  });
+}
 
 // Helper: check if city has at least one uni
 const hasUniversities = (city) =>
@@ -58,6 +126,7 @@ export default function MapMN() {
   const [city2, setCity2] = useState("");
   const [border, setBorder] = useState(null);
   const [cities, setCities] = useState([]);
+  const [clusters, setClusters] = useState(null);
   const [view, setView] = useState("map"); // 'map' or 'list'
   const [sort, setSort] = useState({ field: "population", dir: "desc" });
   const [filters, setFilters] = useState({
@@ -76,12 +145,11 @@ export default function MapMN() {
   useEffect(() => {
     (async () => {
       try {
-        const [borderData, cityPos, meta] = await Promise.all([
-          fetch("/mn_border.geojson").then((r) => safeJSON(r, "mn_border")),
-          fetch("/mn_cities_dec.json").then((r) => safeJSON(r, "city_coords")),
-          fetch("/cities_with_businesses.json").then((r) =>
-            safeJSON(r, "cities_with_businesses")
-          ),
+        const [borderData, cityPos, meta, clusterData] = await Promise.all([
+          loadArtifact("mn_border.geojson"),
+          loadArtifact("mn_cities_dec.json"),
+          loadArtifact("cities_with_businesses.json"),
+          loadCityClusters().catch(() => null), // no clusters → one dot per city
         ]);
 
         const metaLookup = Object.fromEntries(
@@ -102,6 +170,7 @@ export default function MapMN() {
 
         setBorder(borderData);
         setCities(enriched);
+        if (clusterData?.cities.length === enriched.length) setClusters(clusterData);
       } catch (err) {
         console.error(err);
       }
@@ -149,6 +218,12 @@ export default function MapMN() {
   filtered.sort(sorters[sort.field]);
   if (sort.dir === "desc") filtered.reverse();
 
+  // clusters are precomputed over every city, so any filter falls back to per-city dots
+  const filtersActive = Boolean(search) || Object.entries(filters).some(
+    ([k, v]) => v !== (k === "universities" || k === "employer" ? "any" : "")
+  );
+  const openCity = (c) => navigate(`/city/${slugify(c.n)}`);
+
   // ----------------- UI: SORT/FILTER CONTROLS --------------------
   function updateFilter(name, value) {
     setFilters((f) => ({ ...f, [name]: value }));
@@ -426,35 +501,13 @@ export default function MapMN() {
               fillOpacity: 1,
             })}
           />
-          {filtered.map((c) => (
-            <CircleMarker
-              key={c.id}
-              center={[c.lat, c.lon]}
-              radius={4}
-              stroke={false}
-              pathOptions={{ color: DOT_COLOR }}
-              fillOpacity={0.95}
-              eventHandlers={{
-                click: () => navigate(`/city/${slugify(c.n)}`),
-              }}
-            >
-              <Tooltip direction="top" offset={[0, -2]} opacity={0.9}>
-                <div style={{ textAlign: "center", lineHeight: 1.2 }}>
-                  <strong>{c.n}</strong>
-                  {c.meta && (
-                    <>
-                      <br />
-                      <small>
-                        pop: {c.meta.population_2020.toLocaleString()}
-                      </small>
-                    </>
-                  )}
-                  <br />
-                  <small>score {c.s}</small>
-                </div>
-              </Tooltip>
-            </CircleMarker>
-          ))}
+          {clusters && !filtersActive ? (
+            <ClusterLayer clusters={clusters} cities={cities} onCity={openCity} />
+          ) : (
+            filtered.map((c) => (
+              <CityDot key={c.id} city={c} onClick={() => openCity(c)} />
+            ))
+          )}
         </MapContainer>
       ) : (
         <div
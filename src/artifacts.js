@@ -0,0 +1,121 @@
+// Loads data files through public/dist/manifest.json (scripts/publish.py).
+//
+// Hashed files are immutable, so the browser cache does most of the work.
+// On top of that the last parsed version of each JSON artifact is kept in
+// the Cache API. When the manifest offers a patch from that version, only
+// the RFC 6902 delta is downloaded. Without a manifest (e.g. `vite dev`
+// before publishing) the plain /<name> file is fetched instead.
+const DIST = "/dist";
+const CACHE = "mnoi-artifacts";
+const VERSION_KEY = (name) => `mnoi:artifact:${name}`;
+
+let manifestPromise = null;
+const inflight = {};
+
+function getManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${DIST}/manifest.json`, { cache: "no-cache" })
+      .then((r) => (r.ok ? r.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+async function fetchJSON(url) {
+  const r = await fetch(url);
+  if (!r.ok) throw new Error(`Fetch failed → ${url}`);
+  return r.json();
+}
+
+const unescape = (p) => p.replace(/~1/g, "/").replace(/~0/g, "~");
+
+// Applies the add / remove / replace ops that publish.py emits.
+export function applyPatch(doc, ops) {
+  for (const op of ops) {
+    const parts = op.path === "" ? [] : op.path.slice(1).split("/").map(unescape);
+    if (!parts.length) {
+      doc = op.value;
+      continue;
+    }
+    let parent = doc;
+    for (const p of parts.slice(0, -1)) parent = parent[Array.isArray(parent) ? Number(p) : p];
+    const last = parts[parts.length - 1];
+    if (Array.isArray(parent)) {
+      const i = last === "-" ? parent.length : Number(last);
+      if (op.op === "add") parent.splice(i, 0, op.value);
+      else if (op.op === "remove") parent.splice(i, 1);
+      else parent[i] = op.value;
+    } else if (op.op === "remove") {
+      delete parent[last];
+    } else {
+      parent[last] = op.value;
+    }
+  }
+  return doc;
+}
+
+async function openCache() {
+  try {
+    return typeof caches === "undefined" ? null : await caches.open(CACHE);
+  } catch {
+    return null;
+  }
+}
+
+async function loadViaManifest(name, entry) {
+  const cache = await openCache();
+  const key = (hash) => `${DIST}/${name}@${hash}`;
+  const have = localStorage.getItem(VERSION_KEY(name));
+
+  let doc = null;
+  if (cache && have === entry.hash) {
+    const hit = await cache.match(key(entry.hash));
+    if (hit) return hit.json();
+  }
+  if (cache && entry.patch && have === entry.patch.from) {
+    const old = await cache.match(key(have));
+    if (old) {
+      try {
+        const [base, ops] = await Promise.all([old.json(), fetchJSON(`${DIST}/${entry.patch.file}`)]);
+        doc = applyPatch(base, ops);
+      } catch (err) {
+        console.warn(`Patch for ${name} failed, downloading in full`, err);
+        doc = null;
+      }
+    }
+  }
+  if (doc === null) doc = await fetchJSON(`${DIST}/${entry.file}`);
+
+  if (cache) {
+    try {
+      await cache.put(key(entry.hash), new Response(JSON.stringify(doc)));
+      if (have && have !== entry.hash) await cache.delete(key(have));
+      localStorage.setItem(VERSION_KEY(name), entry.hash);
+    } catch {
+      // quota or private mode: next visit simply downloads again
+    }
+  }
+  return doc;
+}
+
+// URL of the current build of `name`, for non-JSON artifacts (city_columns.bin).
+export async function artifactUrl(name) {
+  const entry = (await getManifest())?.artifacts?.[name];
+  return entry ? `${DIST}/${entry.file}` : `/${name}`;
+}
+
+// Parsed contents of a JSON artifact, e.g. loadArtifact("cities_full.json").
+export function loadArtifact(name) {
+  if (!inflight[name]) {
+    inflight[name] = getManifest()
+      .then((manifest) => {
+        const entry = manifest?.artifacts?.[name];
+        return entry ? loadViaManifest(name, entry) : fetchJSON(`/${name}`);
+      })
+      .catch((err) => {
+        delete inflight[name];
+        throw err;
+      });
+  }
+  return inflight[name];
+}
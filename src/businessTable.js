@@ -0,0 +1,32 @@
+// City records without inline employers + the global business table
+// (both written by scripts/business_table.py). Employers are only turned
+// back into objects for the cities actually on screen.
+import { loadArtifact } from "./artifacts";
+
+export async function loadCompactCities() {
+  const [compact, table] = await Promise.all([
+    loadArtifact("cities_compact.json"),
+    loadArtifact("business_table.json"),
+  ]);
+  return { cities: compact.cities, table };
+}
+
+// [{ name, employee_category, industry, description, website }] for one city
+export function businessesOf(table, city) {
+  const [start, stop] = city.business_rows;
+  const out = [];
+  for (let i = start; i < stop; i++) {
+    out.push({
+      name: table.name[i],
+      employee_category: table.categories[table.category[i]],
+      industry: table.industries[table.industry[i]],
+      description: table.descriptions[table.description[i]],
+      website: table.website[i],
+    });
+  }
+  return out;
+}
+
+// The city record in the shape the components expect (with .businesses).
+export const withBusinesses = (table, city) =>
+  city && { ...city, businesses: businessesOf(table, city) };
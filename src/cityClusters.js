@@ -0,0 +1,46 @@
+// Reader for public/city_clusters.json (written by scripts/cluster_map.py).
+// Features are stored per z/x/y tile at their own zoom, so a view only
+// touches the handful of tiles on screen:
+//
+//   const clusters = await loadCityClusters();
+//   visibleFeatures(clusters, map.getZoom(), map.getBounds())
+//     → [{ lat, lon, count, population, employers_500, employers_100_499,
+//          city /* index, when count === 1 */, expandZoom /* otherwise */ }]
+import { loadArtifact } from "./artifacts";
+
+export const loadCityClusters = () => loadArtifact("city_clusters.json");
+
+const MAX_LAT = 85.0511; // Web Mercator's square-world limit, as in cluster_map.py
+
+const tileX = (lon, n) => Math.floor(((lon + 180) / 360) * n);
+const tileY = (lat, n) => {
+  const s = Math.sin((Math.min(Math.max(lat, -MAX_LAT), MAX_LAT) * Math.PI) / 180);
+  return Math.floor((0.5 - Math.log((1 + s) / (1 - s)) / (4 * Math.PI)) * n);
+};
+
+// Zoom level whose features the map should show at `zoom`.
+export const clusterZoom = (clusters, zoom) =>
+  Math.min(Math.max(Math.round(zoom), clusters.minZoom), clusters.maxZoom + 1);
+
+export function visibleFeatures(clusters, zoom, bounds) {
+  const z = clusterZoom(clusters, zoom);
+  const n = 2 ** z;
+  const clamp = (v) => Math.min(Math.max(v, 0), n - 1);
+  // one tile of slack so markers straddling the edge don't pop in late
+  const x0 = clamp(tileX(bounds.getWest(), n) - 1), x1 = clamp(tileX(bounds.getEast(), n) + 1);
+  const y0 = clamp(tileY(bounds.getNorth(), n) - 1), y1 = clamp(tileY(bounds.getSouth(), n) + 1);
+
+  const out = [];
+  for (let x = x0; x <= x1; x++) {
+    for (let y = y0; y <= y1; y++) {
+      for (const [lat, lon, count, population, e500, e100, ref] of clusters.tiles[`${z}/${x}/${y}`] || []) {
+        out.push({
+          lat, lon, count, population,
+          employers_500: e500, employers_100_499: e100,
+          ...(count === 1 ? { city: ref } : { expandZoom: ref }),
+        });
+      }
+    }
+  }
+  return out;
+}
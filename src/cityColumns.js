@@ -0,0 +1,37 @@
+// Reader for public/city_columns.bin (written by scripts/city_columns.py).
+// Only the small JSON header is parsed; every numeric column is a typed-array
+// view straight onto the fetched ArrayBuffer, e.g.
+//
+//   const { cities, columns } = await loadCityColumns();
+//   columns.lat[i], columns.population[i]   // row i ↔ cities[i]
+//
+// Missing values are NaN (float columns) or -1 (int columns).
+import { artifactUrl } from "./artifacts";
+
+const ARRAYS = { "<f8": Float64Array, "<i4": Int32Array };
+
+export function parseCityColumns(buffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== "MNOC") throw new Error("city_columns.bin: bad magic");
+
+  const headerLen = view.getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLen)));
+
+  // Typed arrays use platform byte order; the file is little-endian, as is
+  // every browser platform in practice.
+  const columns = {};
+  for (const col of header.columns) {
+    const Arr = ARRAYS[col.dtype];
+    if (!Arr) throw new Error(`city_columns.bin: unsupported dtype ${col.dtype}`);
+    columns[col.name] = new Arr(buffer, col.offset, header.rows);
+  }
+  return { rows: header.rows, cities: header.cities, columns };
+}
+
+export async function loadCityColumns(url) {
+  url = url ?? (await artifactUrl("city_columns.bin"));
+  const r = await fetch(url);
+  if (!r.ok) throw new Error(`${url}: HTTP ${r.status}`);
+  return parseCityColumns(await r.arrayBuffer());
+}